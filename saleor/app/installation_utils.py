@@ -9,6 +9,7 @@ from ..core.utils import build_absolute_uri
 from ..permission.enums import get_permission_names
 from ..plugins.manager import PluginsManager
 from ..webhook.models import Webhook, WebhookEvent
+from ..webhook.registry import invalidate_webhooks_registry
 from .manifest_validations import clean_manifest_data
 from .models import App, AppExtension, AppInstallation
 from .types import AppExtensionTarget, AppType
@@ -108,6 +109,7 @@ def install_app(app_installation: AppInstallation, activate: bool = False):
                 WebhookEvent(webhook=db_webhook, event_type=event_type)
             )
     WebhookEvent.objects.bulk_create(webhook_events)
+    invalidate_webhooks_registry()
 
     _, token = app.tokens.create(name="Default token")  # type: ignore[call-arg] # calling create on a related manager # noqa: E501
 
@@ -1,5 +1,5 @@
 from decimal import Decimal
-from typing import TYPE_CHECKING, Iterable, Optional, Tuple
+from typing import TYPE_CHECKING, Any, Iterable, Optional, Tuple
 
 from django.conf import settings
 from django.utils import timezone
@@ -19,11 +19,20 @@ from ..tax.utils import (
 )
 from .models import Checkout
 from .payment_utils import update_checkout_payment_statuses
+from .prices_cache import (
+    CHECKOUT_LINE_PRICE_FIELDS,
+    apply_prices_snapshot,
+    cache_prices,
+    get_cached_prices,
+    get_checkout_prices_cache_key,
+    get_prices_snapshot,
+)
 
 if TYPE_CHECKING:
     from ..account.models import Address
     from ..plugins.manager import PluginsManager
     from .fetch import CheckoutInfo, CheckoutLineInfo
+    from .models import CheckoutLine
 
 
 def checkout_shipping_price(
@@ -43,6 +52,7 @@ def checkout_shipping_price(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     return quantize_price(checkout_info.checkout.shipping_price, currency)
 
@@ -63,6 +73,7 @@ def checkout_shipping_tax_rate(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     return checkout_info.checkout.shipping_tax_rate
 
@@ -84,6 +95,7 @@ def checkout_subtotal(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     return quantize_price(checkout_info.checkout.subtotal, currency)
 
@@ -127,6 +139,7 @@ def checkout_total(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     return quantize_price(checkout_info.checkout.total, currency)
 
@@ -164,6 +177,7 @@ def checkout_line_total(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     checkout_line = _find_checkout_line_info(lines, checkout_line_info).line
     return quantize_price(checkout_line.total_price, currency)
@@ -187,6 +201,7 @@ def checkout_line_unit_price(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     checkout_line = _find_checkout_line_info(lines, checkout_line_info).line
     unit_price = checkout_line.total_price / checkout_line.quantity
@@ -210,17 +225,44 @@ def checkout_line_tax_rate(
         manager=manager,
         lines=lines,
         address=address,
+        use_prices_cache=True,
     )
     checkout_line_info = _find_checkout_line_info(lines, checkout_line_info)
     return checkout_line_info.line.tax_rate
 
 
+# Checkout fields which can be changed by the recalculation of prices.
+CHECKOUT_RECALCULATED_FIELDS = [
+    "voucher_code",
+    "total_net_amount",
+    "total_gross_amount",
+    "subtotal_net_amount",
+    "subtotal_gross_amount",
+    "shipping_price_net_amount",
+    "shipping_price_gross_amount",
+    "shipping_tax_rate",
+    "translated_discount_name",
+    "discount_amount",
+    "discount_name",
+    "currency",
+]
+
+
+def _get_line_prices(line: "CheckoutLine") -> Tuple[Any, ...]:
+    return tuple(getattr(line, field) for field in CHECKOUT_LINE_PRICE_FIELDS)
+
+
+def _get_checkout_prices(checkout: "Checkout") -> Tuple[Any, ...]:
+    return tuple(getattr(checkout, field) for field in CHECKOUT_RECALCULATED_FIELDS)
+
+
 def _fetch_checkout_prices_if_expired(
     checkout_info: "CheckoutInfo",
     manager: "PluginsManager",
     lines: Iterable["CheckoutLineInfo"],
     address: Optional["Address"] = None,
     force_update: bool = False,
+    use_prices_cache: bool = False,
 ) -> Tuple["CheckoutInfo", Iterable["CheckoutLineInfo"]]:
     """Fetch checkout prices with taxes.
 
@@ -229,12 +271,35 @@ def _fetch_checkout_prices_if_expired(
 
     Prices can be updated only if force_update == True, or if time elapsed from the
     last price update is greater than settings.CHECKOUT_PRICES_TTL.
+
+    When `use_prices_cache` is set and settings.CHECKOUT_PRICES_CACHE is enabled,
+    recalculated prices are stored in the cache instead of the database.
     """
     checkout = checkout_info.checkout
 
     if not force_update and checkout.price_expiration > timezone.now():
         return checkout_info, lines
 
+    use_prices_cache = (
+        use_prices_cache and settings.CHECKOUT_PRICES_CACHE and not force_update
+    )
+    if use_prices_cache:
+        # Prices were already set from the cache for the current checkout state.
+        if checkout_info.cached_prices_expiration == checkout.price_expiration:
+            return checkout_info, lines
+        prices_cache_key = get_checkout_prices_cache_key(checkout_info, lines, address)
+        prices_snapshot = get_cached_prices(prices_cache_key)
+        if prices_snapshot and apply_prices_snapshot(
+            checkout_info, lines, prices_snapshot
+        ):
+            # Sale discounts of lines are set as well, without saving them, so they
+            # match the cached prices.
+            generate_sale_discount_objects_for_checkout(
+                checkout_info, lines, save=False
+            )
+            checkout_info.cached_prices_expiration = checkout.price_expiration
+            return checkout_info, lines
+
     tax_configuration = checkout_info.tax_configuration
     tax_calculation_strategy = get_tax_calculation_strategy_for_checkout(
         checkout_info, lines
@@ -243,7 +308,16 @@ def _fetch_checkout_prices_if_expired(
     charge_taxes = get_charge_taxes_for_checkout(checkout_info, lines)
     should_charge_tax = charge_taxes and not checkout.tax_exemption
 
-    generate_sale_discount_objects_for_checkout(checkout_info, lines)
+    # Only the checkout fields and lines whose prices change are written, so adding
+    # a line to a big checkout doesn't update all other lines.
+    checkout_prices = _get_checkout_prices(checkout)
+    lines_prices = {
+        line_info.line.pk: _get_line_prices(line_info.line) for line_info in lines
+    }
+
+    generate_sale_discount_objects_for_checkout(
+        checkout_info, lines, save=not use_prices_cache
+    )
 
     if prices_entered_with_tax:
         # If prices are entered with tax, we need to always calculate it anyway, to
@@ -281,34 +355,33 @@ def _fetch_checkout_prices_if_expired(
             # Calculate net prices without taxes.
             _get_checkout_base_prices(checkout, checkout_info, lines)
 
+    if use_prices_cache:
+        cache_prices(prices_cache_key, get_prices_snapshot(checkout_info, lines))
+        checkout_info.cached_prices_expiration = checkout.price_expiration
+        return checkout_info, lines
+
     checkout.price_expiration = timezone.now() + settings.CHECKOUT_PRICES_TTL
+    # The expiration is saved even if no price changed, so the prices aren't
+    # recalculated again before it passes.
+    update_fields = ["price_expiration"]
+    changed_fields = [
+        field
+        for field, value in zip(CHECKOUT_RECALCULATED_FIELDS, checkout_prices)
+        if getattr(checkout, field) != value
+    ]
+    if changed_fields:
+        update_fields += changed_fields + ["last_change"]
     checkout.save(
-        update_fields=[
-            "voucher_code",
-            "total_net_amount",
-            "total_gross_amount",
-            "subtotal_net_amount",
-            "subtotal_gross_amount",
-            "shipping_price_net_amount",
-            "shipping_price_gross_amount",
-            "shipping_tax_rate",
-            "price_expiration",
-            "translated_discount_name",
-            "discount_amount",
-            "discount_name",
-            "currency",
-            "last_change",
-        ],
+        update_fields=update_fields,
         using=settings.DATABASE_CONNECTION_DEFAULT_NAME,
     )
-    checkout.lines.bulk_update(
-        [line_info.line for line_info in lines],
-        [
-            "total_price_net_amount",
-            "total_price_gross_amount",
-            "tax_rate",
-        ],
-    )
+    updated_lines = [
+        line_info.line
+        for line_info in lines
+        if lines_prices.get(line_info.line.pk) != _get_line_prices(line_info.line)
+    ]
+    if updated_lines:
+        checkout.lines.bulk_update(updated_lines, CHECKOUT_LINE_PRICE_FIELDS)
     return checkout_info, lines
 
 
@@ -492,11 +565,15 @@ def fetch_checkout_data(
     force_update: bool = False,
     checkout_transactions: Optional[Iterable["TransactionItem"]] = None,
     force_status_update: bool = False,
+    use_prices_cache: bool = False,
 ):
     """Fetch checkout data.
 
     This function refreshes prices if they have expired. If the checkout total has
     changed as a result, it will update the payment statuses accordingly.
+
+    With `use_prices_cache` and settings.CHECKOUT_PRICES_CACHE enabled, refreshed
+    prices and payment statuses are not saved, as it's done only for reading them.
     """
     previous_total_gross = checkout_info.checkout.total.gross
     checkout_info, lines = _fetch_checkout_prices_if_expired(
@@ -505,6 +582,7 @@ def fetch_checkout_data(
         lines=lines,
         address=address,
         force_update=force_update,
+        use_prices_cache=use_prices_cache,
     )
     current_total_gross = checkout_info.checkout.total.gross
     if current_total_gross != previous_total_gross or force_status_update:
@@ -512,6 +590,7 @@ def fetch_checkout_data(
             checkout=checkout_info.checkout,
             checkout_total_gross=current_total_gross,
             checkout_transactions=checkout_transactions,
+            save=not (use_prices_cache and settings.CHECKOUT_PRICES_CACHE),
         )
 
     return checkout_info, lines
@@ -1,5 +1,6 @@
 import itertools
 from dataclasses import dataclass
+from datetime import datetime
 from functools import singledispatch
 from typing import (
     TYPE_CHECKING,
@@ -14,6 +15,7 @@ from typing import (
 )
 from uuid import UUID
 
+from django.db.models import Prefetch, prefetch_related_objects
 from prices import Money
 
 from ..core.utils.lazyobjects import lazy_no_retry
@@ -78,6 +80,9 @@ class CheckoutInfo:
     tax_configuration: "TaxConfiguration"
     valid_pick_up_points: List["Warehouse"]
     voucher: Optional["Voucher"] = None
+    # The price expiration of the checkout whose prices were set from or stored in
+    # the prices cache, so they aren't looked up again for the same checkout state.
+    cached_prices_expiration: Optional[datetime] = None
 
     @property
     def valid_shipping_methods(self) -> List["ShippingMethodData"]:
@@ -231,15 +236,28 @@ def fetch_checkout_lines(
     voucher: Optional["Voucher"] = None,
 ) -> Tuple[Iterable[CheckoutLineInfo], Iterable[int]]:
     """Fetch checkout lines as CheckoutLineInfo objects."""
+    from ..product.models import ProductChannelListing, ProductVariantChannelListing
     from .utils import get_voucher_for_checkout
 
-    select_related_fields = ["variant__product__product_type__tax_class"]
-    prefetch_related_fields = [
+    select_related_fields = [
+        "variant__product__product_type__tax_class",
+        "variant__product__tax_class",
+    ]
+    # Only listings of the checkout channel are used, so others aren't fetched.
+    prefetch_related_fields: List[Union[str, Prefetch]] = [
         "variant__product__collections",
-        "variant__product__channel_listings__channel",
-        "variant__product__product_type__tax_class__country_rates",
-        "variant__product__tax_class__country_rates",
-        "variant__channel_listings__channel",
+        Prefetch(
+            "variant__product__channel_listings",
+            queryset=ProductChannelListing.objects.filter(
+                channel_id=checkout.channel_id
+            ).select_related("channel"),
+        ),
+        Prefetch(
+            "variant__channel_listings",
+            queryset=ProductVariantChannelListing.objects.filter(
+                channel_id=checkout.channel_id
+            ).select_related("channel"),
+        ),
         "discounts",
     ]
     if prefetch_variant_attributes:
@@ -249,9 +267,20 @@ def fetch_checkout_lines(
                 "variant__attributes__values",
             ]
         )
-    lines = checkout.lines.select_related(*select_related_fields).prefetch_related(
-        *prefetch_related_fields
+    lines = list(
+        checkout.lines.select_related(*select_related_fields).prefetch_related(
+            *prefetch_related_fields
+        )
     )
+    # Rates of tax classes of products and product types are fetched in one query.
+    tax_classes = []
+    for line in lines:
+        product = line.variant.product
+        for tax_class in [product.tax_class, product.product_type.tax_class]:
+            if tax_class:
+                tax_classes.append(tax_class)
+    prefetch_related_objects(tax_classes, "country_rates")
+
     lines_info = []
     unavailable_variant_pks = []
     product_channel_listing_mapping: Dict[int, Optional["ProductChannelListing"]] = {}
@@ -434,6 +463,17 @@ def fetch_checkout_info(
     shipping_address = checkout.shipping_address
     if shipping_channel_listings is None:
         shipping_channel_listings = channel.shipping_method_listings.all()
+    if not voucher:
+        # Lines fetched for the same checkout may already have its voucher.
+        voucher = next(
+            (
+                line_info.voucher
+                for line_info in lines
+                if line_info.voucher
+                and line_info.voucher.code == checkout.voucher_code
+            ),
+            None,
+        )
     if not voucher:
         voucher = get_voucher_for_checkout(checkout, channel_slug=channel.slug)
 
@@ -0,0 +1,134 @@
+import hashlib
+from typing import TYPE_CHECKING, Any, Dict, Iterable, Optional, Tuple
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ..discount.sale_index import get_sale_index_version
+
+if TYPE_CHECKING:
+    from ..account.models import Address
+    from .fetch import CheckoutInfo, CheckoutLineInfo
+
+CHECKOUT_PRICES_CACHE_KEY_PREFIX = "checkout-prices"
+
+CHECKOUT_PRICE_FIELDS = [
+    "total_net_amount",
+    "total_gross_amount",
+    "subtotal_net_amount",
+    "subtotal_gross_amount",
+    "shipping_price_net_amount",
+    "shipping_price_gross_amount",
+    "shipping_tax_rate",
+]
+CHECKOUT_LINE_PRICE_FIELDS = [
+    "total_price_net_amount",
+    "total_price_gross_amount",
+    "tax_rate",
+]
+
+PricesSnapshot = Dict[str, Any]
+
+
+def _get_address_data(address: Optional["Address"]) -> Optional[Tuple]:
+    if address is None:
+        return None
+    return tuple(sorted(address.as_data().items()))
+
+
+def get_checkout_prices_cache_key(
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    address: Optional["Address"],
+) -> str:
+    """Return the cache key of prices of the checkout in its current state.
+
+    The key contains a hash of the data prices depend on, so any change of the
+    checkout, its lines, the delivery method or the address, and any change of sales
+    gives a new key. Other changes, e.g. of product prices or tax rates, are picked
+    up when the cached prices expire, as it happens with the prices saved in the
+    database.
+    """
+    checkout = checkout_info.checkout
+    tax_configuration = checkout_info.tax_configuration
+    data = (
+        checkout.channel_id,
+        checkout.currency,
+        checkout.language_code,
+        checkout.last_change,
+        checkout.price_expiration,
+        checkout.voucher_code,
+        checkout.discount_amount,
+        checkout.tax_exemption,
+        checkout.shipping_method_id,
+        checkout.collection_point_id,
+        _get_address_data(address),
+        (
+            tax_configuration.pk,
+            tax_configuration.charge_taxes,
+            tax_configuration.tax_calculation_strategy,
+            tax_configuration.prices_entered_with_tax,
+        ),
+        tuple(
+            (
+                line_info.line.pk,
+                line_info.variant.pk,
+                line_info.line.quantity,
+                line_info.line.price_override,
+                line_info.channel_listing.price_amount,
+                line_info.tax_class.pk if line_info.tax_class else None,
+            )
+            for line_info in lines
+        ),
+        get_sale_index_version(),
+    )
+    data_hash = hashlib.sha256(repr(data).encode("utf-8")).hexdigest()
+    return f"{CHECKOUT_PRICES_CACHE_KEY_PREFIX}:{checkout.token}:{data_hash}"
+
+
+def get_prices_snapshot(
+    checkout_info: "CheckoutInfo", lines: Iterable["CheckoutLineInfo"]
+) -> PricesSnapshot:
+    checkout = checkout_info.checkout
+    return {
+        "checkout": [getattr(checkout, field) for field in CHECKOUT_PRICE_FIELDS],
+        "lines": {
+            str(line_info.line.pk): [
+                getattr(line_info.line, field) for field in CHECKOUT_LINE_PRICE_FIELDS
+            ]
+            for line_info in lines
+        },
+    }
+
+
+def apply_prices_snapshot(
+    checkout_info: "CheckoutInfo",
+    lines: Iterable["CheckoutLineInfo"],
+    snapshot: PricesSnapshot,
+) -> bool:
+    """Set prices from the snapshot on the checkout and its lines.
+
+    Return False, without changing anything, if the snapshot doesn't have prices of
+    all lines.
+    """
+    lines_prices = snapshot["lines"]
+    if any(str(line_info.line.pk) not in lines_prices for line_info in lines):
+        return False
+    checkout = checkout_info.checkout
+    for field, value in zip(CHECKOUT_PRICE_FIELDS, snapshot["checkout"]):
+        setattr(checkout, field, value)
+    for line_info in lines:
+        line_prices = lines_prices[str(line_info.line.pk)]
+        for field, value in zip(CHECKOUT_LINE_PRICE_FIELDS, line_prices):
+            setattr(line_info.line, field, value)
+    return True
+
+
+def get_cached_prices(key: str) -> Optional[PricesSnapshot]:
+    return cache.get(key)
+
+
+def cache_prices(key: str, snapshot: PricesSnapshot):
+    cache.set(
+        key, snapshot, timeout=int(settings.CHECKOUT_PRICES_TTL.total_seconds())
+    )
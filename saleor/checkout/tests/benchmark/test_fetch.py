@@ -0,0 +1,109 @@
+from decimal import Decimal
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+
+from ....plugins.manager import get_plugins_manager
+from ....product.models import (
+    Collection,
+    Product,
+    ProductChannelListing,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from ...fetch import fetch_checkout_info, fetch_checkout_lines
+from ...models import Checkout, CheckoutLine
+
+
+@pytest.fixture
+def checkout_with_lines_factory(
+    channel_USD, channel_PLN, product_type, category, default_tax_class
+):
+    def create_checkout(lines_count):
+        checkout = Checkout.objects.create(
+            currency=channel_USD.currency_code,
+            channel=channel_USD,
+            email="user@email.com",
+        )
+        collection = Collection.objects.create(
+            name=f"Collection {checkout.pk}", slug=f"collection-{checkout.pk}"
+        )
+        for index in range(lines_count):
+            product = Product.objects.create(
+                name=f"Product {checkout.pk} {index}",
+                slug=f"product-{checkout.pk}-{index}",
+                product_type=product_type,
+                category=category,
+                tax_class=default_tax_class,
+            )
+            product.collections.add(collection)
+            variant = ProductVariant.objects.create(
+                product=product, sku=f"{checkout.pk}-{index}"
+            )
+            for channel in [channel_USD, channel_PLN]:
+                ProductChannelListing.objects.create(
+                    product=product,
+                    channel=channel,
+                    is_published=True,
+                    visible_in_listings=True,
+                    available_for_purchase_at=timezone.now(),
+                    currency=channel.currency_code,
+                )
+                ProductVariantChannelListing.objects.create(
+                    variant=variant,
+                    channel=channel,
+                    price_amount=Decimal(10 + index),
+                    currency=channel.currency_code,
+                )
+            CheckoutLine.objects.create(
+                checkout=checkout,
+                variant=variant,
+                quantity=index + 1,
+                currency=checkout.currency,
+            )
+        return Checkout.objects.select_related(
+            "channel__tax_configuration", "user"
+        ).get(pk=checkout.pk)
+
+    return create_checkout
+
+
+def _fetch_checkout_lines_and_info(checkout):
+    lines, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines, get_plugins_manager())
+    return lines, checkout_info
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+@pytest.mark.parametrize("lines_count", [1, 10, 50])
+def test_fetch_checkout_lines_and_info(
+    lines_count, checkout_with_lines_factory, count_queries
+):
+    checkout = checkout_with_lines_factory(lines_count)
+
+    lines, _ = _fetch_checkout_lines_and_info(checkout)
+
+    assert len(lines) == lines_count
+
+
+def test_fetch_checkout_lines_and_info_queries_dont_depend_on_lines_count(
+    checkout_with_lines_factory,
+):
+    # given
+    single_line_checkout = checkout_with_lines_factory(1)
+    checkout = checkout_with_lines_factory(20)
+
+    # when
+    with CaptureQueriesContext(connection) as single_line_queries:
+        _fetch_checkout_lines_and_info(single_line_checkout)
+    with CaptureQueriesContext(connection) as queries:
+        lines, _ = _fetch_checkout_lines_and_info(checkout)
+
+    # then
+    assert len(lines) == 20
+    assert all(line_info.channel_listing for line_info in lines)
+    assert all(line_info.tax_class == lines[0].tax_class for line_info in lines)
+    assert len(queries) == len(single_line_queries)
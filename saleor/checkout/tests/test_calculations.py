@@ -23,6 +23,7 @@ from ..calculations import (
     fetch_checkout_data,
 )
 from ..fetch import CheckoutLineInfo, fetch_checkout_info, fetch_checkout_lines
+from ..models import Checkout
 
 
 @pytest.fixture
@@ -482,3 +483,59 @@ def test_fetch_checkout_prices_when_tax_exemption_and_not_include_taxes_in_price
 
     assert checkout.total == shipping_price + all_lines_total_price
     assert checkout.subtotal == all_lines_total_price
+
+
+def test_fetch_checkout_data_saves_only_lines_with_changed_prices(
+    checkout_with_items, plugins_manager
+):
+    # given
+    checkout = checkout_with_items
+    tc = checkout.channel.tax_configuration
+    tc.tax_calculation_strategy = TaxCalculationStrategy.FLAT_RATES
+    tc.save(update_fields=["tax_calculation_strategy"])
+
+    lines_info, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines_info, plugins_manager)
+    fetch_checkout_data(checkout_info, plugins_manager, lines_info, force_update=True)
+
+    changed_line_info = lines_info[0]
+    changed_line_info.line.quantity += 1
+    changed_line_info.line.save(update_fields=["quantity"])
+
+    # when
+    with patch("django.db.models.query.QuerySet.bulk_update") as mocked_bulk_update:
+        fetch_checkout_data(
+            checkout_info, plugins_manager, lines_info, force_update=True
+        )
+
+    # then
+    mocked_bulk_update.assert_called_once()
+    updated_lines = mocked_bulk_update.call_args.args[0]
+    assert updated_lines == [changed_line_info.line]
+
+
+def test_fetch_checkout_data_saves_only_expiration_when_prices_didnt_change(
+    checkout_with_items, plugins_manager
+):
+    # given
+    checkout = checkout_with_items
+    tc = checkout.channel.tax_configuration
+    tc.tax_calculation_strategy = TaxCalculationStrategy.FLAT_RATES
+    tc.save(update_fields=["tax_calculation_strategy"])
+
+    lines_info, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines_info, plugins_manager)
+    fetch_checkout_data(checkout_info, plugins_manager, lines_info, force_update=True)
+
+    # when
+    with patch.object(Checkout, "save", autospec=True) as mocked_save:
+        fetch_checkout_data(
+            checkout_info, plugins_manager, lines_info, force_update=True
+        )
+
+    # then
+    saved_fields = [
+        call.kwargs.get("update_fields") for call in mocked_save.call_args_list
+    ]
+    assert ["price_expiration"] in saved_fields
+    assert not any("total_gross_amount" in (fields or []) for fields in saved_fields)
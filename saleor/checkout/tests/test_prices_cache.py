@@ -0,0 +1,178 @@
+from unittest.mock import patch
+
+from django.utils import timezone
+
+from ...tax import TaxCalculationStrategy
+from .. import calculations
+from ..calculations import (
+    checkout_line_total,
+    checkout_line_unit_price,
+    checkout_subtotal,
+    checkout_total,
+    fetch_checkout_data,
+)
+from ..fetch import fetch_checkout_info, fetch_checkout_lines
+from ..models import Checkout, CheckoutLine
+from ..prices_cache import get_cached_prices, get_checkout_prices_cache_key
+
+
+def _fetch_checkout_info_and_lines(checkout, manager):
+    lines_info, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines_info, manager)
+    return checkout_info, lines_info
+
+
+def _set_flat_rates(checkout):
+    tax_configuration = checkout.channel.tax_configuration
+    tax_configuration.tax_calculation_strategy = TaxCalculationStrategy.FLAT_RATES
+    tax_configuration.save(update_fields=["tax_calculation_strategy"])
+
+
+def test_checkout_total_with_prices_cache_doesnt_save_prices(
+    checkout_with_items, plugins_manager, settings
+):
+    # given
+    settings.CHECKOUT_PRICES_CACHE = True
+    checkout = checkout_with_items
+    _set_flat_rates(checkout)
+    price_expiration = timezone.now()
+    checkout.price_expiration = price_expiration
+    checkout.save(update_fields=["price_expiration"])
+    checkout_info, lines_info = _fetch_checkout_info_and_lines(
+        checkout, plugins_manager
+    )
+    cache_key = get_checkout_prices_cache_key(checkout_info, lines_info, None)
+
+    # when
+    total = checkout_total(
+        manager=plugins_manager,
+        checkout_info=checkout_info,
+        lines=lines_info,
+        address=None,
+    )
+
+    # then
+    assert total.gross.amount > 0
+    saved_checkout = Checkout.objects.get(pk=checkout.pk)
+    assert saved_checkout.price_expiration == price_expiration
+    assert saved_checkout.total_gross_amount == 0
+    assert not CheckoutLine.objects.filter(
+        checkout=checkout, total_price_gross_amount__gt=0
+    ).exists()
+    assert get_cached_prices(cache_key)
+
+
+def test_checkout_total_with_prices_cache_reuses_cached_prices(
+    checkout_with_items, plugins_manager, settings
+):
+    # given
+    settings.CHECKOUT_PRICES_CACHE = True
+    checkout = checkout_with_items
+    _set_flat_rates(checkout)
+    checkout_info, lines_info = _fetch_checkout_info_and_lines(
+        checkout, plugins_manager
+    )
+    expected_total = checkout_total(
+        manager=plugins_manager,
+        checkout_info=checkout_info,
+        lines=lines_info,
+        address=None,
+    )
+    checkout = Checkout.objects.get(pk=checkout.pk)
+    checkout_info, lines_info = _fetch_checkout_info_and_lines(
+        checkout, plugins_manager
+    )
+
+    # when
+    with patch(
+        "saleor.checkout.calculations.update_checkout_prices_with_flat_rates"
+    ) as mocked_update_prices_with_flat_rates:
+        total = checkout_total(
+            manager=plugins_manager,
+            checkout_info=checkout_info,
+            lines=lines_info,
+            address=None,
+        )
+
+    # then
+    mocked_update_prices_with_flat_rates.assert_not_called()
+    assert total == expected_total
+
+
+def test_checkout_getters_with_prices_cache_look_up_prices_once(
+    checkout_with_items, plugins_manager, settings
+):
+    # given
+    settings.CHECKOUT_PRICES_CACHE = True
+    checkout = checkout_with_items
+    _set_flat_rates(checkout)
+    checkout_info, lines_info = _fetch_checkout_info_and_lines(
+        checkout, plugins_manager
+    )
+
+    # when
+    with patch.object(
+        calculations,
+        "get_checkout_prices_cache_key",
+        wraps=calculations.get_checkout_prices_cache_key,
+    ) as mocked_get_cache_key, patch.object(
+        calculations,
+        "generate_sale_discount_objects_for_checkout",
+        wraps=calculations.generate_sale_discount_objects_for_checkout,
+    ) as mocked_generate_sale_discounts:
+        total = checkout_total(
+            manager=plugins_manager,
+            checkout_info=checkout_info,
+            lines=lines_info,
+            address=None,
+        )
+        checkout_subtotal(
+            manager=plugins_manager,
+            checkout_info=checkout_info,
+            lines=lines_info,
+            address=None,
+        )
+        for line_info in lines_info:
+            checkout_line_total(
+                manager=plugins_manager,
+                checkout_info=checkout_info,
+                lines=lines_info,
+                checkout_line_info=line_info,
+            )
+            checkout_line_unit_price(
+                manager=plugins_manager,
+                checkout_info=checkout_info,
+                lines=lines_info,
+                checkout_line_info=line_info,
+            )
+
+    # then
+    assert total.gross.amount > 0
+    mocked_get_cache_key.assert_called_once()
+    mocked_generate_sale_discounts.assert_called_once()
+
+
+def test_fetch_checkout_data_with_prices_cache_saves_prices_when_not_reading(
+    checkout_with_items, plugins_manager, settings
+):
+    # given
+    settings.CHECKOUT_PRICES_CACHE = True
+    checkout = checkout_with_items
+    _set_flat_rates(checkout)
+    checkout_info, lines_info = _fetch_checkout_info_and_lines(
+        checkout, plugins_manager
+    )
+    checkout_total(
+        manager=plugins_manager,
+        checkout_info=checkout_info,
+        lines=lines_info,
+        address=None,
+    )
+
+    # when
+    fetch_checkout_data(checkout_info, plugins_manager, lines_info)
+
+    # then
+    checkout.refresh_from_db()
+    assert checkout.price_expiration > timezone.now()
+    assert checkout.total_gross_amount > 0
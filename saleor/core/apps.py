@@ -0,0 +1,18 @@
+from django.apps import AppConfig
+from django.db.models.signals import post_delete, post_save
+
+
+class CoreAppConfig(AppConfig):
+    name = "saleor.core"
+
+    def ready(self):
+        from ..graphql.core.persisted_queries import handle_registered_queries_change
+        from .models import PersistedQuery
+
+        # Registered queries are looked up again when the allow-list changes.
+        for signal_name, signal in [("save", post_save), ("delete", post_delete)]:
+            signal.connect(
+                handle_registered_queries_change,
+                sender=PersistedQuery,
+                dispatch_uid=f"registered_queries_PersistedQuery_{signal_name}",
+            )
@@ -0,0 +1,22 @@
+# Generated by Django 3.2.19 on 2026-10-18 09:12
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("core", "0007_delete_celerytask"),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name="eventpayload",
+            name="compressed_payload",
+            field=models.BinaryField(blank=True, null=True),
+        ),
+        migrations.AddField(
+            model_name="eventpayload",
+            name="hash",
+            field=models.CharField(blank=True, max_length=64, null=True),
+        ),
+    ]
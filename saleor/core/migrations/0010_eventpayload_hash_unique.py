@@ -0,0 +1,36 @@
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+    # The unique index on the event payloads table is created concurrently, so
+    # writes to the table are not blocked while the index is built.
+    atomic = False
+
+    dependencies = [
+        ("core", "0009_persistedquery"),
+    ]
+
+    operations = [
+        migrations.SeparateDatabaseAndState(
+            state_operations=[
+                migrations.AlterField(
+                    model_name="eventpayload",
+                    name="hash",
+                    field=models.CharField(
+                        blank=True, max_length=64, null=True, unique=True
+                    ),
+                ),
+            ],
+            database_operations=[
+                migrations.RunSQL(
+                    """
+                    CREATE UNIQUE INDEX CONCURRENTLY IF NOT EXISTS
+                    core_eventpayload_hash_uniq ON core_eventpayload (hash);
+                    """,
+                    reverse_sql="""
+                    DROP INDEX CONCURRENTLY IF EXISTS core_eventpayload_hash_uniq;
+                    """,
+                ),
+            ],
+        ),
+    ]
@@ -1,12 +1,14 @@
 import datetime
-from typing import Any, TypeVar
+from typing import Any, Dict, List, TypeVar
 
 import pytz
 from django.contrib.postgres.indexes import GinIndex
-from django.db import models, transaction
+from django.db import IntegrityError, models, transaction
 from django.db.models import F, JSONField, Max, Q
+from django.utils import timezone
 
 from . import EventDeliveryStatus, JobStatus
+from .utils.compression import compress_payload, decompress_payload, get_payload_hash
 from .utils.json_serializer import CustomJsonEncoder
 
 
@@ -142,10 +144,114 @@ class Job(models.Model):
         abstract = True
 
 
+# Reused payloads are refreshed when they are older than this period. Payloads
+# without deliveries are deleted only when they're older than twice the period.
+EVENT_PAYLOAD_REFRESH_PERIOD = datetime.timedelta(minutes=5)
+
+
+class EventPayloadQueryset(models.QuerySet):
+    def get_or_create_payloads(self, payloads: List[str]) -> List["EventPayload"]:
+        """Return stored payloads with the given contents, creating missing ones.
+
+        Payloads are stored once per content hash and shared by deliveries.
+        Payloads created within `EVENT_PAYLOAD_REFRESH_PERIOD` are reused as they
+        are, without any writes. Older ones get their `created_at` refreshed, so they
+        are not deleted as unused while deliveries are created for them. The refresh
+        locks the payload rows until the current transaction is committed, so
+        concurrent transactions reusing the same stale payload wait for each other.
+        """
+        now = timezone.now()
+        refresh_before = now - EVENT_PAYLOAD_REFRESH_PERIOD
+        contents = {get_payload_hash(payload): payload for payload in payloads}
+        ids: Dict[str, int] = {}
+        created_at: Dict[str, datetime.datetime] = {}
+        stale_ids = []
+        for payload_hash, payload_id, payload_created_at in self.filter(
+            hash__in=contents
+        ).values_list("hash", "id", "created_at"):
+            ids[payload_hash] = payload_id
+            created_at[payload_hash] = payload_created_at
+            if payload_created_at < refresh_before:
+                stale_ids.append(payload_id)
+                created_at[payload_hash] = now
+        if stale_ids:
+            if self.filter(pk__in=stale_ids).update(created_at=now) < len(stale_ids):
+                # Some of the payloads were deleted by a concurrent transaction.
+                return self.get_or_create_payloads(payloads)
+
+        content_fields = {
+            payload_hash: self.model.get_content_fields(payload)
+            for payload_hash, payload in contents.items()
+        }
+        new_payloads = [
+            self.model(hash=payload_hash, **fields)
+            for payload_hash, fields in content_fields.items()
+            if payload_hash not in ids
+        ]
+        if new_payloads:
+            try:
+                with transaction.atomic():
+                    self.bulk_create(new_payloads)
+            except IntegrityError:
+                # Some of the payloads were created by a concurrent transaction.
+                return self.get_or_create_payloads(payloads)
+            for payload in new_payloads:
+                ids[payload.hash] = payload.pk
+                created_at[payload.hash] = payload.created_at
+
+        event_payloads = {}
+        for payload_hash, fields in content_fields.items():
+            event_payload = self.model(
+                id=ids[payload_hash],
+                hash=payload_hash,
+                created_at=created_at[payload_hash],
+                **fields,
+            )
+            event_payload._state.adding = False
+            event_payload._state.db = self.db
+            event_payloads[payload_hash] = event_payload
+        return [event_payloads[get_payload_hash(payload)] for payload in payloads]
+
+    def get_or_create_payload(self, payload: str) -> "EventPayload":
+        return self.get_or_create_payloads([payload])[0]
+
+    def unused(self, created_before: datetime.datetime):
+        """Return payloads without deliveries created before the given time.
+
+        Payloads created or refreshed within twice the `EVENT_PAYLOAD_REFRESH_PERIOD`
+        are never returned, as they may be reused by transactions that haven't
+        created their deliveries yet.
+        """
+        created_before = min(
+            created_before, timezone.now() - 2 * EVENT_PAYLOAD_REFRESH_PERIOD
+        )
+        return self.filter(deliveries__isnull=True, created_at__lte=created_before)
+
+
+EventPayloadManager = models.Manager.from_queryset(EventPayloadQueryset)
+
+
 class EventPayload(models.Model):
     payload = models.TextField()
+    compressed_payload = models.BinaryField(null=True, blank=True)
+    # Payloads created before the payloads were deduplicated don't have the hash.
+    hash = models.CharField(max_length=64, unique=True, null=True, blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
 
+    objects = EventPayloadManager()
+
+    @staticmethod
+    def get_content_fields(payload: str) -> Dict[str, Any]:
+        compressed_payload = compress_payload(payload)
+        if compressed_payload is not None:
+            return {"payload": "", "compressed_payload": compressed_payload}
+        return {"payload": payload, "compressed_payload": None}
+
+    def get_payload(self) -> str:
+        if self.compressed_payload is not None:
+            return decompress_payload(self.compressed_payload)
+        return self.payload
+
 
 class EventDelivery(models.Model):
     created_at = models.DateTimeField(auto_now_add=True)
@@ -183,3 +289,11 @@ class EventDeliveryAttempt(models.Model):
 
     class Meta:
         ordering = ("-created_at",)
+
+
+class PersistedQuery(models.Model):
+    """GraphQL query allowed to run when only registered queries are allowed."""
+
+    hash = models.CharField(max_length=64, unique=True)
+    query = models.TextField()
+    created_at = models.DateTimeField(auto_now_add=True)
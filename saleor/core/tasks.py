@@ -21,9 +21,9 @@ def delete_event_payloads_task():
         Q(Exists(deliveries.filter(id=OuterRef("delivery_id"))))
         | Q(delivery__isnull=True, created_at__lte=delete_period)
     )
-    payloads = EventPayload.objects.filter(
-        deliveries__isnull=True, created_at__lte=delete_period
-    )
+    # Payloads without deliveries are not needed anymore, they're kept only while they
+    # can be reused by deliveries that are being created.
+    payloads = EventPayload.objects.unused(timezone.now())
 
     attempts._raw_delete(attempts.db)  # type: ignore[attr-defined] # raw access # noqa: E501
     deliveries._raw_delete(deliveries.db)  # type: ignore[attr-defined] # raw access # noqa: E501
@@ -0,0 +1,107 @@
+from datetime import timedelta
+
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+from django.utils import timezone
+from freezegun import freeze_time
+
+from ..models import EVENT_PAYLOAD_REFRESH_PERIOD, EventPayload
+from ..utils.compression import get_payload_hash
+
+PAYLOAD = '{"key": "value"}'
+
+
+def test_get_or_create_payload_creates_payload(db):
+    # when
+    event_payload = EventPayload.objects.get_or_create_payload(PAYLOAD)
+
+    # then
+    stored_payload = EventPayload.objects.get()
+    assert stored_payload.pk == event_payload.pk
+    assert stored_payload.payload == PAYLOAD
+    assert stored_payload.hash == get_payload_hash(PAYLOAD)
+    assert stored_payload.compressed_payload is None
+    assert stored_payload.get_payload() == PAYLOAD
+
+
+def test_get_or_create_payload_reuses_payload(db):
+    # given
+    with freeze_time(timezone.now() - timedelta(days=1)):
+        event_payload = EventPayload.objects.get_or_create_payload(PAYLOAD)
+
+    # when
+    reused_payload = EventPayload.objects.get_or_create_payload(PAYLOAD)
+
+    # then
+    assert reused_payload.pk == event_payload.pk
+    stored_payload = EventPayload.objects.get()
+    assert stored_payload.created_at > event_payload.created_at
+
+
+def test_get_or_create_payload_reuses_recent_payload_without_update(db):
+    # given
+    event_payload = EventPayload.objects.get_or_create_payload(PAYLOAD)
+
+    # when
+    with CaptureQueriesContext(connection) as queries:
+        reused_payload = EventPayload.objects.get_or_create_payload(PAYLOAD)
+
+    # then
+    assert reused_payload.pk == event_payload.pk
+    assert len(queries) == 1
+    stored_payload = EventPayload.objects.get()
+    assert stored_payload.created_at == event_payload.created_at
+
+
+def test_get_or_create_payloads(db):
+    # given
+    existing_payload = EventPayload.objects.get_or_create_payload(PAYLOAD)
+    other_payload = '{"key": "other value"}'
+
+    # when
+    event_payloads = EventPayload.objects.get_or_create_payloads(
+        [other_payload, PAYLOAD, other_payload]
+    )
+
+    # then
+    assert EventPayload.objects.count() == 2
+    assert event_payloads[1].pk == existing_payload.pk
+    assert event_payloads[0].pk == event_payloads[2].pk != existing_payload.pk
+    assert [payload.get_payload() for payload in event_payloads] == [
+        other_payload,
+        PAYLOAD,
+        other_payload,
+    ]
+
+
+def test_get_or_create_payload_with_compression(db, settings):
+    # given
+    pytest.importorskip("zstandard")
+    settings.EVENT_PAYLOAD_COMPRESSION_LEVEL = 3
+
+    # when
+    EventPayload.objects.get_or_create_payload(PAYLOAD)
+
+    # then
+    stored_payload = EventPayload.objects.get()
+    assert stored_payload.payload == ""
+    assert stored_payload.compressed_payload is not None
+    assert stored_payload.get_payload() == PAYLOAD
+
+
+def test_unused_payloads(event_delivery):
+    # given
+    now = timezone.now()
+    with freeze_time(now - 2 * EVENT_PAYLOAD_REFRESH_PERIOD - timedelta(seconds=1)):
+        unused_payload = EventPayload.objects.create(payload=PAYLOAD)
+    EventPayload.objects.filter(pk=event_delivery.payload_id).update(
+        created_at=unused_payload.created_at
+    )
+    EventPayload.objects.create(payload=PAYLOAD)
+
+    # when
+    payloads = EventPayload.objects.unused(now)
+
+    # then
+    assert list(payloads) == [unused_payload]
@@ -0,0 +1,88 @@
+import pytest
+from django.db import transaction
+
+from ...product.models import Product
+from ...tests.utils import flush_post_commit_hooks
+from ..utils.events import call_event
+
+
+class EventsReceiver:
+    def __init__(self):
+        self.calls = []
+
+    def product_updated(self, product):
+        self.calls.append(("product_updated", product))
+
+    def product_created(self, product):
+        self.calls.append(("product_created", product))
+
+
+def test_call_event_coalesces_events_for_the_same_object(product):
+    # given
+    receiver = EventsReceiver()
+    same_product = Product.objects.get(pk=product.pk)
+
+    # when
+    call_event(receiver.product_updated, product)
+    call_event(receiver.product_updated, same_product)
+    flush_post_commit_hooks()
+
+    # then
+    assert receiver.calls == [("product_updated", same_product)]
+    assert receiver.calls[0][1] is same_product
+
+
+def test_call_event_doesnt_coalesce_events_for_different_objects(product_list):
+    # given
+    receiver = EventsReceiver()
+
+    # when
+    for product in product_list:
+        call_event(receiver.product_updated, product)
+    flush_post_commit_hooks()
+
+    # then
+    assert receiver.calls == [("product_updated", product) for product in product_list]
+
+
+def test_call_event_doesnt_coalesce_other_events(product):
+    # given
+    receiver = EventsReceiver()
+
+    # when
+    call_event(receiver.product_created, product)
+    call_event(receiver.product_created, product)
+    flush_post_commit_hooks()
+
+    # then
+    assert receiver.calls == [("product_created", product)] * 2
+
+
+def test_call_event_coalesced_event_of_rolled_back_savepoint(product):
+    # given
+    receiver = EventsReceiver()
+
+    # when
+    with pytest.raises(ValueError):
+        with transaction.atomic():
+            call_event(receiver.product_updated, product)
+            raise ValueError()
+    call_event(receiver.product_updated, product)
+    flush_post_commit_hooks()
+
+    # then
+    assert receiver.calls == [("product_updated", product)]
+
+
+def test_call_event_sends_coalesced_event_again_in_next_transaction(product):
+    # given
+    receiver = EventsReceiver()
+    call_event(receiver.product_updated, product)
+    flush_post_commit_hooks()
+
+    # when
+    call_event(receiver.product_updated, product)
+    flush_post_commit_hooks()
+
+    # then
+    assert receiver.calls == [("product_updated", product)] * 2
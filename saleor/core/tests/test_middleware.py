@@ -1,3 +1,7 @@
+import asyncio
+from unittest import mock
+
+from asgiref.sync import async_to_sync
 from django.core.handlers.base import BaseHandler
 from freezegun import freeze_time
 
@@ -8,6 +12,7 @@ from ..jwt import (
     jwt_encode,
     jwt_user_payload,
 )
+from ..middleware import jwt_refresh_token_middleware
 
 
 @freeze_time("2020-03-18 12:00:00")
@@ -78,3 +83,18 @@ def test_jwt_refresh_token_middleware_samesite_none(rf, customer_user, settings)
     response = handler.get_response(request)
     cookie = response.cookies.get(JWT_REFRESH_TOKEN_COOKIE_NAME)
     assert cookie["samesite"] == "None"
+
+
+def test_jwt_refresh_token_middleware_keeps_async_view_async(rf):
+    # given
+    response = mock.Mock()
+
+    async def get_response(request):
+        return response
+
+    # when
+    middleware = jwt_refresh_token_middleware(get_response)
+
+    # then
+    assert asyncio.iscoroutinefunction(middleware)
+    assert async_to_sync(middleware)(rf.request()) is response
@@ -59,6 +59,22 @@ def test_delete_event_payloads_task(webhook, settings):
     assert EventDeliveryAttempt.objects.count() == 1
 
 
+def test_delete_event_payloads_task_deletes_unused_payloads(event_delivery):
+    # given
+    used_payload = event_delivery.payload
+    with freeze_time(timezone.now() - timedelta(days=1)):
+        unused_payload = EventPayload.objects.create(payload='{"key": "data"}')
+    recent_payload = EventPayload.objects.create(payload='{"key": "data"}')
+
+    # when
+    delete_event_payloads_task()
+
+    # then
+    assert not EventPayload.objects.filter(pk=unused_payload.pk).exists()
+    assert EventPayload.objects.filter(pk=used_payload.pk).exists()
+    assert EventPayload.objects.filter(pk=recent_payload.pk).exists()
+
+
 def test_delete_files_from_storage_task(
     product_with_image, variant_with_image, media_root
 ):
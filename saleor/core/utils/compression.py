@@ -0,0 +1,40 @@
+import hashlib
+from typing import Optional
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+def get_payload_hash(payload: str) -> str:
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+def compress_payload(payload: str) -> Optional[bytes]:
+    """Compress the payload with zstd or return None if compression is disabled."""
+    level = settings.EVENT_PAYLOAD_COMPRESSION_LEVEL
+    if level <= 0:
+        return None
+    if zstandard is None:
+        raise ImproperlyConfigured(
+            "EVENT_PAYLOAD_COMPRESSION_LEVEL requires the zstandard package to be "
+            "installed."
+        )
+    return zstandard.ZstdCompressor(level=level).compress(payload.encode("utf-8"))
+
+
+def decompress_payload(compressed_payload: bytes) -> str:
+    if zstandard is None:
+        raise ImproperlyConfigured(
+            "Decompressing event payloads requires the zstandard package to be "
+            "installed."
+        )
+    return (
+        zstandard.ZstdDecompressor()
+        .decompress(bytes(compressed_payload))
+        .decode("utf-8")
+    )
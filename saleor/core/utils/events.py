@@ -1,13 +1,90 @@
+import threading
+import weakref
+from functools import partial
+
 from django.db import transaction
+from django.db.models import Model
+
+# Events sent once per transaction for the same object. When such an event is called
+# again for the same arguments before the transaction is committed, it's sent once,
+# with the arguments of the latest call.
+COALESCED_EVENTS = {
+    "product_updated",
+    "product_variant_updated",
+    "product_variant_stock_updated",
+}
+
+
+class PendingEvent:
+    __slots__ = ("func_obj", "func_args", "func_kwargs", "called", "__weakref__")
+
+    def __init__(self):
+        self.called = False
+
+
+class PendingEvents(threading.local):
+    def __init__(self):
+        # Events are referenced by the transaction's on-commit callbacks only, so
+        # events of rolled back transactions are dropped together with them.
+        self.events: weakref.WeakValueDictionary = weakref.WeakValueDictionary()
+
+
+pending_events = PendingEvents()
+
+
+def _get_event_key_value(value):
+    if isinstance(value, Model):
+        return (value._meta.label, value.pk) if value.pk is not None else None
+    if value is None or isinstance(value, (str, int, float)):
+        return (type(value), value)
+    return None
+
+
+def get_coalesced_event_key(func_obj, func_args, func_kwargs):
+    """Return the key identifying the event call or None if it can't be coalesced."""
+    name = getattr(func_obj, "__name__", None)
+    if name not in COALESCED_EVENTS:
+        return None
+    values = []
+    for value in (*func_args, *(value for _, value in sorted(func_kwargs.items()))):
+        key_value = _get_event_key_value(value)
+        if key_value is None:
+            return None
+        values.append(key_value)
+    receiver = getattr(func_obj, "__self__", None)
+    return id(receiver), name, tuple(sorted(func_kwargs)), tuple(values)
+
+
+def _call_pending_event(event: PendingEvent):
+    if event.called:
+        return
+    event.called = True
+    event.func_obj(*event.func_args, **event.func_kwargs)
 
 
 def call_event(func_obj, *func_args, **func_kwargs):
     """Call webhook event with given args.
 
-    Ensures that in atomic transaction event is called on_commit.
+    Ensures that in atomic transaction event is called on_commit. Events listed in
+    `COALESCED_EVENTS` are called once per transaction for the same arguments.
     """
     connection = transaction.get_connection()
-    if connection.in_atomic_block:
-        transaction.on_commit(lambda: func_obj(*func_args, **func_kwargs))
-    else:
+    if not connection.in_atomic_block:
         func_obj(*func_args, **func_kwargs)
+        return
+
+    key = get_coalesced_event_key(func_obj, func_args, func_kwargs)
+    if key is None:
+        transaction.on_commit(lambda: func_obj(*func_args, **func_kwargs))
+        return
+
+    event = pending_events.events.get(key)
+    if event is None or event.called:
+        event = PendingEvent()
+        pending_events.events[key] = event
+    event.func_obj = func_obj
+    event.func_args = func_args
+    event.func_kwargs = func_kwargs
+    # The callback is registered for each call, so the event is sent even if
+    # the savepoint of the first call is rolled back.
+    transaction.on_commit(partial(_call_pending_event, event))
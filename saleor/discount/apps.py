@@ -0,0 +1,28 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class DiscountAppConfig(AppConfig):
+    name = "saleor.discount"
+
+    def ready(self):
+        from ..channel.models import Channel
+        from ..product.models import Category
+        from .models import Sale, SaleChannelListing
+        from .sale_index import handle_sale_catalogue_change, handle_sales_change
+
+        # The sale index is reloaded when these models change. Channel listings in
+        # the index are keyed by channel slugs.
+        for model in [Sale, SaleChannelListing, Category, Channel]:
+            for signal_name, signal in [("save", post_save), ("delete", post_delete)]:
+                signal.connect(
+                    handle_sales_change,
+                    sender=model,
+                    dispatch_uid=f"sale_index_{model.__name__}_{signal_name}",
+                )
+        for field_name in ["products", "variants", "categories", "collections"]:
+            m2m_changed.connect(
+                handle_sale_catalogue_change,
+                sender=getattr(Sale, field_name).through,
+                dispatch_uid=f"sale_index_Sale_{field_name}",
+            )
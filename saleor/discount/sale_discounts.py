@@ -0,0 +1,241 @@
+from collections import defaultdict
+from dataclasses import dataclass
+from decimal import ROUND_HALF_UP, Decimal
+from typing import (
+    TYPE_CHECKING,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    cast,
+)
+from uuid import UUID
+
+from babel.numbers import get_currency_precision
+from prices import Money, percentage_discount
+
+from . import DiscountInfo
+from .models import DiscountValueType, Sale, SaleChannelListing
+
+if TYPE_CHECKING:
+    from ..checkout.fetch import CheckoutLineInfo
+
+# Decimal operations are exact up to the digits of the default context.
+DECIMAL_PRECISION_LIMIT = 10**27
+
+
+@dataclass
+class BestSaleDiscount:
+    sale: Sale
+    sale_channel_listing: SaleChannelListing
+    amount: Decimal
+
+
+def _get_decimal_places(amount: Decimal) -> int:
+    return max(0, -amount.as_tuple().exponent)
+
+
+def _to_units(amount: Decimal, exponent: int) -> int:
+    return int(amount.scaleb(exponent))
+
+
+def _to_decimal(units: int, exponent: int) -> Decimal:
+    return Decimal(units).scaleb(-exponent)
+
+
+def _get_lines_per_sale(
+    lines_info: Sequence["CheckoutLineInfo"], sales_info: Sequence[DiscountInfo]
+) -> List[List[int]]:
+    """Return positions of lines each sale applies to, in the order of lines."""
+    sales_per_product: Dict[int, List[int]] = defaultdict(list)
+    sales_per_variant: Dict[int, List[int]] = defaultdict(list)
+    sales_per_category: Dict[int, List[int]] = defaultdict(list)
+    sales_per_collection: Dict[int, List[int]] = defaultdict(list)
+    for position, sale_info in enumerate(sales_info):
+        for product_id in sale_info.product_ids:
+            sales_per_product[product_id].append(position)
+        for variant_id in sale_info.variants_ids:
+            sales_per_variant[variant_id].append(position)
+        for category_id in sale_info.category_ids:
+            sales_per_category[category_id].append(position)
+        for collection_id in sale_info.collection_ids:
+            sales_per_collection[collection_id].append(position)
+
+    lines_per_sale: List[List[int]] = [[] for _ in sales_info]
+    for line_position, line_info in enumerate(lines_info):
+        sale_positions = set(sales_per_product.get(line_info.product.id, ()))
+        sale_positions.update(sales_per_variant.get(line_info.variant.id, ()))
+        sale_positions.update(
+            sales_per_category.get(line_info.product.category_id, ())
+        )
+        for collection in line_info.collections:
+            sale_positions.update(sales_per_collection.get(collection.id, ()))
+        for sale_position in sale_positions:
+            lines_per_sale[sale_position].append(line_position)
+    return lines_per_sale
+
+
+def _round_half_up(numerator: int, denominator: int) -> int:
+    quotient, remainder = divmod(abs(numerator), denominator)
+    if 2 * remainder >= denominator:
+        quotient += 1
+    return quotient if numerator >= 0 else -quotient
+
+
+def _is_rounding_exact(numerator: int, denominator: int) -> bool:
+    """Check if dividing amounts as decimals gives the same rounded result.
+
+    Decimal division rounds the quotient to the digits of the context, which may
+    move it over the half of a unit only when it's very close to it.
+    """
+    if abs(numerator) >= DECIMAL_PRECISION_LIMIT:
+        return False
+    remainder = abs(numerator) % denominator
+    return abs(2 * remainder - denominator) * DECIMAL_PRECISION_LIMIT > 2 * abs(
+        numerator
+    )
+
+
+def get_best_sale_discounts(
+    lines_info: Iterable["CheckoutLineInfo"],
+    sales_info: Iterable[DiscountInfo],
+    channel_slug: str,
+    currency: str,
+) -> Dict[UUID, BestSaleDiscount]:
+    """Return the sale giving the highest discount for each line.
+
+    Percentage sales are applied to the total of all lines they apply to and the
+    discount is split between the lines proportionally to their totals. Fixed sales
+    are applied to the unit price of each line. When sales give the same discount,
+    the first one is used.
+
+    Amounts are computed as integers in the smallest unit of all prices, which gives
+    the same results as computing them on decimals, rounded the same way.
+    """
+    lines_info = list(lines_info)
+    sales: List[Tuple[DiscountInfo, SaleChannelListing]] = []
+    for sale_info in sales_info:
+        sale_channel_listing = sale_info.channel_listings.get(channel_slug)
+        if sale_channel_listing:
+            sales.append((sale_info, sale_channel_listing))
+    if not lines_info or not sales:
+        return {}
+
+    unit_prices = []
+    quantities = []
+    for line_info in lines_info:
+        line = line_info.line
+        base_unit_price = line_info.variant.get_base_price(
+            line_info.channel_listing, line.price_override
+        )
+        unit_prices.append(base_unit_price.amount)
+        quantities.append(line.quantity)
+    line_totals = [
+        unit_price * quantity for unit_price, quantity in zip(unit_prices, quantities)
+    ]
+    lines_per_sale = _get_lines_per_sale(lines_info, [sale for sale, _ in sales])
+
+    # The discount of a percentage sale is computed once for the total of its lines.
+    precision = get_currency_precision(currency)
+    sale_totals: Dict[int, Tuple[Decimal, Decimal]] = {}
+    for position, (sale_info, sale_channel_listing) in enumerate(sales):
+        if sale_info.sale.type == DiscountValueType.FIXED:
+            continue
+        total = sum(
+            (line_totals[line_position] for line_position in lines_per_sale[position]),
+            Decimal(0),
+        )
+        if total == Decimal(0):
+            continue
+        discounted_total = percentage_discount(
+            Money(total, sale_channel_listing.currency),
+            percentage=sale_channel_listing.discount_value,
+            rounding=ROUND_HALF_UP,
+        ).amount
+        sale_totals[position] = (total, total - discounted_total)
+
+    exponent = max(
+        [precision]
+        + [_get_decimal_places(amount) for amount in unit_prices]
+        + [_get_decimal_places(amount) for amount in line_totals]
+        + [
+            _get_decimal_places(sale_channel_listing.discount_value)
+            for _, sale_channel_listing in sales
+        ]
+        + [
+            _get_decimal_places(amount)
+            for amounts in sale_totals.values()
+            for amount in amounts
+        ]
+    )
+    unit_price_units = [_to_units(amount, exponent) for amount in unit_prices]
+    line_total_units = [_to_units(amount, exponent) for amount in line_totals]
+    precision_step = 10 ** (exponent - precision)
+
+    best_units: List[Optional[int]] = [None] * len(lines_info)
+    best_sales: List[Optional[int]] = [None] * len(lines_info)
+
+    def update_best_sale(line_position: int, sale_position: int, units: int):
+        best = best_units[line_position]
+        if best is None or best < units:
+            best_units[line_position] = units
+            best_sales[line_position] = sale_position
+
+    for position, (sale_info, sale_channel_listing) in enumerate(sales):
+        if sale_info.sale.type == DiscountValueType.FIXED:
+            value_units = _to_units(sale_channel_listing.discount_value, exponent)
+            for line_position in lines_per_sale[position]:
+                unit_discount = min(value_units, unit_price_units[line_position])
+                units = unit_discount * quantities[line_position]
+                if abs(units) >= DECIMAL_PRECISION_LIMIT:
+                    units = _to_units(
+                        _to_decimal(unit_discount, exponent)
+                        * quantities[line_position],
+                        exponent,
+                    )
+                update_best_sale(line_position, position, units)
+            continue
+
+        if position not in sale_totals:
+            continue
+        total, discount = sale_totals[position]
+        remaining_total = _to_units(total, exponent)
+        remaining_discount = _to_units(discount, exponent)
+        for line_position in lines_per_sale[position]:
+            line_total = line_total_units[line_position]
+            if remaining_total == 0:
+                units = 0
+            else:
+                numerator = line_total * remaining_discount
+                denominator = remaining_total * precision_step
+                if denominator > 0 and _is_rounding_exact(numerator, denominator):
+                    units = _round_half_up(numerator, denominator) * precision_step
+                else:
+                    amount = (
+                        _to_decimal(line_total, exponent)
+                        * _to_decimal(remaining_discount, exponent)
+                        / _to_decimal(remaining_total, exponent)
+                    ).quantize(Decimal(1).scaleb(-precision), ROUND_HALF_UP)
+                    units = _to_units(amount, exponent)
+            remaining_discount -= units
+            remaining_total -= line_total
+            update_best_sale(line_position, position, units)
+
+    best_discounts: Dict[UUID, BestSaleDiscount] = {}
+    quantum = Decimal(1).scaleb(-precision)
+    for line_position, line_info in enumerate(lines_info):
+        sale_position = best_sales[line_position]
+        if sale_position is None:
+            continue
+        sale_info, sale_channel_listing = sales[sale_position]
+        amount = _to_decimal(cast(int, best_units[line_position]), exponent)
+        if sale_info.sale.type != DiscountValueType.FIXED:
+            amount = amount.quantize(quantum)
+        best_discounts[line_info.line.id] = BestSaleDiscount(
+            sale=sale_info.sale,
+            sale_channel_listing=sale_channel_listing,
+            amount=amount,
+        )
+    return best_discounts
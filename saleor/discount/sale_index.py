@@ -0,0 +1,275 @@
+import bisect
+import datetime
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Dict, FrozenSet, Iterable, List, Optional, Set
+
+import opentracing
+from django.core.cache import cache
+from django.db import transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from . import DiscountInfo
+from .models import Sale, SaleChannelListing
+
+if TYPE_CHECKING:
+    from ..checkout.fetch import CheckoutLineInfo
+
+SALE_INDEX_VERSION_CACHE_KEY = "sale-index-version"
+
+
+@dataclass(frozen=True)
+class IndexedSale:
+    sale: Sale
+    channel_listings: Dict[str, SaleChannelListing]
+    product_ids: FrozenSet[int]
+    variant_ids: FrozenSet[int]
+    # Categories of the sale together with all their subcategories.
+    category_ids: FrozenSet[int]
+    collection_ids: FrozenSet[int]
+
+    def is_active(self, date: datetime.datetime) -> bool:
+        return self.sale.start_date <= date and (
+            self.sale.end_date is None or self.sale.end_date >= date
+        )
+
+
+@dataclass
+class SaleIndex:
+    """Sales which haven't ended yet, with the catalogue entries they apply to.
+
+    Sales are looked up by the variant, product, category and collection of a line,
+    so matching lines doesn't depend on the number of sales. Sales which start in
+    the future are indexed too and are matched once they start.
+
+    Instances are shared between requests of the process, so the returned objects
+    must not be modified.
+    """
+
+    version: str
+    sales: Dict[int, IndexedSale]
+    sales_by_variant: Dict[int, FrozenSet[int]]
+    sales_by_product: Dict[int, FrozenSet[int]]
+    sales_by_category: Dict[int, FrozenSet[int]]
+    sales_by_collection: Dict[int, FrozenSet[int]]
+
+    def get_discounts(self, date: datetime.datetime) -> List[DiscountInfo]:
+        """Return all sales active at the given date."""
+        return [
+            DiscountInfo(
+                sale=indexed_sale.sale,
+                channel_listings=indexed_sale.channel_listings,
+                product_ids=indexed_sale.product_ids,
+                category_ids=indexed_sale.category_ids,
+                collection_ids=indexed_sale.collection_ids,
+                variants_ids=indexed_sale.variant_ids,
+            )
+            for indexed_sale in self.sales.values()
+            if indexed_sale.is_active(date)
+        ]
+
+    def get_discounts_for_lines(
+        self, lines_info: Iterable["CheckoutLineInfo"], date: datetime.datetime
+    ) -> List[DiscountInfo]:
+        """Return sales active at the given date which apply to any of the lines.
+
+        The catalogue ids of returned discounts are limited to those of the lines.
+        """
+        product_ids: Dict[int, Set[int]] = defaultdict(set)
+        variant_ids: Dict[int, Set[int]] = defaultdict(set)
+        category_ids: Dict[int, Set[int]] = defaultdict(set)
+        collection_ids: Dict[int, Set[int]] = defaultdict(set)
+        empty: FrozenSet[int] = frozenset()
+        for line_info in lines_info:
+            variant_id = line_info.variant.pk
+            for sale_id in self.sales_by_variant.get(variant_id, empty):
+                variant_ids[sale_id].add(variant_id)
+            product_id = line_info.product.pk
+            for sale_id in self.sales_by_product.get(product_id, empty):
+                product_ids[sale_id].add(product_id)
+            category_id = line_info.product.category_id
+            if category_id is not None:
+                for sale_id in self.sales_by_category.get(category_id, empty):
+                    category_ids[sale_id].add(category_id)
+            for collection in line_info.collections:
+                for sale_id in self.sales_by_collection.get(collection.pk, empty):
+                    collection_ids[sale_id].add(collection.pk)
+
+        matched_sale_ids = (
+            product_ids.keys()
+            | variant_ids.keys()
+            | category_ids.keys()
+            | collection_ids.keys()
+        )
+        return [
+            DiscountInfo(
+                sale=indexed_sale.sale,
+                channel_listings=indexed_sale.channel_listings,
+                product_ids=product_ids.get(sale_id, set()),
+                category_ids=category_ids.get(sale_id, set()),
+                collection_ids=collection_ids.get(sale_id, set()),
+                variants_ids=variant_ids.get(sale_id, set()),
+            )
+            for sale_id, indexed_sale in self.sales.items()
+            if sale_id in matched_sale_ids and indexed_sale.is_active(date)
+        ]
+
+
+_index: Optional[SaleIndex] = None
+
+
+def get_sale_index_version() -> str:
+    version = cache.get(SALE_INDEX_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(SALE_INDEX_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(SALE_INDEX_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_sale_index():
+    """Make all processes reload the sale index.
+
+    The version is changed right away, so the current transaction sees its own
+    changes, and once again after commit, so other processes don't keep the data
+    they loaded before the transaction was committed.
+    """
+
+    def bump_version():
+        clear_sale_index()
+        cache.set(SALE_INDEX_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def clear_sale_index():
+    """Drop the index loaded by the current process."""
+    global _index
+    _index = None
+
+
+def _fetch_sale_relations(through_model, field_name: str, sale_ids: Iterable[int]):
+    relations: Dict[int, Set[int]] = defaultdict(set)
+    for sale_id, object_id in through_model.objects.filter(
+        sale_id__in=sale_ids
+    ).values_list("sale_id", field_name):
+        relations[sale_id].add(object_id)
+    return relations
+
+
+def _expand_categories(category_ids_per_sale: Dict[int, Set[int]]):
+    """Add all subcategories to the categories of each sale."""
+    from ..product.models import Category
+
+    if not category_ids_per_sale:
+        return category_ids_per_sale
+    # Subcategories of a category follow it in the tree order and have `lft` lower
+    # than `rght` of the category.
+    tree = list(
+        Category.objects.order_by("tree_id", "lft").values_list(
+            "id", "tree_id", "lft", "rght"
+        )
+    )
+    positions = {row[0]: position for position, row in enumerate(tree)}
+    tree_keys = [(tree_id, lft) for _, tree_id, lft, _ in tree]
+    expanded: Dict[int, Set[int]] = {}
+    for sale_id, category_ids in category_ids_per_sale.items():
+        expanded_ids = set()
+        for category_id in category_ids:
+            position = positions.get(category_id)
+            if position is None:
+                continue
+            _, tree_id, _, rght = tree[position]
+            end = bisect.bisect_left(tree_keys, (tree_id, rght), lo=position)
+            expanded_ids.update(row[0] for row in tree[position:end])
+        expanded[sale_id] = expanded_ids
+    return expanded
+
+
+def _invert(object_ids_per_sale: Dict[int, Set[int]]) -> Dict[int, FrozenSet[int]]:
+    sale_ids_per_object: Dict[int, Set[int]] = defaultdict(set)
+    for sale_id, object_ids in object_ids_per_sale.items():
+        for object_id in object_ids:
+            sale_ids_per_object[object_id].add(sale_id)
+    return {
+        object_id: frozenset(sale_ids)
+        for object_id, sale_ids in sale_ids_per_object.items()
+    }
+
+
+def load_sale_index(version: str) -> SaleIndex:
+    with opentracing.global_tracer().start_active_span("load_sale_index"):
+        sales = list(
+            Sale.objects.filter(
+                Q(end_date__isnull=True) | Q(end_date__gte=timezone.now())
+            )
+        )
+        sale_ids = [sale.pk for sale in sales]
+
+        channel_listings: Dict[int, Dict[str, SaleChannelListing]] = defaultdict(dict)
+        for channel_listing in SaleChannelListing.objects.filter(
+            sale_id__in=sale_ids
+        ).annotate(channel_slug=F("channel__slug")):
+            channel_listings[channel_listing.sale_id][
+                channel_listing.channel_slug
+            ] = channel_listing
+
+        products = _fetch_sale_relations(Sale.products.through, "product_id", sale_ids)
+        variants = _fetch_sale_relations(
+            Sale.variants.through, "productvariant_id", sale_ids
+        )
+        categories = _expand_categories(
+            _fetch_sale_relations(Sale.categories.through, "category_id", sale_ids)
+        )
+        collections = _fetch_sale_relations(
+            Sale.collections.through, "collection_id", sale_ids
+        )
+
+        indexed_sales = {
+            sale.pk: IndexedSale(
+                sale=sale,
+                channel_listings=channel_listings.get(sale.pk, {}),
+                product_ids=frozenset(products.get(sale.pk, ())),
+                variant_ids=frozenset(variants.get(sale.pk, ())),
+                category_ids=frozenset(categories.get(sale.pk, ())),
+                collection_ids=frozenset(collections.get(sale.pk, ())),
+            )
+            for sale in sales
+        }
+        return SaleIndex(
+            version=version,
+            sales=indexed_sales,
+            sales_by_variant=_invert(variants),
+            sales_by_product=_invert(products),
+            sales_by_category=_invert(categories),
+            sales_by_collection=_invert(collections),
+        )
+
+
+def get_sale_index() -> SaleIndex:
+    """Return the index of sales which haven't ended yet.
+
+    The index is reused by the process until the version stored in the cache
+    changes, which happens when any `Sale`, `SaleChannelListing` or `Category` is
+    saved or deleted, or when the catalogue of a sale changes. Sales which start or
+    end are handled by checking the dates on lookup, so the index isn't reloaded
+    when `sale_toggle` is sent.
+    """
+    global _index
+    version = get_sale_index_version()
+    index = _index
+    if index is None or index.version != version:
+        index = load_sale_index(version)
+        _index = index
+    return index
+
+
+def handle_sales_change(sender, **kwargs):
+    invalidate_sale_index()
+
+
+def handle_sale_catalogue_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_sale_index()
@@ -0,0 +1,90 @@
+from decimal import Decimal
+
+import pytest
+
+from ....checkout.fetch import fetch_checkout_info, fetch_checkout_lines
+from ....checkout.models import CheckoutLine
+from ....plugins.manager import get_plugins_manager
+from ....product.models import ProductVariant, ProductVariantChannelListing
+from ... import DiscountValueType
+from ...models import Sale, SaleChannelListing, SaleTranslation
+from ...utils import (
+    create_or_update_discount_objects_from_sale_for_checkout,
+    fetch_active_sales_for_checkout,
+)
+
+
+@pytest.fixture
+def checkout_with_lines_and_sales(request, checkout, product, channel_USD):
+    lines_count, sales_count = request.param
+    variants = ProductVariant.objects.bulk_create(
+        [
+            ProductVariant(product=product, sku=f"SKU-{index}")
+            for index in range(lines_count)
+        ]
+    )
+    ProductVariantChannelListing.objects.bulk_create(
+        [
+            ProductVariantChannelListing(
+                variant=variant,
+                channel=channel_USD,
+                price_amount=Decimal("9.999") + index,
+                currency=channel_USD.currency_code,
+            )
+            for index, variant in enumerate(variants)
+        ]
+    )
+    CheckoutLine.objects.bulk_create(
+        [
+            CheckoutLine(
+                checkout=checkout,
+                variant=variant,
+                quantity=index % 7 + 1,
+                currency=checkout.currency,
+            )
+            for index, variant in enumerate(variants)
+        ]
+    )
+    checkout.language_code = "fr"
+    checkout.save(update_fields=["language_code"])
+
+    for index in range(sales_count):
+        sale = Sale.objects.create(
+            name=f"Sale {index}",
+            type=DiscountValueType.PERCENTAGE if index % 2 else DiscountValueType.FIXED,
+        )
+        SaleChannelListing.objects.create(
+            sale=sale,
+            channel=channel_USD,
+            discount_value=Decimal(index + 1),
+            currency=channel_USD.currency_code,
+        )
+        SaleTranslation.objects.create(
+            sale=sale, language_code="fr", name=f"Solde {index}"
+        )
+        sale.variants.add(*variants[index::sales_count])
+
+    lines_info, _ = fetch_checkout_lines(checkout)
+    checkout_info = fetch_checkout_info(checkout, lines_info, get_plugins_manager())
+    return checkout_info, lines_info
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+@pytest.mark.parametrize(
+    "checkout_with_lines_and_sales", [(10, 5), (300, 100)], indirect=True
+)
+def test_create_discount_objects_from_sales_for_synthetic_checkout(
+    checkout_with_lines_and_sales, count_queries
+):
+    checkout_info, lines_info = checkout_with_lines_and_sales
+    sales_info = fetch_active_sales_for_checkout(lines_info)
+
+    create_or_update_discount_objects_from_sale_for_checkout(
+        checkout_info, lines_info, sales_info
+    )
+
+    assert all(
+        line_info.discounts[0].translated_name.startswith("Solde")
+        for line_info in lines_info
+    )
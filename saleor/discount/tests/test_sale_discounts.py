@@ -0,0 +1,189 @@
+import random
+from collections import defaultdict
+from decimal import ROUND_HALF_UP, Decimal
+from uuid import uuid4
+
+import pytest
+from prices import Money
+
+from ...channel.models import Channel
+from ...checkout.fetch import CheckoutLineInfo
+from ...checkout.models import CheckoutLine
+from ...product.models import (
+    Collection,
+    Product,
+    ProductVariant,
+    ProductVariantChannelListing,
+)
+from .. import DiscountInfo, DiscountValueType
+from ..models import Sale, SaleChannelListing
+from ..sale_discounts import get_best_sale_discounts
+from ..utils import apply_discount_to_value, is_sale_applicable_on_line
+
+CHANNEL_SLUG = "main"
+CURRENCY = "USD"
+
+
+def _generate_lines_info(rng, lines_count):
+    channel = Channel(slug=CHANNEL_SLUG, currency_code=CURRENCY)
+    collections = [Collection(id=index) for index in range(1, 11)]
+    lines_info = []
+    for index in range(1, lines_count + 1):
+        product = Product(id=index, category_id=rng.randint(1, 10))
+        price_amount = Decimal(rng.randint(1, 10**7)).scaleb(-3)
+        price_override = None
+        if rng.random() < 0.1:
+            price_override = Decimal(rng.randint(1, 10**6)).scaleb(-2)
+        lines_info.append(
+            CheckoutLineInfo(
+                line=CheckoutLine(
+                    id=uuid4(),
+                    quantity=rng.randint(1, 50),
+                    price_override=price_override,
+                ),
+                variant=ProductVariant(id=index, product=product),
+                channel_listing=ProductVariantChannelListing(
+                    price_amount=price_amount, currency=CURRENCY
+                ),
+                product=product,
+                product_type=None,  # type: ignore
+                collections=rng.sample(collections, rng.randint(0, 2)),
+                discounts=[],
+                channel=channel,
+            )
+        )
+    return lines_info
+
+
+def _generate_sales_info(rng, sales_count, lines_count):
+    sales_info = []
+    for index in range(1, sales_count + 1):
+        sale_type = rng.choice([DiscountValueType.FIXED, DiscountValueType.PERCENTAGE])
+        if sale_type == DiscountValueType.FIXED:
+            discount_value = Decimal(rng.randint(1, 10**5)).scaleb(-2)
+        else:
+            discount_value = Decimal(rng.randint(1, 10**4)).scaleb(-2)
+        channel_listings = {}
+        if rng.random() < 0.9:
+            channel_listings[CHANNEL_SLUG] = SaleChannelListing(
+                discount_value=discount_value, currency=CURRENCY
+            )
+        sales_info.append(
+            DiscountInfo(
+                sale=Sale(id=index, type=sale_type, name=f"Sale {index}"),
+                channel_listings=channel_listings,
+                product_ids=set(rng.sample(range(1, lines_count + 1), 5)),
+                variants_ids=set(rng.sample(range(1, lines_count + 1), 5)),
+                category_ids=set(rng.sample(range(1, 11), rng.randint(0, 1))),
+                collection_ids=set(rng.sample(range(1, 11), rng.randint(0, 1))),
+            )
+        )
+    return sales_info
+
+
+def _get_expected_best_discounts(lines_info, sales_info):
+    """Compute discounts sale by sale and line by line with decimals."""
+    best_discounts = defaultdict(lambda: (None, Decimal("-Inf")))
+    for sale_info in sales_info:
+        sale_channel_listing = sale_info.channel_listings.get(CHANNEL_SLUG)
+        if not sale_channel_listing:
+            continue
+        qualified_lines = [
+            line_info
+            for line_info in lines_info
+            if is_sale_applicable_on_line(line_info, sale_info)
+        ]
+        line_totals = {}
+        for line_info in qualified_lines:
+            base_unit_price = line_info.variant.get_base_price(
+                line_info.channel_listing, line_info.line.price_override
+            )
+            if sale_info.sale.type == DiscountValueType.FIXED:
+                discounted_price = apply_discount_to_value(
+                    sale_channel_listing.discount_value,
+                    sale_info.sale.type,
+                    CURRENCY,
+                    base_unit_price,
+                )
+                unit_discount = min(base_unit_price - discounted_price, base_unit_price)
+                amount = (unit_discount * line_info.line.quantity).amount
+                if best_discounts[line_info.line.id][1] < amount:
+                    best_discounts[line_info.line.id] = (sale_info.sale, amount)
+            line_totals[line_info.line.id] = (
+                base_unit_price.amount * line_info.line.quantity
+            )
+        if sale_info.sale.type == DiscountValueType.FIXED:
+            continue
+
+        remaining_total = sum(line_totals.values(), Decimal(0))
+        if not remaining_total:
+            continue
+        discounted_total = apply_discount_to_value(
+            sale_channel_listing.discount_value,
+            sale_info.sale.type,
+            CURRENCY,
+            Money(remaining_total, CURRENCY),
+        ).amount
+        remaining_discount = remaining_total - discounted_total
+        for line_id, line_total in line_totals.items():
+            amount = (line_total * remaining_discount / remaining_total).quantize(
+                Decimal("0.01"), ROUND_HALF_UP
+            )
+            remaining_discount -= amount
+            remaining_total -= line_total
+            if best_discounts[line_id][1] < amount:
+                best_discounts[line_id] = (sale_info.sale, amount)
+    return dict(best_discounts)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_get_best_sale_discounts_matches_decimal_calculation(seed):
+    # given
+    rng = random.Random(seed)
+    lines_count = 300
+    lines_info = _generate_lines_info(rng, lines_count)
+    sales_info = _generate_sales_info(rng, 200, lines_count)
+
+    # when
+    best_discounts = get_best_sale_discounts(
+        lines_info, sales_info, CHANNEL_SLUG, CURRENCY
+    )
+
+    # then
+    expected_best_discounts = _get_expected_best_discounts(lines_info, sales_info)
+    assert best_discounts.keys() == expected_best_discounts.keys()
+    for line_id, (sale, amount) in expected_best_discounts.items():
+        assert best_discounts[line_id].sale == sale
+        assert best_discounts[line_id].amount == amount
+
+
+def test_get_best_sale_discounts_uses_first_of_equal_sales():
+    # given
+    rng = random.Random(0)
+    lines_info = _generate_lines_info(rng, 1)
+    line_info = lines_info[0]
+    sales_info = [
+        DiscountInfo(
+            sale=Sale(id=index, type=DiscountValueType.FIXED),
+            channel_listings={
+                CHANNEL_SLUG: SaleChannelListing(
+                    discount_value=Decimal("0.01"), currency=CURRENCY
+                )
+            },
+            product_ids={line_info.product.id},
+            variants_ids=set(),
+            category_ids=set(),
+            collection_ids=set(),
+        )
+        for index in range(1, 4)
+    ]
+
+    # when
+    best_discounts = get_best_sale_discounts(
+        lines_info, sales_info, CHANNEL_SLUG, CURRENCY
+    )
+
+    # then
+    best_discount = best_discounts[line_info.line.id]
+    assert best_discount.sale == sales_info[0].sale
+    assert best_discount.amount == Decimal("0.01") * line_info.line.quantity
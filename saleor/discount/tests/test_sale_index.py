@@ -0,0 +1,117 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
+from ...product.models import Category
+from ..models import Sale
+from ..sale_index import get_sale_index
+
+
+def test_get_sale_index_reuses_loaded_index(new_sale, django_assert_num_queries):
+    # given
+    index = get_sale_index()
+
+    # when
+    with django_assert_num_queries(0):
+        reused_index = get_sale_index()
+
+    # then
+    assert reused_index is index
+    assert set(index.sales) == {new_sale.pk}
+
+
+def test_get_sale_index_reloaded_after_sale_catalogue_change(new_sale, product):
+    # given
+    index = get_sale_index()
+    assert product.pk not in index.sales_by_product
+
+    # when
+    new_sale.products.add(product)
+
+    # then
+    reloaded_index = get_sale_index()
+    assert reloaded_index is not index
+    assert reloaded_index.sales_by_product[product.pk] == {new_sale.pk}
+
+
+def test_get_sale_index_reloaded_after_channel_slug_change(new_sale, channel_USD):
+    # given
+    index = get_sale_index()
+
+    # when
+    channel_USD.slug = "new-channel-slug"
+    channel_USD.save(update_fields=["slug"])
+
+    # then
+    reloaded_index = get_sale_index()
+    assert reloaded_index is not index
+    assert set(reloaded_index.sales[new_sale.pk].channel_listings) == {
+        "new-channel-slug"
+    }
+
+
+def test_get_sale_index_skips_ended_sales(new_sale):
+    # given
+    new_sale.end_date = timezone.now() - timedelta(days=1)
+    new_sale.save(update_fields=["end_date"])
+
+    # when
+    index = get_sale_index()
+
+    # then
+    assert index.sales == {}
+
+
+def test_sale_index_matches_sales_after_start_date(new_sale):
+    # given
+    now = timezone.now()
+    new_sale.start_date = now + timedelta(days=1)
+    new_sale.save(update_fields=["start_date"])
+
+    # when
+    index = get_sale_index()
+
+    # then
+    assert index.get_discounts(now) == []
+    assert [
+        discount.sale for discount in index.get_discounts(now + timedelta(days=2))
+    ] == [new_sale]
+
+
+def test_sale_index_matches_subcategories(new_sale, checkout_lines_info):
+    # given
+    line_info = checkout_lines_info[0]
+    parent = Category.objects.create(name="Parent", slug="parent")
+    category = line_info.product.category
+    category.parent = parent
+    category.save()
+    new_sale.categories.add(parent)
+
+    # when
+    discounts = get_sale_index().get_discounts_for_lines(
+        checkout_lines_info, timezone.now()
+    )
+
+    # then
+    assert len(discounts) == 1
+    assert discounts[0].sale == new_sale
+    assert discounts[0].category_ids == {category.pk}
+
+
+def test_sale_index_orders_sales_by_name(new_sale, checkout_lines_info):
+    # given
+    line_info = checkout_lines_info[0]
+    other_sale = Sale.objects.create(name="Another sale")
+    for sale in [new_sale, other_sale]:
+        sale.variants.add(line_info.variant)
+
+    # when
+    discounts = get_sale_index().get_discounts_for_lines(
+        checkout_lines_info, timezone.now()
+    )
+
+    # then
+    assert [discount.sale for discount in discounts] == [other_sale, new_sale]
+    assert all(
+        discount.variants_ids == {line_info.variant.pk} for discount in discounts
+    )
@@ -16,9 +16,7 @@ from typing import (
     Union,
     cast,
 )
-from uuid import UUID
 
-from babel.numbers import get_currency_precision
 from django.conf import settings
 from django.db.models import F
 from django.utils import timezone
@@ -36,6 +34,8 @@ from .models import (
     SaleTranslation,
     VoucherCustomer,
 )
+from .sale_discounts import get_best_sale_discounts
+from .sale_index import get_sale_index
 
 if TYPE_CHECKING:
     from ..account.models import User
@@ -409,7 +409,7 @@ def fetch_discounts(date: datetime.date) -> List[DiscountInfo]:
 
 
 def fetch_active_discounts() -> List[DiscountInfo]:
-    return fetch_discounts(timezone.now())
+    return get_sale_index().get_discounts(timezone.now())
 
 
 def fetch_catalogue_info(instance: Sale) -> CatalogueInfo:
@@ -455,214 +455,70 @@ def fetch_active_sales_for_checkout(
     if not lines_info:
         return []
 
-    sales = list(Sale.objects.active(timezone.now()))
-
-    pks = {s.pk for s in sales}
-    channel_listings = fetch_sale_channel_listings(pks)
-    product_pks_by_sale_pk_map = fetch_products(pks, lines_info)
-    variant_pks_by_sale_pk_map = fetch_variants(pks, lines_info)
-    category_pks_by_sale_pk_map = fetch_categories(pks, lines_info)
-    collection_pks_by_sale_pk_map = fetch_collections(pks, lines_info)
-
-    discounts_info = []
-    for sale in sales:
-        category_ids = category_pks_by_sale_pk_map[sale.pk]
-        collection_ids = collection_pks_by_sale_pk_map[sale.pk]
-        product_ids = product_pks_by_sale_pk_map[sale.pk]
-        variants_ids = variant_pks_by_sale_pk_map[sale.pk]
-        if category_ids or collection_ids or product_ids or variants_ids:
-            discounts_info.append(
-                DiscountInfo(
-                    sale=sale,
-                    category_ids=category_ids,
-                    channel_listings=channel_listings[sale.pk],
-                    collection_ids=collection_ids,
-                    product_ids=product_ids,
-                    variants_ids=variants_ids,
-                )
-            )
-
-    return discounts_info
+    return get_sale_index().get_discounts_for_lines(lines_info, timezone.now())
 
 
 def is_sale_applicable_on_line(
     line_info: "CheckoutLineInfo",
     discount: DiscountInfo,
 ) -> bool:
-    collection_ids = set(collection.id for collection in line_info.collections)
-    is_product_on_sale = line_info.product.id in discount.product_ids
-    is_variant_on_sale = line_info.variant.id in discount.variants_ids
-    is_category_on_sale = line_info.product.category_id in discount.category_ids
-    is_collection_on_sale = bool(collection_ids.intersection(discount.collection_ids))
     return (
-        is_product_on_sale
-        or is_variant_on_sale
-        or is_category_on_sale
-        or is_collection_on_sale
+        line_info.product.id in discount.product_ids
+        or line_info.variant.id in discount.variants_ids
+        or line_info.product.category_id in discount.category_ids
+        or any(
+            collection.id in discount.collection_ids
+            for collection in line_info.collections
+        )
     )
 
 
-def _apply_percentage_sale_on_lines(
-    lines_info: Iterable["CheckoutLineInfo"],
-    sale_info: DiscountInfo,
-    sales_data_by_line_map: Dict[UUID, dict],
-    currency_precision: Decimal,
-):
-    """Calculate discount amounts for percentage sales.
-
-    This function calculates the discount amount for the sale. If the calculated
-    discount amount is greater than the currently applied discount, the function
-    saves the sale as the best sale for the calculated lines. All data are stored
-    in the `sales_data_by_line_map`.
-    """
-    sale = sale_info.sale
-    qualified_lines = []
-    base_line_total_price_by_line_id_map = defaultdict(Decimal)
-    remaining_total_amount = Decimal(0)
-    for line_info in lines_info:
-        if is_sale_applicable_on_line(line_info, sale_info):
-            qualified_lines.append(line_info)
-            line = line_info.line
-            quantity = line.quantity
-            base_unit_price = line_info.variant.get_base_price(
-                line_info.channel_listing, line.price_override
-            )
-            base_unit_price = cast(Money, base_unit_price)
-            base_line_total_price = base_unit_price * quantity
-            base_line_total_amount = base_line_total_price.amount
-
-            remaining_total_amount += base_line_total_amount
-            base_line_total_price_by_line_id_map[line.id] = base_line_total_amount
-
-    sale_channel_listing = sale_info.channel_listings.get(line_info.channel.slug)
-    if sale_channel_listing and remaining_total_amount != Decimal(0):
-        currency = sale_channel_listing.currency
-        discounted_amount = apply_discount_to_value(
-            sale_channel_listing.discount_value,
-            sale.type,
-            currency,
-            Money(remaining_total_amount, currency),
-        ).amount
-        remaining_discount_amount = remaining_total_amount - discounted_amount
-        for line_info in qualified_lines:
-            line = line_info.line
-            base_line_total_amount = base_line_total_price_by_line_id_map[line.pk]
-            line_discount_amount = Decimal(
-                base_line_total_amount
-                * remaining_discount_amount
-                / remaining_total_amount
-            ).quantize(currency_precision, ROUND_HALF_UP)
-            remaining_discount_amount -= line_discount_amount
-            remaining_total_amount -= base_line_total_amount
-            if (
-                sales_data_by_line_map[line.id].get(
-                    "best_discount_amount",
-                    Decimal("-Inf"),
-                )
-                < line_discount_amount
-            ):
-                sales_data_by_line_map[line.id] = {
-                    "sale": sale,
-                    "sale_channel_listing": sale_channel_listing,
-                    "best_discount_amount": line_discount_amount,
-                }
-
-
-def _apply_fixed_sale_on_lines(
-    lines_info: Iterable["CheckoutLineInfo"],
-    sale_info: DiscountInfo,
-    sales_data_by_line_map: Dict[UUID, dict],
-):
-    """Calculate discount amounts for for fixed sales.
-
-    This function calculates the discount amount for the sale. If the calculated
-    discount amount is greater than the currently applied discount, the function
-    saves the sale as the best sale for the calculated lines. All data are stored
-    in the `sales_data_by_line_map`.
-    """
-    sale = sale_info.sale
-    for line_info in lines_info:
-        if is_sale_applicable_on_line(line_info, sale_info):
-            line = line_info.line
-            quantity = line.quantity
-            base_unit_price = line_info.variant.get_base_price(
-                line_info.channel_listing, line.price_override
-            )
-            base_unit_price = cast(Money, base_unit_price)
-
-            channel_listing = sale_info.channel_listings.get(line_info.channel.slug)
-            if not channel_listing:
-                continue
-            unit_price_with_applied_sale = apply_discount_to_value(
-                channel_listing.discount_value,
-                sale.type,
-                channel_listing.currency,
-                base_unit_price,
-            )
-            unit_price_with_applied_sale = cast(Money, unit_price_with_applied_sale)
-            unit_discount = min(
-                base_unit_price - unit_price_with_applied_sale,
-                base_unit_price,
-            )
-            total_discount = unit_discount * quantity
-            discount_amount = total_discount.amount
-            if (
-                sales_data_by_line_map[line.id].get(
-                    "best_discount_amount", Decimal("-Inf")
-                )
-                < discount_amount
-            ):
-                sales_data_by_line_map[line.id] = {
-                    "sale": sale,
-                    "sale_channel_listing": channel_listing,
-                    "best_discount_amount": discount_amount,
-                }
+def _fetch_sale_translated_names(
+    sale_pks: Iterable[int], language_code: str
+) -> Dict[int, str]:
+    translations = SaleTranslation.objects.filter(
+        sale_id__in=sale_pks, language_code=language_code
+    ).values_list("sale_id", "name")
+    translated_names: Dict[int, str] = {}
+    for sale_pk, name in translations:
+        translated_names.setdefault(sale_pk, name)
+    return translated_names
 
 
 def create_or_update_discount_objects_from_sale_for_checkout(
     checkout_info: "CheckoutInfo",
     lines_info: Iterable["CheckoutLineInfo"],
     sales_info: Iterable[DiscountInfo],
+    save: bool = True,
 ):
+    """Set the discount of the best sale on each checkout line.
+
+    When `save` is False, discounts are only set on `lines_info` and they're saved
+    by the next call with `save` set.
+    """
     line_discounts_to_create = []
     line_discounts_to_update = []
     updated_fields = []
 
-    currency_precision = Decimal("0.1") ** get_currency_precision(
-        checkout_info.checkout.currency
+    best_discounts = get_best_sale_discounts(
+        lines_info,
+        sales_info,
+        checkout_info.channel.slug,
+        checkout_info.checkout.currency,
+    )
+    translated_names = _fetch_sale_translated_names(
+        {best_discount.sale.pk for best_discount in best_discounts.values()},
+        checkout_info.checkout.language_code,
     )
-
-    sales_data_by_line_map: Dict[UUID, dict] = defaultdict(dict)
-
-    for sale_info in sales_info:
-        if sale_info.sale.type == DiscountValueType.FIXED:
-            _apply_fixed_sale_on_lines(lines_info, sale_info, sales_data_by_line_map)
-
-        else:
-            _apply_percentage_sale_on_lines(
-                lines_info, sale_info, sales_data_by_line_map, currency_precision
-            )
 
     for line_info in lines_info:
         line = line_info.line
-        sale = sales_data_by_line_map[line.id].get("sale")
-        sale_channel_listing = sales_data_by_line_map[line.id].get(
-            "sale_channel_listing"
-        )
-        discount_amount = sales_data_by_line_map[line.id].get("best_discount_amount")
-
-        if sale and sale_channel_listing and discount_amount:
-            sale = cast(Sale, sale)
-            sale_channel_listing = cast(SaleChannelListing, sale_channel_listing)
-
-            # Fetch Sale translation
-            translation_language_code = checkout_info.checkout.language_code
-            sale_translation = SaleTranslation.objects.filter(
-                sale_id=sale.pk, language_code=translation_language_code
-            ).first()
-            translated_name = None
-            if sale_translation:
-                translated_name = sale_translation.name
+        best_discount = best_discounts.get(line.id)
+        if best_discount and best_discount.amount:
+            sale = best_discount.sale
+            sale_channel_listing = best_discount.sale_channel_listing
+            discount_amount = best_discount.amount
+            translated_name = translated_names.get(sale.pk)
             discount_to_update = line_info.get_sale_discount()
             if not discount_to_update:
                 line_discount = CheckoutLineDiscount(
@@ -680,40 +536,58 @@ def create_or_update_discount_objects_from_sale_for_checkout(
                 line_discounts_to_create.append(line_discount)
                 line_info.discounts.append(line_discount)
             else:
+                line_updated_fields = []
                 if discount_to_update.value_type != sale.type:
                     discount_to_update.value_type = sale.type
-                    updated_fields.append("value_type")
+                    line_updated_fields.append("value_type")
                 if discount_to_update.value != sale_channel_listing.discount_value:
                     discount_to_update.value = sale_channel_listing.discount_value
-                    updated_fields.append("value")
+                    line_updated_fields.append("value")
                 if discount_to_update.amount_value != discount_amount:
                     discount_to_update.amount_value = discount_amount
-                    updated_fields.append("amount_value")
+                    line_updated_fields.append("amount_value")
                 if discount_to_update.name != sale.name:
                     discount_to_update.name = sale.name
-                    updated_fields.append("name")
+                    line_updated_fields.append("name")
                 if discount_to_update.translated_name != translated_name:
                     discount_to_update.translated_name = translated_name
-                    updated_fields.append("translated_name")
-                if discount_to_update.sale != sale:
+                    line_updated_fields.append("translated_name")
+                if discount_to_update.sale_id != sale.pk:
                     discount_to_update.sale = sale
-                    updated_fields.append("sale")
-
-                line_discounts_to_update.append(discount_to_update)
-
+                    line_updated_fields.append("sale")
+
+                # Fields changed by previous calls without saving are written too.
+                for field in getattr(discount_to_update, "unsaved_fields", []):
+                    if field not in line_updated_fields:
+                        line_updated_fields.append(field)
+                # Only discounts which changed are written.
+                if discount_to_update._state.adding:
+                    line_discounts_to_create.append(discount_to_update)
+                elif line_updated_fields:
+                    discount_to_update.unsaved_fields = line_updated_fields
+                    line_discounts_to_update.append(discount_to_update)
+                    for field in line_updated_fields:
+                        if field not in updated_fields:
+                            updated_fields.append(field)
+
+    if not save:
+        return
     if line_discounts_to_create:
         CheckoutLineDiscount.objects.bulk_create(line_discounts_to_create)
     if line_discounts_to_update and updated_fields:
         CheckoutLineDiscount.objects.bulk_update(
             line_discounts_to_update, updated_fields
         )
+        for line_discount in line_discounts_to_update:
+            line_discount.unsaved_fields = []
 
 
 def generate_sale_discount_objects_for_checkout(
     checkout_info: "CheckoutInfo",
     lines_info: Iterable["CheckoutLineInfo"],
+    save: bool = True,
 ):
     sales_info = fetch_active_sales_for_checkout(lines_info)
     create_or_update_discount_objects_from_sale_for_checkout(
-        checkout_info, lines_info, sales_info
+        checkout_info, lines_info, sales_info, save=save
     )
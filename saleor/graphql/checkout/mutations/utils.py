@@ -316,8 +316,9 @@ def get_checkout(
     if qs is None:
         qs = models.Checkout.objects.select_related(
             "channel__tax_configuration",
+            "user",
             "shipping_method",
-            "collection_point",
+            "collection_point__address",
             "billing_address",
             "shipping_address",
         )
@@ -869,6 +869,7 @@ class Checkout(ModelObjectType[models.Checkout]):
                 lines=lines,
                 address=address,
                 checkout_transactions=transactions,
+                use_prices_cache=True,
             )
             return checkout_info.checkout.authorize_status
 
@@ -888,6 +889,7 @@ class Checkout(ModelObjectType[models.Checkout]):
                 lines=lines,
                 address=address,
                 checkout_transactions=transactions,
+                use_prices_cache=True,
             )
             return checkout_info.checkout.charge_status
 
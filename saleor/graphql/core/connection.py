@@ -14,8 +14,11 @@ from typing import (
 
 import graphene
 from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist, ValidationError
+from django.db import connections
+from django.db.models import BooleanField, Expression, F
 from django.db.models import Model as DjangoModel
-from django.db.models import Q, QuerySet
+from django.db.models import Q, QuerySet, Value
 from graphene.relay import Connection
 from graphql import GraphQLError
 from graphql.language.ast import FragmentSpread
@@ -150,6 +153,144 @@ def _prepare_filter(
     return filter_kwargs
 
 
+class RowValueComparison(Expression):
+    """Compare a row of fields with a row of values, e.g. `(a, b, id) > (1, 2, 3)`.
+
+    PostgreSQL evaluates row comparisons lexicographically and can use an index
+    on all compared columns, contrary to the equivalent chain of `OR` conditions.
+    Rows with `NULL` in any of the fields never match, so it can be used only for
+    non-nullable fields.
+    """
+
+    conditional = True
+    output_field = BooleanField()
+
+    def __init__(self, fields: List[str], values: List[Any], sorting_direction: str):
+        super().__init__()
+        self.fields = fields
+        self.values = values
+        self.operator = ">" if sorting_direction == "gt" else "<"
+        self.lhs: List[Any] = []
+        self.rhs: List[Any] = []
+
+    def resolve_expression(
+        self, query=None, allow_joins=True, reuse=None, summarize=False, for_save=False
+    ):
+        expression = self.copy()
+        expression.lhs = [
+            F(field).resolve_expression(query, allow_joins, reuse, summarize)
+            for field in self.fields
+        ]
+        expression.rhs = []
+        for column, value in zip(expression.lhs, self.values):
+            field = column.output_field
+            try:
+                value = field.to_python(value)
+            except ValidationError as e:
+                raise ValueError(e)
+            expression.rhs.append(
+                Value(value, output_field=field).resolve_expression(query)
+            )
+        return expression
+
+    def get_source_expressions(self):
+        return [*self.lhs, *self.rhs]
+
+    def set_source_expressions(self, exprs):
+        self.lhs, self.rhs = exprs[: len(self.lhs)], exprs[len(self.lhs) :]
+
+    def as_sql(self, compiler, connection):
+        lhs_sql, rhs_sql, params = [], [], []
+        for column in self.lhs:
+            sql, column_params = compiler.compile(column)
+            lhs_sql.append(sql)
+            params.extend(column_params)
+        for value in self.rhs:
+            sql, value_params = compiler.compile(value)
+            rhs_sql.append(sql)
+            params.extend(value_params)
+        lhs, rhs = ", ".join(lhs_sql), ", ".join(rhs_sql)
+        return f"({lhs}) {self.operator} ({rhs})", params
+
+
+def _is_non_nullable_field(model, field_path: str) -> bool:
+    """Return True when the model field is not nullable, also through relations."""
+    parts = field_path.split("__")
+    for index, part in enumerate(parts):
+        try:
+            field = model._meta.pk if part == "pk" else model._meta.get_field(part)
+        except FieldDoesNotExist:
+            return False
+        if field.null or field.many_to_many or field.one_to_many:
+            return False
+        if index < len(parts) - 1:
+            if not field.is_relation:
+                return False
+            model = field.related_model
+        elif field.is_relation and not field.concrete:
+            return False
+    return True
+
+
+def _can_use_row_value_comparison(
+    qs: QuerySet, cursor: List[Any], sorting_fields: List[str]
+) -> bool:
+    if any(value is None for value in cursor):
+        return False
+    return all(
+        field not in qs.query.annotations and _is_non_nullable_field(qs.model, field)
+        for field in sorting_fields
+    )
+
+
+def _get_cursor_filter(
+    qs: QuerySet, cursor: List[Any], sorting_fields: List[str], sorting_direction: str
+) -> Union[Q, RowValueComparison]:
+    if _can_use_row_value_comparison(qs, cursor, sorting_fields):
+        return RowValueComparison(sorting_fields, cursor, sorting_direction)
+    return _prepare_filter(
+        cursor, sorting_fields, sorting_direction, _get_id_coercion(qs)
+    )
+
+
+def get_capped_count(qs: QuerySet, limit: int) -> int:
+    """Count the rows, stopping at the limit."""
+    return qs.order_by()[:limit].count()
+
+
+def get_estimated_count(qs: QuerySet) -> int:
+    """Return the number of rows estimated by the PostgreSQL query planner."""
+    sql, params = qs.order_by().query.sql_with_params()
+    with connections[qs.db].cursor() as cursor:
+        cursor.execute(f"EXPLAIN (FORMAT JSON) {sql}", params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]["Plan"]["Plan Rows"])
+
+
+def get_total_count(qs: QuerySet) -> int:
+    """Count the rows according to `GRAPHQL_TOTAL_COUNT_MODE`.
+
+    - `exact` runs `COUNT(*)` over the whole queryset.
+    - `capped` counts at most `GRAPHQL_TOTAL_COUNT_LIMIT` rows, the limit means
+    that there are as many rows or more.
+    - `estimated` returns the planner estimate, unless it's lower than the limit,
+    in which case the rows are counted up to the limit.
+    """
+    mode = settings.GRAPHQL_TOTAL_COUNT_MODE
+    limit = settings.GRAPHQL_TOTAL_COUNT_LIMIT
+    if mode == "capped":
+        return get_capped_count(qs, limit)
+    if mode == "estimated":
+        estimated_count = get_estimated_count(qs)
+        if estimated_count >= limit:
+            return estimated_count
+        count = get_capped_count(qs, limit)
+        return count if count < limit else max(estimated_count, count)
+    return qs.count()
+
+
 def _validate_connection_args(args):
     first = args.get("first")
     last = args.get("last")
@@ -281,17 +422,12 @@ def connection_from_queryset_slice(
     sorting_direction = _get_sorting_direction(sort_by, last)
     if cursor and len(cursor) != len(sorting_fields):
         raise GraphQLError("Received cursor is invalid.")
-    filter_kwargs = (
-        _prepare_filter(
-            cursor,
-            sorting_fields,
-            sorting_direction,
-            _get_id_coercion(qs),
-        )
-        if cursor
-        else Q()
-    )
     try:
+        filter_kwargs = (
+            _get_cursor_filter(qs, cursor, sorting_fields, sorting_direction)
+            if cursor
+            else Q()
+        )
         filtered_qs = qs.filter(filter_kwargs)
     except ValueError:
         raise GraphQLError("Received cursor is invalid.")
@@ -301,14 +437,10 @@ def connection_from_queryset_slice(
     )
 
     if "total_count" in connection_type._meta.fields:
-
-        def get_total_count():
-            return qs.count()
-
         return connection_type(
             edges=edges,
             page_info=pageinfo_type(**page_info),
-            total_count=get_total_count,
+            total_count=lambda: get_total_count(qs),
         )
 
     return connection_type(
@@ -10,6 +10,7 @@ from ...app.models import App
 
 if TYPE_CHECKING:
     from .dataloaders import DataLoader
+    from .profiling import QueryProfiler
 
 
 class SaleorContext(HttpRequest):
@@ -21,6 +22,7 @@ class SaleorContext(HttpRequest):
     user: Optional[User]  # type: ignore[assignment]
     requestor: Union[App, User, None]
     request_time: datetime.datetime
+    profiler: Optional["QueryProfiler"]
 
 
 def disallow_replica_in_context(context: SaleorContext) -> None:
@@ -16,6 +16,7 @@ class DataLoader(BaseLoader, Generic[K, R]):
     context_key: str
     context: SaleorContext
     database_connection_name: str
+    _dataloaders: dict
 
     def __new__(cls, context: SaleorContext):
         key = cls.context_key
@@ -30,7 +31,11 @@ class DataLoader(BaseLoader, Generic[K, R]):
         return loader
 
     def __init__(self, context: SaleorContext) -> None:
-        if getattr(self, "context", None) != context:
+        # A loader is initialized once per dataloaders cache. The cache can be shared
+        # by several contexts, see `create_deliveries_for_subscriptions`; the loader
+        # then keeps the context it was created with.
+        if getattr(self, "_dataloaders", None) is not context.dataloaders:
+            self._dataloaders = context.dataloaders
             self.context = context
             self.database_connection_name = get_database_connection_name(context)
             super().__init__()
@@ -43,7 +48,13 @@ class DataLoader(BaseLoader, Generic[K, R]):
         ) as scope:
             span = scope.span
             span.set_tag(opentracing.tags.COMPONENT, "dataloaders")
-            results = self.batch_load(keys)
+            profiler = getattr(self.context, "profiler", None)
+            if profiler is None:
+                results = self.batch_load(keys)
+            else:
+                keys = list(keys)
+                with profiler.profile_dataloader(self.__class__.__name__, len(keys)):
+                    results = self.batch_load(keys)
             if not isinstance(results, Promise):
                 return Promise.resolve(results)
             return results
@@ -0,0 +1,130 @@
+import hashlib
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import (
+    Any,
+    Dict,
+    FrozenSet,
+    Generic,
+    Hashable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
+
+from django.conf import settings
+from graphql import GraphQLDocument, GraphQLSchema
+from graphql.backend import GraphQLBackend
+from graphql.error import GraphQLError
+from graphql.validation import validate
+
+from ..utils import query_fingerprint, query_identifier
+from .validators.query_cost import QueryCostFunction
+
+T = TypeVar("T")
+
+
+class LRUCache(Generic[T]):
+    """Thread-safe, in-process cache that evicts the least recently used entries."""
+
+    def __init__(self):
+        self._data: "OrderedDict[Hashable, T]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+    def get(self, key: Hashable) -> Optional[T]:
+        with self._lock:
+            value = self._data.get(key)
+            if value is not None:
+                self._data.move_to_end(key)
+            return value
+
+    def set(self, key: Hashable, value: T, max_size: int):
+        if max_size <= 0:
+            return
+        with self._lock:
+            self._data[key] = value
+            self._data.move_to_end(key)
+            while len(self._data) > max_size:
+                self._data.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._data.clear()
+
+
+@dataclass
+class CachedDocument:
+    document: GraphQLDocument
+    query_identifier: str
+    query_fingerprint: str
+    validation_errors: Optional[List[GraphQLError]] = None
+    query_cost_functions: Dict[Tuple[int, int], QueryCostFunction] = field(
+        default_factory=dict
+    )
+    response_cache_tags: Dict[Optional[str], Optional[FrozenSet[str]]] = field(
+        default_factory=dict
+    )
+
+    def validate(self) -> List[GraphQLError]:
+        """Validate the document against its schema, only on the first call."""
+        if self.validation_errors is None:
+            self.validation_errors = validate(
+                self.document.schema, self.document.document_ast
+            )
+        return self.validation_errors
+
+    def get_query_cost(
+        self,
+        schema: GraphQLSchema,
+        variables: Optional[Dict],
+        cost_map: Dict[str, Dict[str, Any]],
+        maximum_cost: int,
+    ) -> Tuple[int, Optional[List[GraphQLError]]]:
+        """Compute the query cost, compiling the cost function on the first call."""
+        key = (id(schema), id(cost_map))
+        query_cost_function = self.query_cost_functions.get(key)
+        if query_cost_function is None:
+            query_cost_function = QueryCostFunction(
+                schema, self.document.document_ast, cost_map
+            )
+            self.query_cost_functions[key] = query_cost_function
+        return query_cost_function(variables, maximum_cost)
+
+
+document_cache: LRUCache[CachedDocument] = LRUCache()
+
+
+def get_document_cache_key(schema: Any, query: str):
+    query_hash = hashlib.sha256(query.encode("utf-8")).hexdigest()
+    return id(schema), query_hash
+
+
+def get_cached_document(
+    backend: GraphQLBackend, schema: Any, query: str
+) -> CachedDocument:
+    """Return the parsed document for the given query string.
+
+    Parsing and validation depend only on the query string and the schema, so
+    the document, along with its validation result, is kept in a bounded LRU cache
+    shared by all requests handled by the process.
+    Set `GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE` to 0 to disable it.
+    Raises `GraphQLSyntaxError` when the query cannot be parsed.
+    """
+    key = get_document_cache_key(schema, query)
+    cached_document = document_cache.get(key)
+    if cached_document is None:
+        document = backend.document_from_string(schema, query)
+        cached_document = CachedDocument(
+            document=document,
+            query_identifier=query_identifier(document),
+            query_fingerprint=query_fingerprint(document),
+        )
+        document_cache.set(
+            key, cached_document, settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE
+        )
+    return cached_document
@@ -0,0 +1,206 @@
+import hashlib
+import uuid
+from typing import Any, Dict, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.db import transaction
+from graphql.error import GraphQLError
+
+from ...core.models import PersistedQuery
+
+PERSISTED_QUERY_VERSION = 1
+REGISTERED_QUERIES_VERSION_CACHE_KEY = "registered-persisted-queries-version"
+
+
+class PersistedQueryError(GraphQLError):
+    code: str = "PERSISTED_QUERY_ERROR"
+
+    def __init__(self, message: str):
+        super().__init__(message, extensions={"code": self.code})
+
+
+class PersistedQueryNotFound(PersistedQueryError):
+    # The message is part of the automatic persisted queries protocol, clients
+    # resend the request together with the full query text when they receive it.
+    code = "PERSISTED_QUERY_NOT_FOUND"
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotFound")
+
+
+class PersistedQueryNotSupported(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_SUPPORTED"
+
+    def __init__(self):
+        super().__init__("PersistedQueryNotSupported")
+
+
+class PersistedQueryNotAllowed(PersistedQueryError):
+    code = "PERSISTED_QUERY_NOT_ALLOWED"
+
+    def __init__(self):
+        super().__init__("Only registered persisted queries are allowed.")
+
+
+def generate_query_hash(query: str) -> str:
+    return hashlib.sha256(query.encode("utf-8")).hexdigest()
+
+
+def get_persisted_query_cache_key(query_hash: str) -> str:
+    return f"persisted-query-{query_hash}"
+
+
+# Registered queries found by the process, valid for the version of the allow-list
+# stored in the cache.
+_registered_queries: Dict[str, str] = {}
+_registered_queries_version: Optional[str] = None
+
+
+def get_registered_queries_version() -> str:
+    version = cache.get(REGISTERED_QUERIES_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(REGISTERED_QUERIES_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(REGISTERED_QUERIES_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_registered_queries():
+    """Make all processes look up registered queries in the database again.
+
+    The version is changed right away, so the current transaction sees its own
+    changes, and once again after commit, so other processes don't keep the data
+    they loaded before the transaction was committed.
+    """
+
+    def bump_version():
+        clear_registered_queries()
+        cache.set(REGISTERED_QUERIES_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def register_persisted_query(query: str) -> str:
+    """Add the query to the allow-list stored in the database and return its hash."""
+    query_hash = generate_query_hash(query)
+    PersistedQuery.objects.get_or_create(hash=query_hash, defaults={"query": query})
+    return query_hash
+
+
+def get_registered_query(query_hash: str) -> Optional[str]:
+    """Return the registered query with the given hash.
+
+    Queries found in the database are reused by the process until the version stored
+    in the cache changes, which happens when any `PersistedQuery` is saved or
+    deleted.
+    """
+    global _registered_queries_version
+    version = get_registered_queries_version()
+    if version != _registered_queries_version:
+        _registered_queries.clear()
+        _registered_queries_version = version
+    query = _registered_queries.get(query_hash)
+    if query is None:
+        query = (
+            PersistedQuery.objects.filter(hash=query_hash)
+            .values_list("query", flat=True)
+            .first()
+        )
+        if query is not None:
+            _registered_queries[query_hash] = query
+    return query
+
+
+def clear_registered_queries():
+    """Drop registered queries found by the current process."""
+    _registered_queries.clear()
+
+
+def handle_registered_queries_change(sender, **kwargs):
+    invalidate_registered_queries()
+
+
+def get_persisted_query(query_hash: str) -> Optional[str]:
+    query = cache.get(get_persisted_query_cache_key(query_hash))
+    if query is None:
+        query = get_registered_query(query_hash)
+    return query
+
+
+def store_persisted_query(query: str, timeout: Optional[int] = None) -> str:
+    """Store the query in the cache under its sha256 hash and return the hash.
+
+    Queries are stored without expiration unless a timeout in seconds is given.
+    The cache may evict them, so the allow-list is stored with
+    `register_persisted_query` instead.
+    """
+    query_hash = generate_query_hash(query)
+    cache.set(get_persisted_query_cache_key(query_hash), query, timeout)
+    return query_hash
+
+
+def persisted_queries_enabled() -> bool:
+    return (
+        settings.GRAPHQL_PERSISTED_QUERIES_ENABLED
+        or settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY
+    )
+
+
+def resolve_persisted_query(query: Any, extensions: Any) -> Any:
+    """Return the query text for a request that may use a persisted query.
+
+    Implements the automatic persisted queries protocol: a client sends
+    `extensions.persistedQuery.sha256Hash` and the query text is loaded from
+    the cache. When the hash is unknown, `PersistedQueryNotFound` is raised and
+    the client is expected to retry with the full query, which is then stored.
+
+    With `GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY` enabled, clients can't store
+    new queries, and only queries registered upfront in the database (see the
+    `register_persisted_queries` command) are allowed to run.
+    """
+    persisted_query = None
+    if isinstance(extensions, dict):
+        persisted_query = extensions.get("persistedQuery")
+
+    if not persisted_query:
+        if settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY:
+            if not query or not isinstance(query, str):
+                return query
+            if get_registered_query(generate_query_hash(query)) is None:
+                raise PersistedQueryNotAllowed()
+        return query
+
+    if not persisted_queries_enabled():
+        raise PersistedQueryNotSupported()
+    if not isinstance(persisted_query, dict):
+        raise GraphQLError("Invalid persisted query extension.")
+    if persisted_query.get("version") != PERSISTED_QUERY_VERSION:
+        raise GraphQLError(
+            f"Unsupported persisted query version. "
+            f"Supported version is {PERSISTED_QUERY_VERSION}."
+        )
+    query_hash = persisted_query.get("sha256Hash")
+    if not query_hash or not isinstance(query_hash, str):
+        raise GraphQLError("Must provide a sha256Hash of the persisted query.")
+    query_hash = query_hash.lower()
+
+    if not query:
+        if settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY:
+            query = get_registered_query(query_hash)
+        else:
+            query = get_persisted_query(query_hash)
+        if query is None:
+            raise PersistedQueryNotFound()
+        return query
+
+    if not isinstance(query, str):
+        return query
+    if generate_query_hash(query) != query_hash:
+        raise GraphQLError("Provided sha256Hash does not match the query.")
+    if settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY:
+        if get_registered_query(query_hash) is None:
+            raise PersistedQueryNotAllowed()
+    else:
+        store_persisted_query(query, settings.GRAPHQL_PERSISTED_QUERIES_TIMEOUT)
+    return query
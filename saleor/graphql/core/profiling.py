@@ -0,0 +1,158 @@
+import time
+from contextlib import ExitStack, contextmanager
+from dataclasses import dataclass
+from typing import Any, Dict, Iterator, List, Optional
+
+from django.conf import settings
+from django.db import connections
+
+from . import ResolveInfo, SaleorContext
+
+# Staff users can profile a single request by sending the `Saleor-Profile` header.
+PROFILING_HEADER = "HTTP_SALEOR_PROFILE"
+
+
+def _to_ms(seconds: float) -> float:
+    return round(seconds * 1000, 3)
+
+
+@dataclass
+class ProfileEntry:
+    calls: int = 0
+    duration: float = 0.0
+    sql_count: int = 0
+    sql_duration: float = 0.0
+
+    def as_dict(self) -> Dict[str, Any]:
+        return {
+            "calls": self.calls,
+            "duration": _to_ms(self.duration),
+            "sqlCount": self.sql_count,
+            "sqlDuration": _to_ms(self.sql_duration),
+        }
+
+
+@dataclass
+class DataLoaderProfileEntry(ProfileEntry):
+    keys: int = 0
+    max_batch_size: int = 0
+
+    def as_dict(self) -> Dict[str, Any]:
+        data = super().as_dict()
+        data.update({"keys": self.keys, "maxBatchSize": self.max_batch_size})
+        return data
+
+
+class QueryProfiler:
+    """Collect resolver and dataloader timings of a single GraphQL operation.
+
+    Resolvers are aggregated by `ParentType.field`, dataloaders by their class
+    name. Resolver time covers only the synchronous part of the resolver, the time
+    spent waiting for dataloaders is reported separately on the dataloaders.
+    Each SQL query is attributed to the innermost resolver or dataloader that
+    is running when the query is executed.
+    """
+
+    def __init__(self):
+        self.start = time.perf_counter()
+        self.resolvers: Dict[str, ProfileEntry] = {}
+        self.dataloaders: Dict[str, DataLoaderProfileEntry] = {}
+        self.sql_count = 0
+        self.sql_duration = 0.0
+        self._stack: List[ProfileEntry] = []
+
+    @contextmanager
+    def _measure(self, entry: ProfileEntry) -> Iterator[None]:
+        self._stack.append(entry)
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            entry.calls += 1
+            entry.duration += time.perf_counter() - start
+            self._stack.pop()
+
+    def profile_resolver(self, name: str):
+        entry = self.resolvers.setdefault(name, ProfileEntry())
+        return self._measure(entry)
+
+    def profile_dataloader(self, name: str, batch_size: int):
+        entry = self.dataloaders.setdefault(name, DataLoaderProfileEntry())
+        entry.keys += batch_size
+        entry.max_batch_size = max(entry.max_batch_size, batch_size)
+        return self._measure(entry)
+
+    def sql_wrapper(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            duration = time.perf_counter() - start
+            self.sql_count += 1
+            self.sql_duration += duration
+            if self._stack:
+                entry = self._stack[-1]
+                entry.sql_count += 1
+                entry.sql_duration += duration
+
+    @contextmanager
+    def profile_sql_queries(self) -> Iterator[None]:
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(self.sql_wrapper))
+            yield
+
+    def as_dict(self) -> Dict[str, Any]:
+        def sort_by_duration(entries):
+            return sorted(entries.items(), key=lambda item: -item[1].duration)
+
+        return {
+            "duration": _to_ms(time.perf_counter() - self.start),
+            "sqlCount": self.sql_count,
+            "sqlDuration": _to_ms(self.sql_duration),
+            "resolvers": [
+                {"field": name, **entry.as_dict()}
+                for name, entry in sort_by_duration(self.resolvers)
+            ],
+            "dataloaders": [
+                {"name": name, **entry.as_dict()}
+                for name, entry in sort_by_duration(self.dataloaders)
+            ],
+        }
+
+
+class ProfilingMiddleware:
+    """Graphene middleware measuring resolvers of the profiled requests."""
+
+    def resolve(self, next_, root, info: ResolveInfo, **kwargs):
+        profiler = getattr(info.context, "profiler", None)
+        if profiler is None:
+            return next_(root, info, **kwargs)
+        name = f"{info.parent_type.name}.{info.field_name}"
+        with profiler.profile_resolver(name):
+            return next_(root, info, **kwargs)
+
+
+def is_profiling_requested(request: SaleorContext) -> bool:
+    if settings.GRAPHQL_PROFILING_ENABLED:
+        return True
+    if not request.META.get(PROFILING_HEADER):
+        return False
+    user = getattr(request, "user", None)
+    return bool(user and user.is_staff)
+
+
+def start_profiling(request: SaleorContext) -> Optional[QueryProfiler]:
+    """Attach a profiler to the request if profiling was requested."""
+    profiler = QueryProfiler() if is_profiling_requested(request) else None
+    request.profiler = profiler
+    return profiler
+
+
+@contextmanager
+def profile_sql_queries(profiler: Optional[QueryProfiler]) -> Iterator[None]:
+    if profiler is None:
+        yield
+        return
+    with profiler.profile_sql_queries():
+        yield
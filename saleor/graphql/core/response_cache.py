@@ -0,0 +1,185 @@
+import hashlib
+import json
+import uuid
+from typing import Any, Dict, FrozenSet, Iterable, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import transaction
+from django.http import HttpRequest
+from django.utils.translation import get_language
+from graphql import GraphQLDocument
+from graphql.language import ast
+from graphql.language.visitor import TypeInfoVisitor, Visitor, visit
+from graphql.type.definition import get_named_type
+from graphql.utils.type_info import TypeInfo
+
+from ... import __version__ as saleor_version
+from ...core.auth import get_token_from_request
+from .document_cache import CachedDocument
+
+TAG_CATEGORIES = "categories"
+TAG_COLLECTIONS = "collections"
+TAG_MENUS = "menus"
+TAG_PRODUCTS = "products"
+ALL_TAGS = frozenset([TAG_CATEGORIES, TAG_COLLECTIONS, TAG_MENUS, TAG_PRODUCTS])
+
+# Only queries selecting these root fields are cached.
+CACHEABLE_ROOT_FIELDS = {
+    "__typename",
+    "categories",
+    "category",
+    "collection",
+    "collections",
+    "menu",
+    "menus",
+    "product",
+    "products",
+    "productVariant",
+    "productVariants",
+    "shop",
+}
+
+# Cached responses that contain objects of these types are invalidated
+# together with the tag.
+TYPE_TAGS = {
+    "Category": TAG_CATEGORIES,
+    "Collection": TAG_COLLECTIONS,
+    "Menu": TAG_MENUS,
+    "MenuItem": TAG_MENUS,
+    "Product": TAG_PRODUCTS,
+    "ProductMedia": TAG_PRODUCTS,
+    "ProductPricingInfo": TAG_PRODUCTS,
+    "ProductVariant": TAG_PRODUCTS,
+    "VariantPricingInfo": TAG_PRODUCTS,
+}
+
+
+class TypeTagsVisitor(Visitor):
+    def __init__(self, type_info: TypeInfo):
+        self.type_info = type_info
+        self.tags: set = set()
+
+    def enter_Field(self, node, *_args):
+        field_type = self.type_info.get_type()
+        if field_type is not None:
+            tag = TYPE_TAGS.get(get_named_type(field_type).name)
+            if tag:
+                self.tags.add(tag)
+
+
+def get_document_tags(document: GraphQLDocument) -> FrozenSet[str]:
+    type_info = TypeInfo(document.schema)
+    visitor = TypeTagsVisitor(type_info)
+    visit(document.document_ast, TypeInfoVisitor(type_info, visitor))
+    return frozenset(visitor.tags)
+
+
+def is_cacheable_operation(
+    document: GraphQLDocument, operation_name: Optional[str]
+) -> bool:
+    if document.get_operation_type(operation_name) != "query":
+        return False
+    operations = [
+        definition
+        for definition in document.document_ast.definitions
+        if isinstance(definition, ast.OperationDefinition)
+    ]
+    if operation_name:
+        operations = [
+            operation
+            for operation in operations
+            if operation.name and operation.name.value == operation_name
+        ]
+    if len(operations) != 1:
+        return False
+    for selection in operations[0].selection_set.selections:
+        if not isinstance(selection, ast.Field):
+            return False
+        if selection.name.value not in CACHEABLE_ROOT_FIELDS:
+            return False
+    return True
+
+
+def get_response_cache_tags(
+    cached_document: CachedDocument, operation_name: Optional[str]
+) -> Optional[FrozenSet[str]]:
+    """Return the invalidation tags of an operation, or None if it's not cacheable.
+
+    The result depends only on the document, so it's stored in the cached document.
+    """
+    if operation_name not in cached_document.response_cache_tags:
+        document = cached_document.document
+        tags = None
+        if is_cacheable_operation(document, operation_name):
+            tags = get_document_tags(document)
+        cached_document.response_cache_tags[operation_name] = tags
+    return cached_document.response_cache_tags[operation_name]
+
+
+def get_tag_cache_key(tag: str) -> str:
+    return f"graphql-response-tag-{tag}"
+
+
+def get_tag_versions(tags: Iterable[str]) -> Dict[str, str]:
+    """Return the current versions of the given tags.
+
+    Tags without a stored version get a new random one, so cache entries created
+    before a tag version was evicted from the cache are never returned.
+    """
+    keys = {tag: get_tag_cache_key(tag) for tag in tags}
+    stored_versions = cache.get_many(list(keys.values()))
+    versions = {}
+    for tag, key in keys.items():
+        version = stored_versions.get(key)
+        if version is None:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            version = cache.get(key)
+        versions[tag] = version
+    return versions
+
+
+def invalidate_response_cache_tags(*tags: str):
+    """Invalidate cached responses with the given tags once the transaction commits."""
+
+    def invalidate():
+        cache.set_many(
+            {get_tag_cache_key(tag): uuid.uuid4().hex for tag in tags}, timeout=None
+        )
+
+    transaction.on_commit(invalidate)
+
+
+def get_response_cache_key(
+    request: HttpRequest,
+    cached_document: CachedDocument,
+    variables: Any,
+    operation_name: Optional[str],
+) -> Optional[str]:
+    """Return the cache key of the response, or None if it can't be cached.
+
+    Only anonymous requests running cacheable queries are cached, see
+    `CACHEABLE_ROOT_FIELDS`. The channel and the language of a query are passed
+    as arguments, so they're a part of the key as the query and its variables.
+    """
+    if not settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+        return None
+    if get_token_from_request(request):
+        return None
+    tags = get_response_cache_tags(cached_document, operation_name)
+    if tags is None:
+        return None
+    key_data = json.dumps(
+        {
+            "query": cached_document.document.document_string,
+            "variables": variables,
+            "operationName": operation_name,
+            "language": get_language(),
+            "tags": get_tag_versions(tags),
+        },
+        cls=DjangoJSONEncoder,
+        sort_keys=True,
+    )
+    key_hash = hashlib.sha256(key_data.encode("utf-8")).hexdigest()
+    return f"graphql-response-{saleor_version}-{key_hash}"
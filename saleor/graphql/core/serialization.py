@@ -0,0 +1,79 @@
+from functools import lru_cache
+from typing import Any, Iterator
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.utils.module_loading import import_string
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+STREAMING_CHUNK_SIZE = 64 * 1024
+
+
+class JSONSerializer:
+    """Serialize GraphQL responses with the standard library encoder."""
+
+    encoder = DjangoJSONEncoder
+
+    def dumps(self, data: Any) -> bytes:
+        return self.encoder().encode(data).encode("utf-8")
+
+    def iter_chunks(
+        self, data: Any, chunk_size: int = STREAMING_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        """Encode the data incrementally, yielding chunks of about `chunk_size`.
+
+        The whole encoded response is never kept in memory, at the cost of using
+        the pure Python encoder, which is slower than the one used by `dumps`.
+        """
+        buffer = []
+        buffer_size = 0
+        for part in self.encoder().iterencode(data):
+            buffer.append(part)
+            buffer_size += len(part)
+            if buffer_size >= chunk_size:
+                yield "".join(buffer).encode("utf-8")
+                buffer = []
+                buffer_size = 0
+        if buffer:
+            yield "".join(buffer).encode("utf-8")
+
+
+class OrjsonSerializer(JSONSerializer):
+    """Serialize GraphQL responses with orjson.
+
+    orjson encodes the whole response at once, several times faster than the
+    standard library, and without building an intermediate `str`.
+    Types unsupported by orjson are encoded with the Django encoder.
+    """
+
+    def __init__(self):
+        if orjson is None:
+            raise ImproperlyConfigured(
+                "OrjsonSerializer requires the orjson package to be installed."
+            )
+        self.default = self.encoder().default
+
+    def dumps(self, data: Any) -> bytes:
+        return orjson.dumps(data, default=self.default, option=orjson.OPT_NON_STR_KEYS)
+
+    def iter_chunks(
+        self, data: Any, chunk_size: int = STREAMING_CHUNK_SIZE
+    ) -> Iterator[bytes]:
+        content = memoryview(self.dumps(data))
+        for start in range(0, len(content), chunk_size):
+            yield bytes(content[start : start + chunk_size])
+
+
+@lru_cache()
+def _load_serializer(path: str) -> JSONSerializer:
+    return import_string(path)()
+
+
+def get_json_serializer() -> JSONSerializer:
+    """Return the serializer configured with `GRAPHQL_JSON_SERIALIZER`."""
+    return _load_serializer(settings.GRAPHQL_JSON_SERIALIZER)
@@ -1,11 +1,20 @@
 import base64
 import math
+from unittest.mock import patch
 
 import graphene
 import pytest
+from django.db.models import Q
+from django.db.models.functions import Lower
 
 from ....tests.models import Book
-from ..connection import CountableConnection, create_connection_slice
+from ..connection import (
+    CountableConnection,
+    RowValueComparison,
+    _get_cursor_filter,
+    create_connection_slice,
+    get_estimated_count,
+)
 from ..fields import ConnectionField
 
 
@@ -311,3 +320,99 @@ def test_query_with_pagination_and_fragments_no_first_or_last_raises_an_error(bo
         "the `books` connection."
     )
     assert str(result.errors[0]) == expected_err_msg
+
+
+QUERY_TOTAL_COUNT = """
+    query BooksTotalCount {
+        books(first: 1) {
+            totalCount
+        }
+    }
+"""
+
+
+@pytest.mark.parametrize(
+    "mode, limit, expected_count",
+    [("exact", 10, 24), ("capped", 10, 10), ("capped", 50, 24)],
+)
+def test_pagination_total_count_mode(mode, limit, expected_count, books, settings):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_MODE = mode
+    settings.GRAPHQL_TOTAL_COUNT_LIMIT = limit
+
+    # when
+    result = schema.execute(QUERY_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == expected_count
+
+
+@pytest.mark.parametrize(
+    "estimated_count, expected_count", [(100000, 100000), (10, 24), (30, 24)]
+)
+@patch("saleor.graphql.core.connection.get_estimated_count")
+def test_pagination_estimated_total_count(
+    get_estimated_count_mock, estimated_count, expected_count, books, settings
+):
+    # given
+    settings.GRAPHQL_TOTAL_COUNT_MODE = "estimated"
+    settings.GRAPHQL_TOTAL_COUNT_LIMIT = 50
+    get_estimated_count_mock.return_value = estimated_count
+
+    # when
+    result = schema.execute(QUERY_TOTAL_COUNT)
+
+    # then
+    assert not result.errors
+    assert result.data["books"]["totalCount"] == expected_count
+
+
+def test_get_estimated_count(books):
+    # when
+    count = get_estimated_count(Book.objects.all())
+
+    # then
+    assert isinstance(count, int)
+    assert count >= 0
+
+
+def test_cursor_filter_uses_row_value_comparison(books):
+    # given
+    qs = Book.objects.order_by("name", "pk")
+    cursor = [books[5].name, str(books[5].pk)]
+
+    # when
+    cursor_filter = _get_cursor_filter(qs, cursor, ["name", "pk"], "gt")
+
+    # then
+    assert isinstance(cursor_filter, RowValueComparison)
+    filtered_qs = qs.filter(cursor_filter)
+    assert '("tests_book"."name", "tests_book"."id") >' in str(filtered_qs.query)
+    expected_books = sorted(books, key=lambda book: (book.name, book.pk))
+    index = expected_books.index(books[5])
+    assert list(filtered_qs) == expected_books[index + 1 :]
+
+
+def test_cursor_filter_for_annotated_field_uses_or_conditions(books):
+    # given
+    qs = Book.objects.annotate(lower_name=Lower("name")).order_by("lower_name", "pk")
+    cursor = [books[5].name.lower(), str(books[5].pk)]
+
+    # when
+    cursor_filter = _get_cursor_filter(qs, cursor, ["lower_name", "pk"], "gt")
+
+    # then
+    assert isinstance(cursor_filter, Q)
+
+
+def test_pagination_invalid_cursor_value(books):
+    # given
+    cursor = base64.b64encode(str.encode('["not-an-id"]')).decode("utf-8")
+    variables = {"first": 5, "after": cursor}
+
+    # when
+    result = schema.execute(QUERY_PAGINATION_TEST, variables=variables)
+
+    # then
+    assert str(result.errors[0]) == "Received cursor is invalid."
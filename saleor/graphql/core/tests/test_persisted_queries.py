@@ -0,0 +1,231 @@
+from io import StringIO
+
+import pytest
+from django.core.cache import cache
+from django.core.management import call_command
+
+from ...tests.utils import get_graphql_content, get_graphql_content_from_response
+from ....core.models import PersistedQuery
+from ..persisted_queries import (
+    clear_registered_queries,
+    generate_query_hash,
+    get_persisted_query,
+    register_persisted_query,
+    store_persisted_query,
+)
+
+QUERY_SHOP_NAME = "{ shop { name } }"
+
+
+def _persisted_query_extensions(query_hash):
+    return {"persistedQuery": {"version": 1, "sha256Hash": query_hash}}
+
+
+@pytest.fixture
+def persisted_queries_settings(settings):
+    cache.clear()
+    clear_registered_queries()
+    settings.GRAPHQL_PERSISTED_QUERIES_ENABLED = True
+    yield settings
+    cache.clear()
+    clear_registered_queries()
+
+
+def test_persisted_query_not_found(api_client, persisted_queries_settings):
+    # given
+    query_hash = generate_query_hash(QUERY_SHOP_NAME)
+    data = {"extensions": _persisted_query_extensions(query_hash)}
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    error = content["errors"][0]
+    assert error["message"] == "PersistedQueryNotFound"
+    assert error["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+
+def test_persisted_query_is_stored_and_reused(
+    api_client, persisted_queries_settings, site_settings
+):
+    # given
+    query_hash = generate_query_hash(QUERY_SHOP_NAME)
+    extensions = _persisted_query_extensions(query_hash)
+
+    # when
+    register_response = api_client.post(
+        {"query": QUERY_SHOP_NAME, "extensions": extensions}
+    )
+    response = api_client.post({"extensions": extensions})
+
+    # then
+    assert get_persisted_query(query_hash) == QUERY_SHOP_NAME
+    name = site_settings.site.name
+    assert get_graphql_content(register_response)["data"]["shop"]["name"] == name
+    assert get_graphql_content(response)["data"]["shop"]["name"] == name
+
+
+def test_persisted_query_in_batch(
+    api_client, persisted_queries_settings, site_settings
+):
+    # given
+    query_hash = store_persisted_query(QUERY_SHOP_NAME)
+    data = [
+        {"extensions": _persisted_query_extensions(query_hash)},
+        {"extensions": _persisted_query_extensions(generate_query_hash("{ me }"))},
+    ]
+
+    # when
+    response = api_client.post(data)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content[0]["data"]["shop"]["name"] == site_settings.site.name
+    assert content[1]["errors"][0]["message"] == "PersistedQueryNotFound"
+
+
+def test_persisted_query_hash_mismatch(api_client, persisted_queries_settings):
+    # given
+    extensions = _persisted_query_extensions(generate_query_hash("{ me { id } }"))
+
+    # when
+    response = api_client.post({"query": QUERY_SHOP_NAME, "extensions": extensions})
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"] == (
+        "Provided sha256Hash does not match the query."
+    )
+    assert get_persisted_query(generate_query_hash(QUERY_SHOP_NAME)) is None
+
+
+def test_persisted_query_unsupported_version(api_client, persisted_queries_settings):
+    # given
+    extensions = {
+        "persistedQuery": {
+            "version": 2,
+            "sha256Hash": generate_query_hash(QUERY_SHOP_NAME),
+        }
+    }
+
+    # when
+    response = api_client.post({"extensions": extensions})
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["message"].startswith(
+        "Unsupported persisted query version."
+    )
+
+
+def test_persisted_queries_disabled(api_client, settings):
+    # given
+    settings.GRAPHQL_PERSISTED_QUERIES_ENABLED = False
+    extensions = _persisted_query_extensions(generate_query_hash(QUERY_SHOP_NAME))
+
+    # when
+    response = api_client.post({"extensions": extensions})
+
+    # then
+    content = get_graphql_content_from_response(response)
+    error = content["errors"][0]
+    assert error["message"] == "PersistedQueryNotSupported"
+    assert error["extensions"]["code"] == "PERSISTED_QUERY_NOT_SUPPORTED"
+
+
+def test_allowlist_only_rejects_unregistered_query(
+    api_client, persisted_queries_settings
+):
+    # given
+    persisted_queries_settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY = True
+    extensions = _persisted_query_extensions(generate_query_hash(QUERY_SHOP_NAME))
+
+    # when
+    plain_response = api_client.post_graphql(QUERY_SHOP_NAME)
+    persisted_response = api_client.post(
+        {"query": QUERY_SHOP_NAME, "extensions": extensions}
+    )
+
+    # then
+    for response in [plain_response, persisted_response]:
+        assert response.status_code == 400
+        content = get_graphql_content_from_response(response)
+        error = content["errors"][0]
+        assert error["extensions"]["code"] == "PERSISTED_QUERY_NOT_ALLOWED"
+    assert get_persisted_query(generate_query_hash(QUERY_SHOP_NAME)) is None
+
+
+def test_allowlist_only_allows_registered_query(
+    api_client, persisted_queries_settings, site_settings
+):
+    # given
+    persisted_queries_settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY = True
+    query_hash = register_persisted_query(QUERY_SHOP_NAME)
+    # Registered queries don't depend on the cache.
+    cache.clear()
+
+    # when
+    plain_response = api_client.post_graphql(QUERY_SHOP_NAME)
+    persisted_response = api_client.post(
+        {"extensions": _persisted_query_extensions(query_hash)}
+    )
+
+    # then
+    name = site_settings.site.name
+    assert get_graphql_content(plain_response)["data"]["shop"]["name"] == name
+    assert get_graphql_content(persisted_response)["data"]["shop"]["name"] == name
+
+
+def test_register_persisted_queries_command(tmp_path, persisted_queries_settings):
+    # given
+    query_file = tmp_path / "shop.graphql"
+    query_file.write_text(QUERY_SHOP_NAME)
+    out = StringIO()
+
+    # when
+    call_command("register_persisted_queries", str(query_file), stdout=out)
+
+    # then
+    query_hash = generate_query_hash(QUERY_SHOP_NAME)
+    assert PersistedQuery.objects.get(hash=query_hash).query == QUERY_SHOP_NAME
+    assert get_persisted_query(query_hash) == QUERY_SHOP_NAME
+    assert out.getvalue() == f"{query_hash} {query_file}\n"
+
+
+def test_allowlist_only_doesnt_allow_cached_query(
+    api_client, persisted_queries_settings
+):
+    # given
+    persisted_queries_settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY = True
+    query_hash = store_persisted_query(QUERY_SHOP_NAME)
+
+    # when
+    response = api_client.post({"extensions": _persisted_query_extensions(query_hash)})
+
+    # then
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_FOUND"
+
+
+def test_allowlist_only_rejects_query_removed_from_allowlist(
+    api_client, persisted_queries_settings, site_settings
+):
+    # given
+    persisted_queries_settings.GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY = True
+    query_hash = register_persisted_query(QUERY_SHOP_NAME)
+    response = api_client.post_graphql(QUERY_SHOP_NAME)
+    assert get_graphql_content(response)["data"]["shop"]["name"]
+
+    # when
+    PersistedQuery.objects.filter(hash=query_hash).delete()
+
+    # then
+    response = api_client.post_graphql(QUERY_SHOP_NAME)
+    assert response.status_code == 400
+    content = get_graphql_content_from_response(response)
+    assert content["errors"][0]["extensions"]["code"] == "PERSISTED_QUERY_NOT_ALLOWED"
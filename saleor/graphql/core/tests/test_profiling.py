@@ -0,0 +1,99 @@
+from ...tests.utils import get_graphql_content
+from ..profiling import PROFILING_HEADER, QueryProfiler
+
+QUERY_PRODUCTS_WITH_CATEGORY = """
+    query ($channel: String) {
+        products(first: 10, channel: $channel) {
+            edges {
+                node {
+                    name
+                    category {
+                        name
+                    }
+                }
+            }
+        }
+    }
+"""
+
+
+def test_profiling_extension_for_staff_user_with_header(
+    staff_api_client, product_list, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = staff_api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_CATEGORY, variables, **{PROFILING_HEADER: "1"}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    profiling = content["extensions"]["profiling"]
+    assert profiling["sqlCount"] > 0
+    resolvers = {entry["field"]: entry for entry in profiling["resolvers"]}
+    assert resolvers["Query.products"]["calls"] == 1
+    assert resolvers["Query.products"]["sqlCount"] > 0
+    assert resolvers["Product.category"]["calls"] == len(product_list)
+    dataloaders = {entry["name"]: entry for entry in profiling["dataloaders"]}
+    category_loader = dataloaders["CategoryByIdLoader"]
+    assert category_loader["calls"] == 1
+    assert category_loader["keys"] == 1
+    assert category_loader["maxBatchSize"] == 1
+    assert category_loader["sqlCount"] == 1
+    assert profiling["sqlCount"] >= sum(
+        entry["sqlCount"] for entry in profiling["resolvers"] + profiling["dataloaders"]
+    )
+
+
+def test_profiling_header_ignored_for_anonymous_user(
+    api_client, product_list, channel_USD
+):
+    # given
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = api_client.post_graphql(
+        QUERY_PRODUCTS_WITH_CATEGORY, variables, **{PROFILING_HEADER: "1"}
+    )
+
+    # then
+    content = get_graphql_content(response)
+    assert "profiling" not in content.get("extensions", {})
+
+
+def test_profiling_enabled_in_settings(api_client, product_list, channel_USD, settings):
+    # given
+    settings.GRAPHQL_PROFILING_ENABLED = True
+    variables = {"channel": channel_USD.slug}
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCTS_WITH_CATEGORY, variables)
+
+    # then
+    content = get_graphql_content(response)
+    assert "Query.products" in {
+        entry["field"] for entry in content["extensions"]["profiling"]["resolvers"]
+    }
+
+
+def test_query_profiler_attributes_sql_to_innermost_entry():
+    # given
+    profiler = QueryProfiler()
+
+    def execute(sql, params, many, context):
+        return None
+
+    # when
+    with profiler.profile_resolver("Query.products"):
+        profiler.sql_wrapper(execute, "SELECT 1", None, False, {})
+        with profiler.profile_dataloader("ProductByIdLoader", 3):
+            profiler.sql_wrapper(execute, "SELECT 2", None, False, {})
+    profiler.sql_wrapper(execute, "SELECT 3", None, False, {})
+
+    # then
+    assert profiler.sql_count == 3
+    assert profiler.resolvers["Query.products"].sql_count == 1
+    assert profiler.dataloaders["ProductByIdLoader"].sql_count == 1
+    assert profiler.dataloaders["ProductByIdLoader"].max_batch_size == 3
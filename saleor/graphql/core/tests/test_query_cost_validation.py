@@ -1,6 +1,17 @@
+from unittest.mock import patch
+
 import graphene
 import pytest
 from django.test import override_settings
+from graphql import get_default_backend
+from graphql.error import format_error
+
+from ...api import schema
+from ...query_cost_map import COST_MAP
+from ..document_cache import document_cache
+from ..validators.query_cost import QueryCostFunction, validate_query_cost
+
+backend = get_default_backend()
 
 
 @override_settings(GRAPHQL_QUERY_MAX_COMPLEXITY=1)
@@ -241,3 +252,97 @@ def test_query_with_fragments_have_same_multiplied_complexity_cost(
     assert json_response["data"] == expected_data
     query_cost = json_response["extensions"]["cost"]["requestedQueryCost"]
     assert query_cost == 120
+
+
+QUERY_WITH_MULTIPLE_OPERATIONS = """
+query first($first: Int) {
+  products(first: $first) { edges { node { id } } }
+}
+query second($last: Int) {
+  categories(last: $last) {
+    edges { node { products(first: 5) { edges { node { id } } } } }
+  }
+}
+"""
+
+QUERY_WITH_MISSING_VARIABLE = """
+query productQueryCost($id: ID!, $first: Int) {
+  translation(id: $id, kind: PRODUCT) { __typename }
+  products(first: $first) { edges { node { id } } }
+}
+"""
+
+
+@pytest.mark.parametrize(
+    "query, variables",
+    [
+        (PRODUCTS_QUERY, {"channel": "main", "first": 10}),
+        (PRODUCTS_QUERY, {"channel": "main", "first": 100}),
+        (PRODUCTS_QUERY, {}),
+        (PRODUCTS_QUERY, None),
+        (PRODUCTS_QUERY_WITH_INLINE_FRAGMENT, {"first": 3}),
+        (PRODUCTS_QUERY_WITH_FRAGMENT, {"first": 7}),
+        (VARIANTS_QUERY, {"ids": ["a", "b"], "first": 100}),
+        (QUERY_WITH_MULTIPLE_OPERATIONS, {"first": 30, "last": 30}),
+        (QUERY_WITH_MISSING_VARIABLE, {"first": 10}),
+    ],
+)
+@pytest.mark.parametrize("maximum_cost", [1, 1000, 50000])
+def test_query_cost_function_matches_cost_validator(query, variables, maximum_cost):
+    # given
+    document = backend.document_from_string(schema, query)
+    query_cost_function = QueryCostFunction(schema, document.document_ast, COST_MAP)
+
+    # when
+    cost, errors = query_cost_function(variables, maximum_cost)
+
+    # then
+    expected_cost, expected_errors = validate_query_cost(
+        schema, document, variables, COST_MAP, maximum_cost
+    )
+    assert cost == expected_cost
+    assert [format_error(e) for e in errors or []] == [
+        format_error(e) for e in expected_errors or []
+    ]
+
+
+def test_query_cost_function_reports_invalid_cost_map():
+    # given
+    document = backend.document_from_string(schema, PRODUCTS_QUERY)
+    cost_map = {"Query": {"missingField": {"complexity": 1}}}
+    query_cost_function = QueryCostFunction(schema, document.document_ast, cost_map)
+
+    # when
+    cost, errors = query_cost_function({"first": 10}, 100)
+
+    # then
+    expected_cost, expected_errors = validate_query_cost(
+        schema, document, {"first": 10}, cost_map, 100
+    )
+    assert cost == expected_cost == 0
+    assert [e.message for e in errors] == [e.message for e in expected_errors]
+
+
+@override_settings(GRAPHQL_QUERY_MAX_COMPLEXITY=100000)
+@patch(
+    "saleor.graphql.core.document_cache.QueryCostFunction",
+    wraps=QueryCostFunction,
+)
+def test_query_cost_function_compiled_once_per_document(
+    mocked_query_cost_function, api_client, channel_USD, settings
+):
+    # given
+    settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 10
+    document_cache.clear()
+
+    # when
+    costs = []
+    for first in [1, 10, 1]:
+        variables = {"channel": channel_USD.slug, "first": first}
+        response = api_client.post_graphql(PRODUCTS_QUERY, variables)
+        costs.append(response.json()["extensions"]["cost"]["requestedQueryCost"])
+
+    # then
+    document_cache.clear()
+    mocked_query_cost_function.assert_called_once()
+    assert costs == [3, 120, 3]
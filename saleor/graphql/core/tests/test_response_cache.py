@@ -0,0 +1,134 @@
+import graphene
+import pytest
+from django.core.cache import cache
+from graphql import get_default_backend
+
+from ...api import schema
+from ...tests.utils import get_graphql_content
+from ..document_cache import get_cached_document
+from ..response_cache import (
+    TAG_CATEGORIES,
+    TAG_MENUS,
+    TAG_PRODUCTS,
+    get_response_cache_tags,
+    invalidate_response_cache_tags,
+)
+
+QUERY_PRODUCT = """
+    query ($id: ID, $channel: String) {
+        product(id: $id, channel: $channel) {
+            name
+            category {
+                name
+            }
+        }
+    }
+"""
+
+
+@pytest.fixture
+def response_cache_settings(settings):
+    cache.clear()
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 60
+    yield settings
+    cache.clear()
+
+
+@pytest.fixture
+def product_variables(product, channel_USD):
+    return {
+        "id": graphene.Node.to_global_id("Product", product.pk),
+        "channel": channel_USD.slug,
+    }
+
+
+def test_anonymous_query_response_is_cached(
+    api_client, product, product_variables, response_cache_settings
+):
+    # given
+    name = product.name
+    first_response = api_client.post_graphql(QUERY_PRODUCT, product_variables)
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCT, product_variables)
+
+    # then
+    assert get_graphql_content(first_response)["data"]["product"]["name"] == name
+    assert get_graphql_content(response)["data"]["product"]["name"] == name
+
+
+def test_cached_response_is_invalidated_by_tag(
+    api_client,
+    product,
+    product_variables,
+    response_cache_settings,
+    django_capture_on_commit_callbacks,
+):
+    # given
+    api_client.post_graphql(QUERY_PRODUCT, product_variables)
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+    response = api_client.post_graphql(QUERY_PRODUCT, product_variables)
+
+    # then
+    assert get_graphql_content(response)["data"]["product"]["name"] == "New name"
+
+
+def test_cached_response_not_used_for_authenticated_requests(
+    api_client, user_api_client, product, product_variables, response_cache_settings
+):
+    # given
+    api_client.post_graphql(QUERY_PRODUCT, product_variables)
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    # when
+    response = user_api_client.post_graphql(QUERY_PRODUCT, product_variables)
+
+    # then
+    assert get_graphql_content(response)["data"]["product"]["name"] == "New name"
+
+
+def test_response_cache_disabled(api_client, product, product_variables, settings):
+    # given
+    settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT = 0
+    api_client.post_graphql(QUERY_PRODUCT, product_variables)
+    product.name = "New name"
+    product.save(update_fields=["name"])
+
+    # when
+    response = api_client.post_graphql(QUERY_PRODUCT, product_variables)
+
+    # then
+    assert get_graphql_content(response)["data"]["product"]["name"] == "New name"
+
+
+@pytest.mark.parametrize(
+    "query, expected_tags",
+    [
+        (QUERY_PRODUCT, {TAG_PRODUCTS, TAG_CATEGORIES}),
+        ("{ menus(first: 1) { edges { node { name } } } }", {TAG_MENUS}),
+        ("{ shop { name } }", set()),
+        ("{ me { email } }", None),
+        ("{ shop { name } me { email } }", None),
+        ("mutation { tokenRefresh { token } }", None),
+    ],
+)
+def test_get_response_cache_tags(query, expected_tags):
+    # given
+    cached_document = get_cached_document(get_default_backend(), schema, query)
+
+    # when
+    tags = get_response_cache_tags(cached_document, None)
+
+    # then
+    if expected_tags is None:
+        assert tags is None
+    else:
+        assert tags == frozenset(expected_tags)
@@ -0,0 +1,100 @@
+import json
+from decimal import Decimal
+
+import pytest
+
+from ...tests.utils import get_graphql_content
+from ..serialization import (
+    JSONSerializer,
+    OrjsonSerializer,
+    get_json_serializer,
+    orjson,
+)
+
+DATA = {
+    "data": {
+        "products": [{"name": "Żółta koszulka", "price": Decimal("1.50")}] * 100,
+    },
+    "extensions": {"cost": {"requestedQueryCost": 1}},
+}
+
+QUERY_SHOP_NAME = "{ shop { name } }"
+
+requires_orjson = pytest.mark.skipif(orjson is None, reason="orjson is not installed")
+SERIALIZER_CLASSES = [
+    JSONSerializer,
+    pytest.param(OrjsonSerializer, marks=requires_orjson),
+]
+
+
+@pytest.mark.parametrize("serializer_class", SERIALIZER_CLASSES)
+def test_serializer_dumps(serializer_class):
+    # when
+    content = serializer_class().dumps(DATA)
+
+    # then
+    result = json.loads(content)
+    assert result["data"]["products"][0] == {
+        "name": "Żółta koszulka",
+        "price": "1.50",
+    }
+    assert result["extensions"] == DATA["extensions"]
+
+
+@pytest.mark.parametrize("serializer_class", SERIALIZER_CLASSES)
+def test_serializer_iter_chunks(serializer_class):
+    # given
+    serializer = serializer_class()
+
+    # when
+    chunks = list(serializer.iter_chunks(DATA, chunk_size=100))
+
+    # then
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == json.loads(serializer.dumps(DATA))
+
+
+@requires_orjson
+def test_get_json_serializer(settings):
+    # given
+    settings.GRAPHQL_JSON_SERIALIZER = (
+        "saleor.graphql.core.serialization.OrjsonSerializer"
+    )
+
+    # when
+    serializer = get_json_serializer()
+
+    # then
+    assert isinstance(serializer, OrjsonSerializer)
+
+
+@requires_orjson
+def test_response_serialized_with_configured_serializer(
+    api_client, site_settings, settings
+):
+    # given
+    settings.GRAPHQL_JSON_SERIALIZER = (
+        "saleor.graphql.core.serialization.OrjsonSerializer"
+    )
+
+    # when
+    response = api_client.post_graphql(QUERY_SHOP_NAME)
+
+    # then
+    content = get_graphql_content(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+    assert int(response["Content-Length"]) == len(response.content)
+
+
+def test_streaming_response(api_client, site_settings, settings):
+    # given
+    settings.GRAPHQL_STREAMING_RESPONSE = True
+
+    # when
+    response = api_client.post_graphql(QUERY_SHOP_NAME)
+
+    # then
+    assert response.streaming
+    assert response.status_code == 200
+    content = json.loads(b"".join(response.streaming_content))
+    assert content["data"]["shop"]["name"] == site_settings.site.name
@@ -1,16 +1,22 @@
+import asyncio
+import threading
 from unittest import mock
 
 import graphene
 import pytest
-from django.test import override_settings
+from asgiref.sync import async_to_sync
+from django.test import RequestFactory, override_settings
 from graphql.execution.base import ExecutionResult
+from graphql.validation import validate
 
 from .... import __version__ as saleor_version
 from ....demo.views import EXAMPLE_QUERY
 from ....graphql.utils import INTERNAL_ERROR_MESSAGE
+from ...api import schema
 from ...tests.fixtures import API_PATH
 from ...tests.utils import get_graphql_content, get_graphql_content_from_response
-from ...views import generate_cache_key
+from ...views import AsyncGraphQLView, GraphQLView, generate_cache_key
+from ..document_cache import document_cache, get_document_cache_key
 
 
 def test_batch_queries(category, product, api_client, channel_USD):
@@ -332,3 +338,211 @@ def test_introspection_query_is_not_cached_in_debug_mode(
 def test_generate_cache_key_use_saleor_version():
     cache_key = generate_cache_key(INTROSPECTION_QUERY)
     assert saleor_version in cache_key
+
+
+@pytest.fixture
+def clear_document_cache():
+    document_cache.clear()
+    yield
+    document_cache.clear()
+
+
+@mock.patch("saleor.graphql.core.document_cache.validate", wraps=validate)
+def test_query_document_is_parsed_and_validated_once(
+    mocked_validate, api_client, settings, clear_document_cache
+):
+    # given
+    settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 10
+    query = "{ shop { name } }"
+
+    # when
+    first_response = api_client.post_graphql(query)
+    second_response = api_client.post_graphql(query)
+
+    # then
+    assert get_graphql_content(first_response) == get_graphql_content(second_response)
+    mocked_validate.assert_called_once()
+    assert len(document_cache) == 1
+
+
+def test_query_document_cache_returns_validation_errors(
+    api_client, settings, clear_document_cache
+):
+    # given
+    settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 10
+    query = "{ shop }"
+
+    # when
+    responses = [api_client.post_graphql(query) for _ in range(2)]
+
+    # then
+    assert len(document_cache) == 1
+    for response in responses:
+        assert response.status_code == 400
+        content = get_graphql_content_from_response(response)
+        assert content["errors"][0]["message"] == (
+            'Field "shop" of type "Shop!" must have a sub selection.'
+        )
+
+
+def test_query_document_cache_evicts_least_recently_used(
+    api_client, settings, clear_document_cache
+):
+    # given
+    settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 2
+    first_query = "{ shop { name } }"
+    second_query = "{ shop { description } }"
+    third_query = "{ shop { domain { host } } }"
+
+    # when
+    for query in [first_query, second_query, first_query, third_query]:
+        api_client.post_graphql(query)
+
+    # then
+    assert len(document_cache) == 2
+    assert document_cache.get(get_document_cache_key(schema, first_query))
+    assert not document_cache.get(get_document_cache_key(schema, second_query))
+    assert document_cache.get(get_document_cache_key(schema, third_query))
+
+
+def test_query_document_cache_disabled(api_client, settings, clear_document_cache):
+    # given
+    settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 0
+
+    # when
+    response = api_client.post_graphql("{ shop { name } }")
+
+    # then
+    get_graphql_content(response)
+    assert len(document_cache) == 0
+
+
+BATCH_SHOP_QUERY = "query GetShop { shop { name } }"
+BATCH_INVALID_QUERY = "query Invalid { shop }"
+BATCH_MUTATION = """
+mutation CreateToken {
+    tokenCreate(email: "unknown@example.com", password: "password") {
+        errors { field code }
+    }
+}
+"""
+
+
+@mock.patch("saleor.graphql.views.GraphQLView.get_response")
+def test_batch_queries_executed_concurrently_keep_mutations_order(
+    mocked_get_response, api_client, settings
+):
+    # given
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 4
+    main_thread = threading.current_thread()
+    calls = []
+
+    def get_response(request, data):
+        calls.append((data["query"], threading.current_thread() is main_thread))
+        status = 400 if data["query"] == BATCH_INVALID_QUERY else 200
+        return {"data": data["query"]}, status
+
+    mocked_get_response.side_effect = get_response
+    queries = [
+        BATCH_SHOP_QUERY,
+        BATCH_INVALID_QUERY,
+        BATCH_MUTATION,
+        BATCH_SHOP_QUERY,
+    ]
+
+    # when
+    response = api_client.post([{"query": query} for query in queries])
+
+    # then
+    assert response.status_code == 400
+    assert [entry["data"] for entry in response.json()] == queries
+    # the mutation is executed in the request thread, after preceding queries
+    assert calls.index((BATCH_MUTATION, True)) == 2
+    assert not any(in_main_thread for _, in_main_thread in calls[:2] + calls[3:])
+
+
+@pytest.mark.django_db(transaction=True)
+def test_batch_queries_executed_concurrently_match_sequential_results(
+    api_client, site_settings, settings
+):
+    # given
+    data = [
+        {"query": BATCH_SHOP_QUERY},
+        {"query": BATCH_INVALID_QUERY},
+        {"query": BATCH_MUTATION},
+        {"query": BATCH_SHOP_QUERY},
+    ]
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 0
+    sequential_response = api_client.post(data)
+
+    # when
+    settings.GRAPHQL_BATCH_MAX_WORKERS = 4
+    response = api_client.post(data)
+
+    # then
+    assert response.status_code == sequential_response.status_code == 400
+    assert response.json() == sequential_response.json()
+    assert response.json()[0]["data"]["shop"]["name"] == site_settings.site.name
+
+
+def test_async_graphql_view_is_csrf_exempt_coroutine():
+    # when
+    view = AsyncGraphQLView.as_view(schema=schema)
+
+    # then
+    assert asyncio.iscoroutinefunction(view)
+    assert view.csrf_exempt is True
+    assert view.view_class is AsyncGraphQLView
+
+
+@pytest.mark.django_db(transaction=True)
+def test_async_graphql_view_executes_query(site_settings):
+    # given
+    view = AsyncGraphQLView.as_view(schema=schema)
+    request = RequestFactory().post(
+        API_PATH, data={"query": BATCH_SHOP_QUERY}, content_type="application/json"
+    )
+
+    # when
+    response = async_to_sync(view)(request)
+
+    # then
+    content = get_graphql_content_from_response(response)
+    assert content["data"]["shop"]["name"] == site_settings.site.name
+
+
+@mock.patch.object(GraphQLView, "get_response")
+def test_async_graphql_view_handles_requests_concurrently(mocked_get_response):
+    # given
+    requests_count = 4
+    # Each request waits until all of them are being handled, which never happens
+    # when the requests are handled one at a time in a single thread.
+    all_requests_started = threading.Barrier(requests_count, timeout=5)
+
+    def get_response(request, data):
+        all_requests_started.wait()
+        return {"data": {"shop": {"name": "Saleor"}}}, 200
+
+    mocked_get_response.side_effect = get_response
+    view = AsyncGraphQLView.as_view(schema=schema)
+
+    async def handle_requests():
+        return await asyncio.gather(
+            *[
+                view(
+                    RequestFactory().post(
+                        API_PATH,
+                        data={"query": BATCH_SHOP_QUERY},
+                        content_type="application/json",
+                    )
+                )
+                for _ in range(requests_count)
+            ]
+        )
+
+    # when
+    responses = async_to_sync(handle_requests)()
+
+    # then
+    assert [response.status_code for response in responses] == [200] * requests_count
+    assert mocked_get_response.call_count == requests_count
@@ -1,6 +1,6 @@
 from functools import reduce
 from operator import add, mul
-from typing import Any, Dict, List, Optional, Union, cast
+from typing import Any, Dict, List, Optional, Tuple, Union, cast
 
 from graphql import (
     GraphQLError,
@@ -11,11 +11,15 @@ from graphql import (
 )
 from graphql.execution.values import get_argument_values
 from graphql.language.ast import (
+    Document,
     Field,
     FragmentDefinition,
     FragmentSpread,
     InlineFragment,
+    ListValue,
+    ObjectValue,
     OperationDefinition,
+    Variable,
 )
 from graphql.type import GraphQLField
 from graphql.validation import validate
@@ -181,32 +185,10 @@ class CostValidator(ValidationRule):
         return cost_args
 
     def get_multipliers_from_string(self, multipliers: List[str], field_args):
-        accessors = [s.split(".") for s in multipliers]
-        multipliers: Any = []
-        for accessor in accessors:
-            val = field_args
-            for key in accessor:
-                val = val.get(key)
-            try:
-                multipliers.append(int(val))
-            except (ValueError, TypeError):
-                pass
-        multipliers = [
-            len(multiplier) if isinstance(multiplier, (list, tuple)) else multiplier
-            for multiplier in multipliers
-        ]
-        return [m for m in multipliers if m > 0]
+        return get_multipliers_from_string(multipliers, field_args)
 
     def get_cost_exceeded_error(self) -> "QueryCostError":
-        return QueryCostError(
-            cost_analysis_message(self.maximum_cost, self.cost),
-            extensions={
-                "cost": {
-                    "requestedQueryCost": self.cost,
-                    "maximumAvailable": self.maximum_cost,
-                }
-            },
-        )
+        return get_cost_exceeded_error(self.maximum_cost, self.cost)
 
     def enter(
         self,
@@ -231,6 +213,24 @@ class CostValidator(ValidationRule):
             self.leave_operation_definition(node, key, parent, path, ancestors)
 
 
+def get_multipliers_from_string(multipliers: List[str], field_args: Dict):
+    accessors = [s.split(".") for s in multipliers]
+    values: Any = []
+    for accessor in accessors:
+        val = field_args
+        for key in accessor:
+            val = val.get(key)
+        try:
+            values.append(int(val))
+        except (ValueError, TypeError):
+            pass
+    values = [
+        len(multiplier) if isinstance(multiplier, (list, tuple)) else multiplier
+        for multiplier in values
+    ]
+    return [m for m in values if m > 0]
+
+
 def validate_cost_map(cost_map: Dict[str, Dict[str, Any]], schema: GraphQLSchema):
     type_map = schema.get_type_map()
     for type_name, type_fields in cost_map.items():
@@ -307,3 +307,233 @@ def validate_query_cost(
     if error:
         return validator.cost, error
     return validator.cost, None
+
+
+class FieldCost:
+    """Cost-related data of a single field in a compiled query.
+
+    Argument values of fields that don't use variables are the same for every
+    request, so they are coerced only once, when the query is compiled.
+    """
+
+    __slots__ = (
+        "field_args",
+        "argument_nodes",
+        "static_args",
+        "static_error",
+        "uses_variables",
+        "cost_args",
+        "children",
+    )
+
+    def __init__(
+        self,
+        field: GraphQLField,
+        node: Field,
+        cost_args: Optional[Dict[str, Any]],
+        children: List["FieldCost"],
+    ):
+        self.field_args = field.args
+        self.argument_nodes = node.arguments
+        self.cost_args = cost_args
+        self.children = children
+        self.static_args: Dict[str, Any] = {}
+        self.static_error: Optional[Exception] = None
+        self.uses_variables = any(
+            value_contains_variable(argument.value) for argument in node.arguments or []
+        )
+        if not self.uses_variables:
+            try:
+                self.static_args = get_argument_values(
+                    self.field_args, self.argument_nodes
+                )
+            except Exception as e:
+                self.static_error = e
+
+    def get_argument_values(self, variables: Optional[Dict]) -> Dict[str, Any]:
+        if not self.uses_variables:
+            if self.static_error:
+                raise self.static_error
+            return self.static_args
+        return get_argument_values(self.field_args, self.argument_nodes, variables)
+
+
+class QueryCostFunction:
+    """Query cost of a document compiled to a function of the query variables.
+
+    Computes exactly the same cost and errors as `CostValidator`, but the document
+    is traversed only once, when the function is created. Calling it only walks
+    the fields of the document and evaluates their arguments, so it can be cached
+    along with the document and reused for every request with the same query.
+    """
+
+    def __init__(
+        self,
+        schema: GraphQLSchema,
+        document_ast: Document,
+        cost_map: Dict[str, Dict[str, Any]],
+        *,
+        default_cost: int = 0,
+        default_complexity: int = 1,
+    ):
+        self.schema = schema
+        self.cost_map = cost_map
+        self.default_cost = default_cost
+        self.default_complexity = default_complexity
+        self.fragments = {
+            definition.name.value: definition
+            for definition in document_ast.definitions
+            if isinstance(definition, FragmentDefinition)
+        }
+        try:
+            validate_cost_map(cost_map, schema)
+            cost_map_error: Optional[GraphQLError] = None
+        except GraphQLError as e:
+            cost_map_error = e
+        # Each operation is compiled to the list of its root fields, or to the error
+        # reported by the cost map validation.
+        self.operations: List[Union[List[FieldCost], GraphQLError]] = []
+        for definition in document_ast.definitions:
+            if not isinstance(definition, OperationDefinition):
+                continue
+            if cost_map_error:
+                self.operations.append(cost_map_error)
+                continue
+            root_type = {
+                "query": schema.get_query_type,
+                "mutation": schema.get_mutation_type,
+                "subscription": schema.get_subscription_type,
+            }.get(definition.operation)
+            if root_type:
+                self.operations.append(self.compile_node(definition, root_type()))
+            else:
+                self.operations.append([])
+
+    def compile_node(self, node: CostAwareNode, type_def) -> List[FieldCost]:
+        if isinstance(node, FragmentSpread) or not node.selection_set:
+            return []
+        fields: GraphQLFieldMap = {}
+        if isinstance(type_def, (GraphQLObjectType, GraphQLInterfaceType)):
+            fields = type_def.fields
+        field_costs: List[FieldCost] = []
+        for child_node in node.selection_set.selections:
+            if isinstance(child_node, Field):
+                field = fields.get(child_node.name.value)
+                if not field:
+                    continue
+                cost_args = None
+                if type_def and type_def.name:
+                    cost_args = self.cost_map.get(type_def.name, {}).get(
+                        child_node.name.value
+                    )
+                field_costs.append(
+                    FieldCost(
+                        field,
+                        child_node,
+                        cost_args or None,
+                        self.compile_node(child_node, get_named_type(field.type)),
+                    )
+                )
+            # Fragments are computed with the multipliers of their parent, which
+            # is the same as if their fields were selected directly.
+            if isinstance(child_node, FragmentSpread):
+                fragment = self.fragments.get(child_node.name.value)
+                if fragment:
+                    fragment_type = self.schema.get_type(
+                        fragment.type_condition.name.value
+                    )
+                    field_costs.extend(self.compile_node(fragment, fragment_type))
+            if isinstance(child_node, InlineFragment):
+                inline_fragment_type = type_def
+                if child_node.type_condition and child_node.type_condition.name:
+                    inline_fragment_type = self.schema.get_type(
+                        child_node.type_condition.name.value
+                    )
+                field_costs.extend(self.compile_node(child_node, inline_fragment_type))
+        return field_costs
+
+    def __call__(
+        self, variables: Optional[Dict], maximum_cost: int
+    ) -> Tuple[int, Optional[List[GraphQLError]]]:
+        cost = 0
+        errors: List[GraphQLError] = []
+        for operation in self.operations:
+            if isinstance(operation, GraphQLError):
+                errors.append(operation)
+            else:
+                cost += self.compute_cost(operation, [], variables, errors)
+            if cost > maximum_cost:
+                errors.append(get_cost_exceeded_error(maximum_cost, cost))
+        return cost, errors or None
+
+    def compute_cost(
+        self,
+        field_costs: List[FieldCost],
+        parent_multipliers: List[int],
+        variables: Optional[Dict],
+        errors: List[GraphQLError],
+    ) -> int:
+        total = 0
+        for field_cost in field_costs:
+            node_cost = self.default_cost
+            operation_multipliers = parent_multipliers
+            try:
+                field_args = field_cost.get_argument_values(variables)
+            except Exception as e:
+                errors.append(GraphQLError(str(e)))
+                field_args = {}
+            if field_cost.cost_args is not None:
+                cost_args = field_cost.cost_args.copy()
+                if "multipliers" in cost_args:
+                    cost_args["multipliers"] = get_multipliers_from_string(
+                        cost_args["multipliers"], field_args
+                    )
+                try:
+                    node_cost, operation_multipliers = self.compute_field_cost(
+                        parent_multipliers, **cost_args
+                    )
+                except (TypeError, ValueError) as e:
+                    errors.append(GraphQLError(str(e)))
+            node_cost += self.compute_cost(
+                field_cost.children, operation_multipliers, variables, errors
+            )
+            total += node_cost
+        return total
+
+    def compute_field_cost(
+        self,
+        parent_multipliers: List[int],
+        multipliers=None,
+        use_multipliers=True,
+        complexity=None,
+    ) -> Tuple[int, List[int]]:
+        if complexity is None:
+            complexity = self.default_complexity
+        if use_multipliers:
+            if multipliers:
+                multiplier = reduce(add, multipliers, 0)
+                parent_multipliers = parent_multipliers + [multiplier]
+            return reduce(mul, parent_multipliers, complexity), parent_multipliers
+        return complexity, parent_multipliers
+
+
+def value_contains_variable(value_node: Any) -> bool:
+    if isinstance(value_node, Variable):
+        return True
+    if isinstance(value_node, ListValue):
+        return any(value_contains_variable(value) for value in value_node.values)
+    if isinstance(value_node, ObjectValue):
+        return any(value_contains_variable(field.value) for field in value_node.fields)
+    return False
+
+
+def get_cost_exceeded_error(maximum_cost: int, cost: int) -> "QueryCostError":
+    return QueryCostError(
+        cost_analysis_message(maximum_cost, cost),
+        extensions={
+            "cost": {
+                "requestedQueryCost": cost,
+                "maximumAvailable": maximum_cost,
+            }
+        },
+    )
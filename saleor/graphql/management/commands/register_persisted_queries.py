@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand
+
+from ...core.persisted_queries import register_persisted_query
+
+
+class Command(BaseCommand):
+    help = (
+        "Registers GraphQL queries from the given files in the allow-list of "
+        "persisted queries and writes their sha256 hashes to stdout."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "files", nargs="+", type=str, help="Files with a single GraphQL query."
+        )
+
+    def handle(self, *args, **options):
+        for file_path in options["files"]:
+            with open(file_path, encoding="utf-8") as query_file:
+                query_hash = register_persisted_query(query_file.read())
+            self.stdout.write(f"{query_hash} {file_path}")
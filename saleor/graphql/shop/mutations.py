@@ -6,6 +6,7 @@ from ...channel import models as channel_models
 from ...core.error_codes import ShopErrorCode
 from ...core.utils.url import validate_storefront_url
 from ...permission.enums import GiftcardPermissions, OrderPermissions, SitePermissions
+from ...plugins.config_cache import invalidate_plugins_config_cache
 from ...site import GiftCardSettingsExpiryType
 from ...site.error_codes import GiftCardSettingsErrorCode, OrderSettingsErrorCode
 from ...site.models import DEFAULT_LIMIT_QUANTITY_PER_CHECKOUT
@@ -447,6 +448,7 @@ class OrderSettingsUpdate(BaseMutation):
 
         if update_fields:
             channel_models.Channel.objects.update(**update_fields)
+            invalidate_plugins_config_cache()
 
         channel.refresh_from_db()
 
@@ -1,17 +1,30 @@
+import copy
 import hashlib
 import importlib
 import json
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import update_wrapper
 from inspect import isclass
-from typing import Any, Dict, List, Optional, Tuple, Union
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple, Union
 
 import opentracing
 import opentracing.tags
+from asgiref.sync import sync_to_async
 from django.conf import settings
 from django.core.cache import cache
-from django.db import connection
+from django.db import close_old_connections, connection
 from django.db.backends.postgresql.base import DatabaseWrapper
-from django.http import HttpRequest, HttpResponseNotAllowed, JsonResponse
+from django.http import (
+    HttpRequest,
+    HttpResponse,
+    HttpResponseNotAllowed,
+    JsonResponse,
+    StreamingHttpResponse,
+)
+from django.http.response import HttpResponseBase
 from django.shortcuts import render
+from django.utils.decorators import classonlymethod
 from django.views.generic import View
 from graphql import GraphQLDocument, get_default_backend
 from graphql.error import GraphQLError, GraphQLSyntaxError
@@ -21,12 +34,25 @@ from jwt.exceptions import PyJWTError
 from .. import __version__ as saleor_version
 from ..core.exceptions import PermissionDenied, ReadOnlyException
 from ..core.utils import is_valid_ipv4, is_valid_ipv6
+from ..plugins.webhook.tasks import webhook_deliveries_batch
 from ..webhook import observability
 from .api import API_PATH, schema
 from .context import get_context_value
-from .core.validators.query_cost import validate_query_cost
+from .core.document_cache import CachedDocument, get_cached_document
+from .core.persisted_queries import resolve_persisted_query
+from .core.profiling import (
+    ProfilingMiddleware,
+    QueryProfiler,
+    profile_sql_queries,
+    start_profiling,
+)
+from .core.response_cache import get_response_cache_key
+from .core.serialization import get_json_serializer
 from .query_cost_map import COST_MAP
-from .utils import format_error, query_fingerprint, query_identifier
+from .utils import format_error
+
+if TYPE_CHECKING:
+    from ..webhook.observability.utils import ApiCall
 
 INT_ERROR_MSG = "Int cannot represent non 32-bit signed integer value"
 
@@ -121,7 +147,7 @@ class GraphQLView(View):
             },
         )
 
-    def _handle_query(self, request: HttpRequest) -> JsonResponse:
+    def _handle_query(self, request: HttpRequest) -> HttpResponseBase:
         try:
             data = self.parse_body(request)
         except ValueError:
@@ -131,16 +157,35 @@ class GraphQLView(View):
             )
 
         if isinstance(data, list):
-            responses = [self.get_response(request, entry) for entry in data]
+            responses = self.get_batch_responses(request, data)
             result: Union[list, Optional[dict]] = [
                 response for response, code in responses
             ]
             status_code = max((code for response, code in responses), default=200)
         else:
             result, status_code = self.get_response(request, data)
-        return JsonResponse(data=result, status=status_code, safe=False)
+        return self.make_json_response(result, status_code)
+
+    @staticmethod
+    def make_json_response(data: Any, status: int) -> HttpResponseBase:
+        """Serialize the data with the serializer set in `GRAPHQL_JSON_SERIALIZER`.
+
+        With `GRAPHQL_STREAMING_RESPONSE` enabled, the response is encoded while
+        it's being sent, so the whole encoded body is never kept in memory.
+        """
+        serializer = get_json_serializer()
+        if settings.GRAPHQL_STREAMING_RESPONSE:
+            return StreamingHttpResponse(
+                serializer.iter_chunks(data),
+                status=status,
+                content_type="application/json",
+            )
+        content = serializer.dumps(data)
+        response = HttpResponse(content, status=status, content_type="application/json")
+        response["Content-Length"] = len(content)
+        return response
 
-    def handle_query(self, request: HttpRequest) -> JsonResponse:
+    def handle_query(self, request: HttpRequest) -> HttpResponseBase:
         tracer = opentracing.global_tracer()
 
         # Disable extending spans from header due to:
@@ -182,10 +227,10 @@ class GraphQLView(View):
             response = self._handle_query(request)
             span.set_tag(opentracing.tags.HTTP_STATUS_CODE, response.status_code)
 
-            # RFC2616: Content-Length is defined in bytes,
-            # we can calculate the RAW UTF-8 size using the length of
-            # response.content of type 'bytes'
-            span.set_tag("http.content_length", len(response.content))
+            # RFC2616: Content-Length is defined in bytes. It's set on responses
+            # that are not streamed, so there is no need to read their content.
+            if content_length := response.get("Content-Length"):
+                span.set_tag("http.content_length", int(content_length))
             with observability.report_api_call(request) as api_call:
                 api_call.response = response
                 api_call.report()
@@ -216,17 +261,80 @@ class GraphQLView(View):
             operation.result_invalid = execution_result.invalid
         return result, status_code
 
+    def get_batch_responses(
+        self, request: HttpRequest, data: list
+    ) -> List[Tuple[Optional[Dict[str, List[Any]]], int]]:
+        """Execute batched operations and return their responses in order.
+
+        With `GRAPHQL_BATCH_MAX_WORKERS` greater than 1, consecutive read-only
+        queries are executed concurrently in a thread pool, each one with its own
+        copy of the request and its own database connection. Any other operation
+        waits for the preceding ones and is executed alone, so mutations keep
+        their order relative to the rest of the batch.
+        """
+        max_workers = settings.GRAPHQL_BATCH_MAX_WORKERS
+        if max_workers <= 1 or len(data) < 2:
+            return [self.get_response(request, entry) for entry in data]
+
+        executor = get_batch_executor(max_workers)
+        api_call = observability.get_current_api_call()
+        responses: List[Tuple[Optional[Dict[str, List[Any]]], int]] = []
+        pending: List[Future] = []
+        for entry in data:
+            if self.is_read_only_operation(request, entry):
+                pending.append(
+                    executor.submit(
+                        self.get_response_in_thread,
+                        copy.copy(request),
+                        entry,
+                        api_call,
+                    )
+                )
+                continue
+            responses.extend(future.result() for future in pending)
+            pending = []
+            responses.append(self.get_response(request, entry))
+        responses.extend(future.result() for future in pending)
+        return responses
+
+    def get_response_in_thread(
+        self,
+        request: HttpRequest,
+        data: dict,
+        api_call: Optional["ApiCall"],
+    ) -> Tuple[Optional[Dict[str, List[Any]]], int]:
+        with observability.share_api_call(api_call):
+            return run_in_worker_thread(self.get_response, request, data)
+
+    def is_read_only_operation(self, request: HttpRequest, data: dict) -> bool:
+        if request.content_type == "multipart/form-data":
+            return False
+        try:
+            query, _variables, operation_name = self.get_graphql_params(request, data)
+            if not query or not isinstance(query, str):
+                return False
+            document = get_cached_document(self.backend, self.schema, query).document
+        except (ValueError, GraphQLError):
+            return False
+        return document.get_operation_type(operation_name) == "query"
+
+    def get_middleware(self, profiler: Optional[QueryProfiler]):
+        if profiler is None:
+            return self.middleware
+        return [*(self.middleware or []), ProfilingMiddleware()]
+
     def get_root_value(self):
         return self.root_value
 
     def parse_query(
         self, query: Optional[str]
-    ) -> Tuple[Optional[GraphQLDocument], Optional[ExecutionResult]]:
+    ) -> Tuple[Optional[CachedDocument], Optional[ExecutionResult]]:
         """Attempt to parse a query (mandatory) to a gql document object.
 
         If no query was given or query is not a string, it returns an error.
         If the query is invalid, it returns an error as well.
-        Otherwise, it returns the parsed gql document.
+        Otherwise, it returns the parsed gql document, taken from the process-wide
+        document cache when possible.
         """
         if not query or not isinstance(query, str):
             return (
@@ -238,10 +346,7 @@ class GraphQLView(View):
 
         # Attempt to parse the query, if it fails, return the error
         try:
-            return (
-                self.backend.document_from_string(self.schema, query),
-                None,
-            )
+            return get_cached_document(self.backend, self.schema, query), None
         except (ValueError, GraphQLSyntaxError) as e:
             return None, ExecutionResult(errors=[e], invalid=True)
 
@@ -268,20 +373,26 @@ class GraphQLView(View):
                 request.build_absolute_uri(request.get_full_path()),
             )
 
-            query, variables, operation_name = self.get_graphql_params(request, data)
+            try:
+                query, variables, operation_name = self.get_graphql_params(
+                    request, data
+                )
+            except GraphQLError as e:
+                return ExecutionResult(errors=[e], invalid=True)
 
-            document, error = self.parse_query(query)
+            cached_document, error = self.parse_query(query)
             with observability.report_gql_operation() as operation:
-                operation.query = document
+                operation.query = cached_document.document if cached_document else None
                 operation.name = operation_name
                 operation.variables = variables
-            if error or document is None:
+            if error or cached_document is None:
                 return error
 
+            document = cached_document.document
             raw_query_string = document.document_string
             span.set_tag("graphql.query", raw_query_string)
-            span.set_tag("graphql.query_identifier", query_identifier(document))
-            span.set_tag("graphql.query_fingerprint", query_fingerprint(document))
+            span.set_tag("graphql.query_identifier", cached_document.query_identifier)
+            span.set_tag("graphql.query_fingerprint", cached_document.query_fingerprint)
             try:
                 query_contains_schema = self.check_if_query_contains_only_schema(
                     document
@@ -289,9 +400,8 @@ class GraphQLView(View):
             except GraphQLError as e:
                 return ExecutionResult(errors=[e], invalid=True)
 
-            query_cost, cost_errors = validate_query_cost(
+            query_cost, cost_errors = cached_document.get_query_cost(
                 schema,
-                document,
                 variables,
                 COST_MAP,
                 settings.GRAPHQL_QUERY_MAX_COMPLEXITY,
@@ -317,21 +427,50 @@ class GraphQLView(View):
                         key = generate_cache_key(raw_query_string)
                         response = cache.get(key)
 
+                    response_cache_key = None
                     if not response:
-                        response = document.execute(
-                            root=self.get_root_value(),
-                            variables=variables,
-                            operation_name=operation_name,
-                            context=get_context_value(request),
-                            middleware=self.middleware,
-                            **extra_options,
+                        response_cache_key = get_response_cache_key(
+                            request, cached_document, variables, operation_name
                         )
+                        if response_cache_key:
+                            response = cache.get(response_cache_key)
+
+                    profiler = None
+                    if not response:
+                        context = get_context_value(request)
+                        profiler = start_profiling(context)
+                        if validation_errors := cached_document.validate():
+                            response = ExecutionResult(
+                                errors=list(validation_errors), invalid=True
+                            )
+                        else:
+                            # Validation result is kept in the document cache,
+                            # there is no need to validate it again on execution.
+                            with profile_sql_queries(
+                                profiler
+                            ), webhook_deliveries_batch():
+                                response = document.execute(
+                                    root=self.get_root_value(),
+                                    variables=variables,
+                                    operation_name=operation_name,
+                                    context=context,
+                                    middleware=self.get_middleware(profiler),
+                                    validate=False,
+                                    **extra_options,
+                                )
                         if should_use_cache_for_scheme:
                             cache.set(key, response)
+                        elif response_cache_key and not response.errors:
+                            cache.set(
+                                response_cache_key,
+                                response,
+                                settings.GRAPHQL_RESPONSE_CACHE_TIMEOUT,
+                            )
 
                     if app := getattr(request, "app", None):
                         span.set_tag("app.name", app.name)
 
+                    set_profiling_on_result(response, profiler)
                     return set_query_cost_on_result(response, query_cost)
             except Exception as e:
                 span.set_tag(opentracing.tags.ERROR, True)
@@ -361,8 +500,14 @@ class GraphQLView(View):
         query = data.get("query")
         variables = data.get("variables")
         operation_name = data.get("operationName")
+        extensions = data.get("extensions")
         if operation_name == "null":
             operation_name = None
+        if isinstance(extensions, str):
+            try:
+                extensions = json.loads(extensions)
+            except ValueError:
+                extensions = None
 
         if request.content_type == "multipart/form-data":
             operations = json.loads(data.get("operations", "{}"))
@@ -374,6 +519,8 @@ class GraphQLView(View):
                     obj_set(operations, file_instance, file_key, False)
             query = operations.get("query")
             variables = operations.get("variables")
+            extensions = operations.get("extensions")
+        query = resolve_persisted_query(query, extensions)
         return query, variables, operation_name
 
     @classmethod
@@ -381,6 +528,44 @@ class GraphQLView(View):
         return format_error(error, cls.HANDLED_EXCEPTIONS)
 
 
+class AsyncGraphQLView(GraphQLView):
+    """GraphQL view for ASGI deployments.
+
+    Django runs synchronous views in a single thread shared by all requests
+    handled by the ASGI worker, so one slow request (e.g. waiting for the database
+    or a sync webhook) blocks all others. This view is a coroutine that runs each
+    request in its own thread from the event loop's executor, keeping many requests
+    in flight in one worker. Each thread uses its own database connection.
+
+    The view returned by `as_view` is exempt from CSRF checks, as the `csrf_exempt`
+    decorator does not support async views.
+    """
+
+    @classonlymethod
+    def as_view(cls, **initkwargs):
+        sync_view = super().as_view(**initkwargs)
+
+        async def view(request, *args, **kwargs):
+            return await sync_to_async(run_in_worker_thread, thread_sensitive=False)(
+                sync_view, request, *args, **kwargs
+            )
+
+        view.view_class = cls  # type: ignore[attr-defined]
+        view.view_initkwargs = initkwargs  # type: ignore[attr-defined]
+        view.csrf_exempt = True  # type: ignore[attr-defined]
+        update_wrapper(view, cls, updated=())
+        return view
+
+
+def run_in_worker_thread(func, *args, **kwargs):
+    """Call a function in a thread that manages its own database connections."""
+    close_old_connections()
+    try:
+        return func(*args, **kwargs)
+    finally:
+        close_old_connections()
+
+
 def get_key(key):
     try:
         int_key = int(key)
@@ -434,6 +619,20 @@ def instantiate_middleware(middlewares):
         yield middleware
 
 
+_batch_executors: Dict[int, ThreadPoolExecutor] = {}
+_batch_executors_lock = threading.Lock()
+
+
+def get_batch_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used to execute batched queries."""
+    with _batch_executors_lock:
+        if max_workers not in _batch_executors:
+            _batch_executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="graphql-batch"
+            )
+        return _batch_executors[max_workers]
+
+
 def generate_cache_key(raw_query: str) -> str:
     hashed_query = hashlib.sha256(str(raw_query).encode("utf-8")).hexdigest()
     return f"{saleor_version}-{hashed_query}"
@@ -450,3 +649,11 @@ def set_query_cost_on_result(execution_result: ExecutionResult, query_cost):
             }
         )
     return execution_result
+
+
+def set_profiling_on_result(
+    execution_result: ExecutionResult, profiler: Optional[QueryProfiler]
+):
+    if profiler is not None:
+        execution_result.extensions["profiling"] = profiler.as_dict()
+    return execution_result
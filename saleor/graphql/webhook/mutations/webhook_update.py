@@ -3,6 +3,7 @@ import graphene
 from ....permission.auth_filters import AuthorizationFilters
 from ....permission.enums import AppPermission
 from ....webhook import models
+from ....webhook.registry import invalidate_webhooks_registry
 from ....webhook.validators import HEADERS_LENGTH_LIMIT, HEADERS_NUMBER_LIMIT
 from ...app.dataloaders import get_app_promise
 from ...core import ResolveInfo
@@ -105,6 +106,7 @@ class WebhookUpdate(WebhookCreate):
                     for event in events
                 ]
             )
+            invalidate_webhooks_registry()
 
     @classmethod
     def get_instance(cls, info: ResolveInfo, **data):
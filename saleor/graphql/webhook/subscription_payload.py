@@ -4,7 +4,7 @@ from celery.utils.log import get_task_logger
 from django.conf import settings
 from django.utils import timezone
 from django.utils.functional import SimpleLazyObject
-from graphql import get_default_backend, parse
+from graphql import get_default_backend
 from graphql.error import GraphQLError
 from promise import Promise
 
@@ -12,6 +12,7 @@ from ...app.models import App
 from ...core.exceptions import PermissionDenied
 from ...settings import get_host
 from ..core import SaleorContext
+from ..core.document_cache import get_cached_document
 from ..utils import format_error
 
 logger = get_task_logger(__name__)
@@ -63,6 +64,7 @@ def generate_payload_from_subscription(
     subscription_query: Optional[str],
     request: SaleorContext,
     app: Optional[App] = None,
+    dataloaders: Optional[Dict[str, Any]] = None,
 ) -> Optional[Dict[str, Any]]:
     """Generate webhook payload from subscription query.
 
@@ -77,6 +79,9 @@ def generate_payload_from_subscription(
     dataloaders benefits.
     app: the owner of the given payload. Required in case when webhook contains
     protected fields.
+    dataloaders: dataloaders cache shared with payloads generated for other apps.
+    Results of some dataloaders depend on the app, so it should be shared only
+    between apps with the same permissions.
     return: A payload ready to send via webhook. None if the function was not able to
     generate a payload
     """
@@ -84,17 +89,29 @@ def generate_payload_from_subscription(
     from ..context import get_context_value
 
     graphql_backend = get_default_backend()
-    ast = parse(subscription_query)  # type: ignore
-    document = graphql_backend.document_from_string(
-        schema,
-        ast,
+    # Subscription queries change only when webhooks are updated, so the parsed and
+    # validated documents are kept in the same cache as API queries.
+    cached_document = get_cached_document(
+        graphql_backend, schema, subscription_query  # type: ignore[arg-type]
     )
     app_id = app.pk if app else None
+    if validation_errors := cached_document.validate():
+        logger.warning(
+            "Unable to build a payload for subscription. \n"
+            "error: %s" % str(validation_errors),
+            extra={"query": subscription_query, "app": app_id},
+        )
+        return None
+
     request.app = app
-    results = document.execute(
+    context = get_context_value(request)
+    if dataloaders is not None:
+        context.dataloaders = dataloaders
+    results = cached_document.document.execute(
         allow_subscriptions=True,
         root=(event_type, subscribable_object),
-        context=get_context_value(request),
+        context=context,
+        validate=False,
     )
     if hasattr(results, "errors"):
         logger.warning(
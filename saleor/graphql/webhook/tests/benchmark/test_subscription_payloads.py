@@ -0,0 +1,98 @@
+import pytest
+from django.db import connection
+from django.test.utils import CaptureQueriesContext
+
+from .....app.models import App
+from .....plugins.webhook.tasks import create_deliveries_for_subscriptions
+from .....webhook.event_types import WebhookEventAsyncType
+from .....webhook.models import Webhook
+
+ORDER_UPDATED_SUBSCRIPTION = """
+subscription {
+  event {
+    ... on OrderUpdated {
+      order {
+        id
+        number
+        channel {
+          slug
+        }
+        lines {
+          productName
+          quantity
+          variant {
+            id
+            sku
+            product {
+              name
+            }
+          }
+        }
+      }
+    }
+  }
+}
+"""
+
+
+@pytest.fixture
+def order_updated_webhooks_factory(db, permission_manage_orders):
+    def create_webhooks(count):
+        webhook_ids = []
+        for index in range(count):
+            app = App.objects.create(name=f"Subscriber {index}", is_active=True)
+            app.permissions.add(permission_manage_orders)
+            webhook = Webhook.objects.create(
+                name=f"Subscriber {index}",
+                app=app,
+                target_url="http://www.example.com/any",
+                subscription_query=ORDER_UPDATED_SUBSCRIPTION,
+            )
+            webhook.events.create(event_type=WebhookEventAsyncType.ORDER_UPDATED)
+            webhook_ids.append(webhook.id)
+        return list(Webhook.objects.filter(id__in=webhook_ids).select_related("app"))
+
+    return create_webhooks
+
+
+@pytest.mark.django_db
+@pytest.mark.count_queries(autouse=False)
+@pytest.mark.parametrize("subscribers_count", [1, 3, 6])
+def test_create_deliveries_for_subscriptions(
+    subscribers_count,
+    order_with_lines,
+    order_updated_webhooks_factory,
+    count_queries,
+):
+    webhooks = order_updated_webhooks_factory(subscribers_count)
+
+    deliveries = create_deliveries_for_subscriptions(
+        WebhookEventAsyncType.ORDER_UPDATED, order_with_lines, webhooks
+    )
+
+    assert len(deliveries) == subscribers_count
+
+
+def test_create_deliveries_for_subscriptions_shares_dataloaders(
+    order_with_lines, order_updated_webhooks_factory
+):
+    # given
+    event_type = WebhookEventAsyncType.ORDER_UPDATED
+    single_webhook = order_updated_webhooks_factory(1)
+    webhooks = order_updated_webhooks_factory(6)
+
+    # when
+    with CaptureQueriesContext(connection) as single_subscriber_queries:
+        create_deliveries_for_subscriptions(event_type, order_with_lines, single_webhook)
+    with CaptureQueriesContext(connection) as subscribers_queries:
+        deliveries = create_deliveries_for_subscriptions(
+            event_type, order_with_lines, webhooks
+        )
+
+    # then
+    assert len(deliveries) == len(webhooks)
+    # Only the permissions are fetched for each additional app, the order data is
+    # loaded once.
+    assert len(subscribers_queries) <= len(single_subscriber_queries) + len(
+        webhooks
+    ) - len(single_webhook)
@@ -3,6 +3,7 @@ from typing import TYPE_CHECKING, List
 from django.apps import AppConfig
 from django.conf import settings
 from django.core.exceptions import ImproperlyConfigured
+from django.db.models.signals import post_delete, post_save
 from django.utils.module_loading import import_string
 
 if TYPE_CHECKING:
@@ -19,6 +20,22 @@ class PluginConfig(AppConfig):
         for plugin_path in plugins:
             self.load_and_check_plugin(plugin_path)
 
+        self.connect_plugins_config_signals()
+
+    def connect_plugins_config_signals(self):
+        from ..channel.models import Channel
+        from .config_cache import handle_plugins_config_change
+        from .models import PluginConfiguration
+
+        # Cached plugin configurations are reloaded when these models change.
+        for model in [Channel, PluginConfiguration]:
+            for signal_name, signal in [("save", post_save), ("delete", post_delete)]:
+                signal.connect(
+                    handle_plugins_config_change,
+                    sender=model,
+                    dispatch_uid=f"plugins_config_{model.__name__}_{signal_name}",
+                )
+
     def load_and_check_plugin(self, plugin_path: str):
         try:
             plugin = import_string(plugin_path)
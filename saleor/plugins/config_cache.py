@@ -0,0 +1,215 @@
+import copy
+import uuid
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import TYPE_CHECKING, Any, DefaultDict, Dict, List, Optional, Tuple, Type
+
+import opentracing
+from django.core.cache import cache
+from django.db import transaction
+from django.utils.module_loading import import_string
+
+from ..channel.models import Channel
+from .models import PluginConfiguration
+
+if TYPE_CHECKING:
+    from .base_plugin import BasePlugin, RequestorOrLazyObject
+
+PLUGINS_CONFIG_VERSION_CACHE_KEY = "plugins-config-version"
+
+
+@dataclass(frozen=True)
+class PluginsConfig:
+    """Plugin classes, their configurations and channels used to build a manager.
+
+    Instances are shared between requests and must not be modified.
+    """
+
+    version: str
+    plugin_classes: Tuple[Type["BasePlugin"], ...]
+    global_configs: Dict[str, PluginConfiguration]
+    channel_configs: Dict[Channel, Dict[str, PluginConfiguration]]
+    channels: Tuple[Channel, ...]
+
+
+@dataclass(frozen=True)
+class PreparedPlugins:
+    """Plugins built from the configuration, not bound to any requestor.
+
+    Instances are shared between requests and must not be modified; managers use
+    copies of the plugins returned by `bind_plugin`.
+    """
+
+    version: str
+    # Plugins with the slug of their channel, or None for global plugins, in the
+    # order in which they are run.
+    plugins: Tuple[Tuple[Optional[str], "BasePlugin"], ...]
+    channel_slugs: Tuple[str, ...]
+
+
+# Loaded configurations, stored per tuple of plugin paths.
+_plugins_configs: Dict[Tuple[str, ...], PluginsConfig] = {}
+# Plugins built from the configurations, stored per tuple of plugin paths.
+_prepared_plugins: Dict[Tuple[str, ...], PreparedPlugins] = {}
+
+
+def get_plugins_config_version() -> str:
+    version = cache.get(PLUGINS_CONFIG_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(PLUGINS_CONFIG_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(PLUGINS_CONFIG_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_plugins_config_cache():
+    """Make all processes reload plugin configurations and channels.
+
+    The version is changed right away, so the current transaction sees its own
+    changes, and once again after commit, so other processes don't keep the data
+    they loaded before the transaction was committed.
+    """
+
+    def bump_version():
+        _plugins_configs.clear()
+        _prepared_plugins.clear()
+        cache.set(PLUGINS_CONFIG_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def clear_plugins_config_cache():
+    """Drop configurations loaded by the current process."""
+    _plugins_configs.clear()
+    _prepared_plugins.clear()
+
+
+def _get_db_plugin_configs():
+    with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
+        # Configurations are loaded from the default database, as a lagging replica
+        # could return configurations older than the cached version.
+        qs = PluginConfiguration.objects.all().prefetch_related("channel")
+        channel_configs: DefaultDict[Channel, Dict] = defaultdict(dict)
+        global_configs = {}
+        for db_plugin_config in qs:
+            channel = db_plugin_config.channel
+            if channel is None:
+                global_configs[db_plugin_config.identifier] = db_plugin_config
+            else:
+                channel_configs[channel][db_plugin_config.identifier] = db_plugin_config
+        return global_configs, dict(channel_configs)
+
+
+def load_plugins_config(plugins: List[str], version: str) -> PluginsConfig:
+    global_configs, channel_configs = _get_db_plugin_configs()
+    plugin_classes = []
+    for plugin_path in plugins:
+        with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
+            plugin_classes.append(import_string(plugin_path))
+    return PluginsConfig(
+        version=version,
+        plugin_classes=tuple(plugin_classes),
+        global_configs=global_configs,
+        channel_configs=channel_configs,
+        channels=tuple(Channel.objects.all()),
+    )
+
+
+def get_plugins_config(plugins: List[str]) -> PluginsConfig:
+    """Return the configuration of the given plugins.
+
+    The configuration is reused by the process until the version stored in the
+    cache changes, which happens when any `PluginConfiguration` or `Channel` is
+    saved or deleted.
+    """
+    version = get_plugins_config_version()
+    key = tuple(plugins)
+    plugins_config = _plugins_configs.get(key)
+    if plugins_config is None or plugins_config.version != version:
+        plugins_config = load_plugins_config(plugins, version)
+        _plugins_configs[key] = plugins_config
+    return plugins_config
+
+
+def load_plugin(
+    PluginClass: Type["BasePlugin"],
+    db_configs_map: Dict[str, PluginConfiguration],
+    channel: Optional[Channel] = None,
+) -> "BasePlugin":
+    db_config = None
+    if PluginClass.PLUGIN_ID in db_configs_map:
+        db_config = db_configs_map[PluginClass.PLUGIN_ID]
+        plugin_config = db_config.configuration
+        active = db_config.active
+        channel = db_config.channel
+    else:
+        plugin_config = PluginClass.DEFAULT_CONFIGURATION
+        active = PluginClass.get_default_active()
+
+    return PluginClass(
+        configuration=plugin_config,
+        active=active,
+        channel=channel,
+        db_config=db_config,
+    )
+
+
+def prepare_plugins(plugins_config: PluginsConfig) -> PreparedPlugins:
+    prepared_plugins: List[Tuple[Optional[str], "BasePlugin"]] = []
+    for PluginClass in plugins_config.plugin_classes:
+        if not getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
+            plugin = load_plugin(PluginClass, plugins_config.global_configs)
+            prepared_plugins.append((None, plugin))
+        else:
+            for channel in plugins_config.channels:
+                plugin = load_plugin(
+                    PluginClass,
+                    plugins_config.channel_configs.get(channel, {}),
+                    channel,
+                )
+                prepared_plugins.append((channel.slug, plugin))
+    return PreparedPlugins(
+        version=plugins_config.version,
+        plugins=tuple(prepared_plugins),
+        channel_slugs=tuple(channel.slug for channel in plugins_config.channels),
+    )
+
+
+def get_prepared_plugins(plugins: List[str]) -> PreparedPlugins:
+    """Return the given plugins built from their configuration.
+
+    The plugins are built once per version of the configuration, like
+    `get_plugins_config`.
+    """
+    plugins_config = get_plugins_config(plugins)
+    key = tuple(plugins)
+    prepared_plugins = _prepared_plugins.get(key)
+    if prepared_plugins is None or prepared_plugins.version != plugins_config.version:
+        prepared_plugins = prepare_plugins(plugins_config)
+        _prepared_plugins[key] = prepared_plugins
+    return prepared_plugins
+
+
+def bind_plugin(
+    plugin: "BasePlugin",
+    requestor: Optional["RequestorOrLazyObject"],
+    allow_replica: bool,
+    memo: Dict[int, Any],
+) -> "BasePlugin":
+    """Return a copy of the prepared plugin used by a single manager.
+
+    The configuration, database configuration and channel of the plugin are copied,
+    so changes made by the plugin don't leak to other managers. Objects copied for
+    one manager are shared by its plugins through `memo`.
+    """
+    bound_plugin = copy.copy(plugin)
+    bound_plugin.configuration = copy.deepcopy(plugin.configuration, memo)
+    bound_plugin.db_config = copy.deepcopy(plugin.db_config, memo)
+    bound_plugin.channel = copy.deepcopy(plugin.channel, memo)
+    bound_plugin.requestor = requestor
+    bound_plugin.allow_replica = allow_replica
+    return bound_plugin
+
+
+def handle_plugins_config_change(sender, **kwargs):
+    invalidate_plugins_config_cache()
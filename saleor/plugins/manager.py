@@ -10,14 +10,13 @@ from typing import (
     List,
     Optional,
     Tuple,
-    Type,
     Union,
 )
 
 import opentracing
 from django.conf import settings
 from django.http import HttpResponse, HttpResponseNotFound
-from django.utils.module_loading import import_string
+from django.utils.functional import SimpleLazyObject
 from graphene import Mutation
 from graphql import GraphQLError
 from graphql.execution import ExecutionResult
@@ -34,6 +33,7 @@ from ..order import base_calculations as base_order_calculations
 from ..order.interface import OrderTaxedPricesData
 from ..tax.utils import calculate_tax_rate
 from .base_plugin import ExcludedShippingMethod, ExternalAccessTokens
+from .config_cache import bind_plugin, get_prepared_plugins
 from .models import PluginConfiguration
 
 if TYPE_CHECKING:
@@ -86,89 +86,30 @@ class PluginsManager(PaymentInterface):
     plugins_per_channel: Dict[str, List["BasePlugin"]] = {}
     global_plugins: List["BasePlugin"] = []
     all_plugins: List["BasePlugin"] = []
-
-    def _load_plugin(
-        self,
-        PluginClass: Type["BasePlugin"],
-        db_configs_map: dict,
-        channel: Optional["Channel"] = None,
-        requestor_getter=None,
-        allow_replica=True,
-    ) -> "BasePlugin":
-        db_config = None
-        if PluginClass.PLUGIN_ID in db_configs_map:
-            db_config = db_configs_map[PluginClass.PLUGIN_ID]
-            plugin_config = db_config.configuration
-            active = db_config.active
-            channel = db_config.channel
-        else:
-            plugin_config = PluginClass.DEFAULT_CONFIGURATION
-            active = PluginClass.get_default_active()
-
-        return PluginClass(
-            configuration=plugin_config,
-            active=active,
-            channel=channel,
-            requestor_getter=requestor_getter,
-            db_config=db_config,
-            allow_replica=allow_replica,
-        )
+    _plugins_per_method: Dict[Tuple[str, Optional[str]], List["BasePlugin"]] = {}
 
     def __init__(self, plugins: List[str], requestor_getter=None, allow_replica=True):
         with opentracing.global_tracer().start_active_span("PluginsManager.__init__"):
             self.all_plugins = []
             self.global_plugins = []
             self.plugins_per_channel = defaultdict(list)
-
-            global_db_configs, channel_db_configs = self._get_db_plugin_configs()
-            channels = Channel.objects.all()
-
-            for plugin_path in plugins:
-                with opentracing.global_tracer().start_active_span(f"{plugin_path}"):
-                    PluginClass = import_string(plugin_path)
-                    if not getattr(PluginClass, "CONFIGURATION_PER_CHANNEL", False):
-                        plugin = self._load_plugin(
-                            PluginClass,
-                            global_db_configs,
-                            requestor_getter=requestor_getter,
-                            allow_replica=allow_replica,
-                        )
-                        self.global_plugins.append(plugin)
-                        self.all_plugins.append(plugin)
-                    else:
-                        for channel in channels:
-                            channel_configs = channel_db_configs.get(channel, {})
-                            plugin = self._load_plugin(
-                                PluginClass,
-                                channel_configs,
-                                channel,
-                                requestor_getter,
-                                allow_replica,
-                            )
-                            self.plugins_per_channel[channel.slug].append(plugin)
-                            self.all_plugins.append(plugin)
-
-            for channel in channels:
-                self.plugins_per_channel[channel.slug].extend(self.global_plugins)
-
-    def _get_db_plugin_configs(self):
-        with opentracing.global_tracer().start_active_span("_get_db_plugin_configs"):
-            qs = (
-                PluginConfiguration.objects.all()
-                .using(settings.DATABASE_CONNECTION_REPLICA_NAME)
-                .prefetch_related("channel")
-            )
-            channel_configs: DefaultDict[Channel, Dict] = defaultdict(dict)
-            global_configs = {}
-            for db_plugin_config in qs:
-                channel = db_plugin_config.channel
-                if channel is None:
-                    global_configs[db_plugin_config.identifier] = db_plugin_config
+            self._plugins_per_method = {}
+
+            # Plugins are built once per configuration version and copied for
+            # each manager, which binds them to its requestor.
+            prepared_plugins = get_prepared_plugins(plugins)
+            requestor = SimpleLazyObject(requestor_getter) if requestor_getter else None
+            memo: Dict[int, Any] = {}
+            for channel_slug, prepared_plugin in prepared_plugins.plugins:
+                plugin = bind_plugin(prepared_plugin, requestor, allow_replica, memo)
+                if channel_slug is None:
+                    self.global_plugins.append(plugin)
                 else:
-                    channel_configs[channel][
-                        db_plugin_config.identifier
-                    ] = db_plugin_config
-            return global_configs, channel_configs
+                    self.plugins_per_channel[channel_slug].append(plugin)
+                self.all_plugins.append(plugin)
+
+            for channel_slug in prepared_plugins.channel_slugs:
+                self.plugins_per_channel[channel_slug].extend(self.global_plugins)
 
     def __run_method_on_plugins(
         self,
@@ -180,13 +121,35 @@ class PluginsManager(PaymentInterface):
     ):
         """Try to run a method with the given name on each declared active plugin."""
         value = default_value
-        plugins = self.get_plugins(channel_slug=channel_slug, active_only=True)
+        plugins = self._get_plugins_with_method(method_name, channel_slug)
         for plugin in plugins:
+            if not plugin.active:
+                continue
             value = self.__run_method_on_single_plugin(
                 plugin, method_name, value, *args, **kwargs
             )
         return value
 
+    def _get_plugins_with_method(
+        self, method_name: str, channel_slug: Optional[str] = None
+    ) -> List["BasePlugin"]:
+        """Return plugins of the channel that implement the given method.
+
+        The result is computed on the first call for the method and the channel and
+        reused for the lifetime of the manager. Inactive plugins are included, as the
+        plugin can be activated after the manager is created.
+        """
+        key = (method_name, channel_slug)
+        plugins = self._plugins_per_method.get(key)
+        if plugins is None:
+            plugins = [
+                plugin
+                for plugin in self.get_plugins(channel_slug=channel_slug)
+                if getattr(plugin, method_name, NotImplemented) != NotImplemented
+            ]
+            self._plugins_per_method[key] = plugins
+        return plugins
+
     def __run_method_on_single_plugin(
         self,
         plugin: Optional["BasePlugin"],
@@ -1809,8 +1772,9 @@ class PluginsManager(PaymentInterface):
         plugins = (
             self.plugins_per_channel[channel_slug] if channel_slug else self.all_plugins
         )
-        only_active_plugins = [plugin for plugin in plugins if plugin.active]
-        return any([plugin.is_event_active(event) for plugin in only_active_plugins])
+        return any(
+            plugin.is_event_active(event) for plugin in plugins if plugin.active
+        )
 
 
 def get_plugins_manager(
@@ -0,0 +1,225 @@
+from typing import TYPE_CHECKING, Any, List
+
+from ...graphql.core.response_cache import (
+    ALL_TAGS,
+    TAG_CATEGORIES,
+    TAG_COLLECTIONS,
+    TAG_MENUS,
+    TAG_PRODUCTS,
+    invalidate_response_cache_tags,
+)
+from ..base_plugin import BasePlugin
+
+if TYPE_CHECKING:
+    from ...attribute.models import Attribute, AttributeValue
+    from ...channel.models import Channel
+    from ...discount.models import Sale
+    from ...menu.models import Menu, MenuItem
+    from ...product.models import (
+        Category,
+        Collection,
+        Product,
+        ProductMedia,
+        ProductVariant,
+    )
+    from ...translation.models import Translation
+    from ...warehouse.models import Stock
+
+
+class ResponseCachePlugin(BasePlugin):
+    """Invalidate cached GraphQL responses when the catalogue changes."""
+
+    PLUGIN_NAME = "GraphQL response cache"
+    PLUGIN_ID = "saleor.response_cache"
+    DEFAULT_ACTIVE = True
+    PLUGIN_DESCRIPTION = (
+        "Invalidate GraphQL responses shared by anonymous clients when products, "
+        "categories, collections or menus change."
+    )
+    CONFIGURATION_PER_CHANNEL = False
+
+    def attribute_updated(self, attribute: "Attribute", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def attribute_deleted(self, attribute: "Attribute", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def attribute_value_updated(
+        self, attribute_value: "AttributeValue", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def attribute_value_deleted(
+        self, attribute_value: "AttributeValue", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def category_created(self, category: "Category", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_CATEGORIES)
+        return previous_value
+
+    def category_updated(self, category: "Category", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_CATEGORIES)
+        return previous_value
+
+    def category_deleted(self, category: "Category", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_CATEGORIES, TAG_PRODUCTS)
+        return previous_value
+
+    def channel_updated(self, channel: "Channel", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(*ALL_TAGS)
+        return previous_value
+
+    def channel_deleted(self, channel: "Channel", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(*ALL_TAGS)
+        return previous_value
+
+    def channel_status_changed(self, channel: "Channel", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(*ALL_TAGS)
+        return previous_value
+
+    def collection_created(self, collection: "Collection", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_COLLECTIONS)
+        return previous_value
+
+    def collection_updated(self, collection: "Collection", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_COLLECTIONS)
+        return previous_value
+
+    def collection_deleted(self, collection: "Collection", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_COLLECTIONS)
+        return previous_value
+
+    def collection_metadata_updated(
+        self, collection: "Collection", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_COLLECTIONS)
+        return previous_value
+
+    def menu_created(self, menu: "Menu", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_MENUS)
+        return previous_value
+
+    def menu_updated(self, menu: "Menu", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_MENUS)
+        return previous_value
+
+    def menu_deleted(self, menu: "Menu", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_MENUS)
+        return previous_value
+
+    def menu_item_created(self, menu_item: "MenuItem", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_MENUS)
+        return previous_value
+
+    def menu_item_updated(self, menu_item: "MenuItem", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_MENUS)
+        return previous_value
+
+    def menu_item_deleted(self, menu_item: "MenuItem", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_MENUS)
+        return previous_value
+
+    def product_created(self, product: "Product", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_updated(self, product: "Product", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_deleted(
+        self, product: "Product", variants: List[int], previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_metadata_updated(self, product: "Product", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_media_created(self, media: "ProductMedia", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_media_updated(self, media: "ProductMedia", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_media_deleted(self, media: "ProductMedia", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_variant_created(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_variant_updated(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_variant_deleted(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_variant_metadata_updated(
+        self, product_variant: "ProductVariant", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_variant_out_of_stock(self, stock: "Stock", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def product_variant_back_in_stock(self, stock: "Stock", previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def sale_created(
+        self, sale: "Sale", current_catalogue: Any, previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def sale_updated(
+        self,
+        sale: "Sale",
+        previous_catalogue: Any,
+        current_catalogue: Any,
+        previous_value: Any,
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def sale_deleted(
+        self, sale: "Sale", previous_catalogue: Any, previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def sale_toggle(self, sale: "Sale", catalogue: Any, previous_value: Any) -> Any:
+        invalidate_response_cache_tags(TAG_PRODUCTS)
+        return previous_value
+
+    def translation_created(
+        self, translation: "Translation", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(*ALL_TAGS)
+        return previous_value
+
+    def translation_updated(
+        self, translation: "Translation", previous_value: Any
+    ) -> Any:
+        invalidate_response_cache_tags(*ALL_TAGS)
+        return previous_value
@@ -0,0 +1,81 @@
+import pytest
+from django.core.cache import cache
+
+from ....graphql.core.response_cache import (
+    TAG_COLLECTIONS,
+    TAG_PRODUCTS,
+    get_tag_versions,
+)
+from ...manager import get_plugins_manager
+from ...models import PluginConfiguration
+from ..plugin import ResponseCachePlugin
+
+
+@pytest.fixture
+def response_cache_manager(settings):
+    cache.clear()
+    settings.PLUGINS = ["saleor.plugins.response_cache.plugin.ResponseCachePlugin"]
+    yield get_plugins_manager()
+    cache.clear()
+
+
+def test_product_updated_invalidates_products_tag(
+    response_cache_manager, product, django_capture_on_commit_callbacks
+):
+    # given
+    versions = get_tag_versions([TAG_PRODUCTS, TAG_COLLECTIONS])
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        response_cache_manager.product_updated(product)
+
+    # then
+    new_versions = get_tag_versions([TAG_PRODUCTS, TAG_COLLECTIONS])
+    assert new_versions[TAG_PRODUCTS] != versions[TAG_PRODUCTS]
+    assert new_versions[TAG_COLLECTIONS] == versions[TAG_COLLECTIONS]
+
+
+def test_tags_are_invalidated_after_commit(
+    response_cache_manager, collection, django_capture_on_commit_callbacks
+):
+    # given
+    versions = get_tag_versions([TAG_COLLECTIONS])
+
+    # when
+    with django_capture_on_commit_callbacks(execute=False) as callbacks:
+        response_cache_manager.collection_updated(collection)
+
+    # then
+    assert get_tag_versions([TAG_COLLECTIONS]) == versions
+    callbacks[0]()
+    assert get_tag_versions([TAG_COLLECTIONS]) != versions
+
+
+def test_hooks_return_previous_value(product):
+    # given
+    plugin = ResponseCachePlugin(configuration=[], active=True)
+    previous_value = object()
+
+    # when
+    value = plugin.product_updated(product, previous_value)
+
+    # then
+    assert value is previous_value
+
+
+def test_plugin_deactivated_in_database_doesnt_invalidate_tags(
+    response_cache_manager, product, django_capture_on_commit_callbacks
+):
+    # given
+    PluginConfiguration.objects.create(
+        identifier=ResponseCachePlugin.PLUGIN_ID, active=False, configuration=[]
+    )
+    manager = get_plugins_manager()
+    versions = get_tag_versions([TAG_PRODUCTS])
+
+    # when
+    with django_capture_on_commit_callbacks(execute=True):
+        manager.product_updated(product)
+
+    # then
+    assert get_tag_versions([TAG_PRODUCTS]) == versions
@@ -0,0 +1,160 @@
+from unittest import mock
+
+from ..config_cache import (
+    clear_plugins_config_cache,
+    get_plugins_config,
+    invalidate_plugins_config_cache,
+)
+from ..manager import PluginsManager
+from ..models import PluginConfiguration
+from .sample_plugins import ChannelPluginSample, PluginSample
+
+PLUGINS = [
+    "saleor.plugins.tests.sample_plugins.PluginSample",
+    "saleor.plugins.tests.sample_plugins.ChannelPluginSample",
+]
+
+
+def test_get_plugins_config_is_reused(channel_USD, django_assert_num_queries):
+    # given
+    plugins_config = get_plugins_config(PLUGINS)
+
+    # when
+    with django_assert_num_queries(0):
+        cached_config = get_plugins_config(PLUGINS)
+
+    # then
+    assert cached_config is plugins_config
+    assert cached_config.plugin_classes == (PluginSample, ChannelPluginSample)
+    assert cached_config.channels == (channel_USD,)
+
+
+def test_get_plugins_config_per_plugins_list(channel_USD):
+    # when
+    plugins_config = get_plugins_config(PLUGINS)
+    other_plugins_config = get_plugins_config(PLUGINS[:1])
+
+    # then
+    assert plugins_config is not other_plugins_config
+    assert other_plugins_config.plugin_classes == (PluginSample,)
+
+
+def test_plugin_configuration_change_invalidates_config(channel_USD):
+    # given
+    plugins_config = get_plugins_config(PLUGINS)
+    assert not plugins_config.global_configs
+
+    # when
+    PluginConfiguration.objects.create(
+        identifier=PluginSample.PLUGIN_ID, active=False, configuration=[]
+    )
+
+    # then
+    plugins_config = get_plugins_config(PLUGINS)
+    assert PluginSample.PLUGIN_ID in plugins_config.global_configs
+
+
+def test_channel_change_invalidates_config(channel_USD, channel_PLN):
+    # given
+    plugins_config = get_plugins_config(PLUGINS)
+    assert len(plugins_config.channels) == 2
+
+    # when
+    channel_PLN.delete()
+
+    # then
+    plugins_config = get_plugins_config(PLUGINS)
+    assert plugins_config.channels == (channel_USD,)
+
+
+def test_invalidate_plugins_config_cache(channel_USD):
+    # given
+    plugins_config = get_plugins_config(PLUGINS)
+
+    # when
+    invalidate_plugins_config_cache()
+
+    # then
+    assert get_plugins_config(PLUGINS) is not plugins_config
+
+
+def test_clear_plugins_config_cache(channel_USD):
+    # given
+    plugins_config = get_plugins_config(PLUGINS)
+
+    # when
+    clear_plugins_config_cache()
+
+    # then
+    assert get_plugins_config(PLUGINS) is not plugins_config
+
+
+def test_managers_share_config_but_not_plugins(channel_USD, django_assert_num_queries):
+    # given
+    manager = PluginsManager(plugins=PLUGINS)
+
+    # when
+    with django_assert_num_queries(0):
+        other_manager = PluginsManager(plugins=PLUGINS)
+
+    # then
+    assert len(other_manager.all_plugins) == len(manager.all_plugins) == 2
+    for plugin, other_plugin in zip(manager.all_plugins, other_manager.all_plugins):
+        assert plugin is not other_plugin
+        assert plugin.configuration is not other_plugin.configuration
+
+
+def test_managers_reuse_prepared_plugins(channel_USD):
+    # given
+    PluginsManager(plugins=PLUGINS)
+
+    # when
+    with mock.patch("saleor.plugins.config_cache.load_plugin") as mocked_load_plugin:
+        manager = PluginsManager(plugins=PLUGINS)
+
+    # then
+    mocked_load_plugin.assert_not_called()
+    assert [type(plugin) for plugin in manager.all_plugins] == [
+        PluginSample,
+        ChannelPluginSample,
+    ]
+    assert manager.plugins_per_channel[channel_USD.slug] == [
+        manager.all_plugins[1],
+        manager.all_plugins[0],
+    ]
+
+
+def test_managers_bind_plugins_to_own_requestor(channel_USD, staff_user, app):
+    # when
+    manager = PluginsManager(plugins=PLUGINS, requestor_getter=lambda: staff_user)
+    other_manager = PluginsManager(plugins=PLUGINS, requestor_getter=lambda: app)
+
+    # then
+    assert all(plugin.requestor == staff_user for plugin in manager.all_plugins)
+    assert all(plugin.requestor == app for plugin in other_manager.all_plugins)
+
+
+def test_plugin_changes_dont_leak_to_other_managers(channel_USD):
+    # given
+    PluginConfiguration.objects.create(
+        identifier=ChannelPluginSample.PLUGIN_ID,
+        channel=channel_USD,
+        active=True,
+        configuration=[{"name": "input-per-channel", "value": "value"}],
+    )
+    manager = PluginsManager(plugins=PLUGINS)
+    plugin = manager.plugins_per_channel[channel_USD.slug][0]
+
+    # when
+    plugin.configuration[0]["value"] = "changed"
+    plugin.db_config.configuration[0]["value"] = "changed"
+    plugin.channel.name = "Changed"
+
+    # then
+    other_plugin = PluginsManager(plugins=PLUGINS).plugins_per_channel[
+        channel_USD.slug
+    ][0]
+    assert other_plugin.configuration[0]["value"] == "value"
+    assert other_plugin.db_config.configuration[0]["value"] == "value"
+    assert other_plugin.channel.name == channel_USD.name
+    assert plugin.channel is plugin.db_config.channel
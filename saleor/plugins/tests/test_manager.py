@@ -971,7 +971,7 @@ def test_run_method_on_plugins_only_on_active_ones(
     mocked_method, channel_USD, all_plugins_manager
 ):
     all_plugins_manager._PluginsManager__run_method_on_plugins(
-        method_name="test_method_name",
+        method_name="token_is_required_as_payment_input",
         default_value="default_value",
     )
     active_plugins_count = len(ACTIVE_PLUGINS)
@@ -1013,7 +1013,7 @@ def test_run_method_on_plugins_only_for_given_channel(
 
     # when
     plugins_manager._PluginsManager__run_method_on_plugins(
-        method_name="test_method",
+        method_name="token_is_required_as_payment_input",
         default_value=default_value,
         channel_slug=channel_USD.slug,
     )
@@ -1026,6 +1026,64 @@ def test_run_method_on_plugins_only_for_given_channel(
     assert called_plugins_id == {usd_plugin_1.PLUGIN_ID, usd_plugin_2.PLUGIN_ID}
 
 
+@mock.patch(
+    "saleor.plugins.manager.PluginsManager._PluginsManager__run_method_on_single_plugin"
+)
+def test_run_method_on_plugins_skips_plugins_without_method(
+    mocked_run_on_single_plugin, channel_USD, all_plugins_manager
+):
+    # when
+    value = all_plugins_manager._PluginsManager__run_method_on_plugins(
+        method_name="test_method",
+        default_value="default",
+    )
+
+    # then
+    assert value == "default"
+    mocked_run_on_single_plugin.assert_not_called()
+
+
+def test_run_method_on_plugins_reuses_plugins_with_method(
+    channel_USD, all_plugins_manager
+):
+    # given
+    expected = ActiveDummyPaymentGateway.SUPPORTED_CURRENCIES
+
+    # when
+    with patch.object(
+        all_plugins_manager, "get_plugins", wraps=all_plugins_manager.get_plugins
+    ) as mocked_get_plugins:
+        for _ in range(100):
+            value = all_plugins_manager._PluginsManager__run_method_on_plugins(
+                method_name="get_supported_currencies",
+                default_value="default_value",
+            )
+
+    # then
+    assert value == expected
+    mocked_get_plugins.assert_called_once_with(channel_slug=None)
+
+
+def test_run_method_on_plugins_plugin_activated_after_first_call(
+    channel_USD, all_plugins_manager
+):
+    # given
+    method_name = "get_supported_currencies"
+    all_plugins_manager._PluginsManager__run_method_on_plugins(
+        method_name=method_name, default_value="default_value"
+    )
+    plugin = all_plugins_manager.get_plugin(InactivePaymentGateway.PLUGIN_ID)
+    plugin.active = True
+
+    # when
+    value = all_plugins_manager._PluginsManager__run_method_on_plugins(
+        method_name=method_name, default_value="default_value"
+    )
+
+    # then
+    assert value == InactivePaymentGateway.SUPPORTED_CURRENCIES
+
+
 def test_run_method_on_single_plugin_method_does_not_exist(plugins_manager):
     default_value = "default_value"
     method_name = "method_does_not_exist"
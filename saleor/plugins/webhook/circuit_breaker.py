@@ -0,0 +1,172 @@
+import hashlib
+import math
+import time
+import uuid
+from typing import TYPE_CHECKING, Optional
+
+from django.conf import settings
+from django.core.cache import cache
+
+from ...webhook.event_types import WebhookEventSyncType
+
+if TYPE_CHECKING:
+    from .tasks import WebhookResponse
+
+# Sync events with a fallback when the app doesn't respond, eg. taxes are calculated
+# by another tax app or the flat rates and shipping methods of the app are skipped.
+CIRCUIT_BREAKER_EVENTS = {
+    WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES,
+    WebhookEventSyncType.ORDER_CALCULATE_TAXES,
+    WebhookEventSyncType.SHIPPING_LIST_METHODS_FOR_CHECKOUT,
+    WebhookEventSyncType.CHECKOUT_FILTER_SHIPPING_METHODS,
+    WebhookEventSyncType.ORDER_FILTER_SHIPPING_METHODS,
+}
+
+CIRCUIT_BREAKER_CACHE_KEY_PREFIX = "webhook-circuit-breaker"
+
+# Number of the latest response durations used to compute the timeout of a target.
+LATENCY_SAMPLES_SIZE = 100
+# Timeouts are adapted only when enough responses of the target were observed.
+LATENCY_MIN_SAMPLES = 20
+# Samples of targets without responses in this period are dropped.
+LATENCY_SAMPLES_TIMEOUT = 60 * 60
+
+
+def get_target_key(target_url: str) -> str:
+    return hashlib.sha256(target_url.encode("utf-8")).hexdigest()
+
+
+def get_latency_samples_key(target_url: str) -> str:
+    return f"{CIRCUIT_BREAKER_CACHE_KEY_PREFIX}:{get_target_key(target_url)}:latencies"
+
+
+class CircuitBreaker:
+    """Stop sending requests to a webhook target which keeps failing.
+
+    Requests and failures of each target are counted in windows of
+    `WEBHOOK_CIRCUIT_BREAKER_WINDOW` seconds. When the rate of failures in the
+    current window reaches `WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE`, the circuit is
+    opened and requests fail without being sent for
+    `WEBHOOK_CIRCUIT_BREAKER_COOLDOWN` seconds. Then a single request is let through
+    to probe the target; its success closes the circuit, its failure keeps it open
+    for another cooldown. Responses of other requests, sent before the circuit was
+    opened, don't change its state.
+
+    The state is stored in the cache, so it's shared by all processes.
+    """
+
+    def __init__(self, target_url: str):
+        self.target_key = get_target_key(target_url)
+        key = f"{CIRCUIT_BREAKER_CACHE_KEY_PREFIX}:{self.target_key}"
+        self.open_until_key = f"{key}:open-until"
+        self.probe_key = f"{key}:probe"
+        window = int(time.time() // settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW)
+        self.requests_key = f"{key}:{window}:requests"
+        self.failures_key = f"{key}:{window}:failures"
+        # Set when the request of this instance was let through as the probe.
+        self.probe_token: Optional[str] = None
+
+    @staticmethod
+    def is_enabled(event_type: str) -> bool:
+        return (
+            settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE > 0
+            and event_type in CIRCUIT_BREAKER_EVENTS
+        )
+
+    def allow_request(self) -> bool:
+        open_until = cache.get(self.open_until_key)
+        if open_until is None:
+            return True
+        if time.time() < open_until:
+            return False
+        # The cooldown has passed, let a single request probe the target.
+        probe_token = uuid.uuid4().hex
+        if not cache.add(
+            self.probe_key, probe_token, timeout=settings.WEBHOOK_SYNC_TIMEOUT + 1
+        ):
+            return False
+        self.probe_token = probe_token
+        return True
+
+    def record_response(self, response: "WebhookResponse"):
+        failed = response.response_status_code is None or (
+            response.response_status_code >= 500
+        )
+        if cache.get(self.open_until_key) is not None:
+            # Only the response of the probe opens or closes the circuit again.
+            if self.probe_token and cache.get(self.probe_key) == self.probe_token:
+                if failed:
+                    self._open()
+                else:
+                    self._close()
+            return
+
+        requests_count = self._increment(self.requests_key)
+        if not failed:
+            return
+        failures_count = self._increment(self.failures_key)
+        if (
+            requests_count >= settings.WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS
+            and failures_count / requests_count
+            >= settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE
+        ):
+            self._open()
+
+    def _increment(self, key: str) -> int:
+        cache.add(key, 0, timeout=settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW * 2)
+        try:
+            return cache.incr(key)
+        except ValueError:
+            # The key expired between the calls.
+            cache.add(key, 1, timeout=settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW * 2)
+            return 1
+
+    def _open(self):
+        cooldown = settings.WEBHOOK_CIRCUIT_BREAKER_COOLDOWN
+        # The state is kept after the cooldown, so the next request is the probe.
+        # If no request comes for another cooldown, the circuit closes.
+        cache.set(self.open_until_key, time.time() + cooldown, timeout=cooldown * 2)
+        cache.delete(self.probe_key)
+
+    def _close(self):
+        cache.delete_many(
+            [
+                self.open_until_key,
+                self.probe_key,
+                self.requests_key,
+                self.failures_key,
+            ]
+        )
+
+
+def record_webhook_latency(target_url: str, duration: float):
+    """Store the response duration of the target.
+
+    Requests which timed out are recorded with the timeout as the duration, so the
+    timeout grows back when the target slows down. The samples are stored in the
+    cache and shared by all processes; samples recorded concurrently by other
+    processes may be overwritten, which only makes the percentile less precise.
+    """
+    if settings.WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER <= 0:
+        return
+    key = get_latency_samples_key(target_url)
+    samples = cache.get(key, [])
+    samples.append(duration)
+    cache.set(key, samples[-LATENCY_SAMPLES_SIZE:], timeout=LATENCY_SAMPLES_TIMEOUT)
+
+
+def get_webhook_timeout(target_url: str, timeout: float) -> float:
+    """Return the timeout adapted to the latency observed for the target.
+
+    The timeout is the 99th percentile of the latest response durations multiplied
+    by `WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER`, but not lower than
+    `WEBHOOK_ADAPTIVE_TIMEOUT_MIN` and not higher than the given timeout.
+    """
+    multiplier = settings.WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER
+    if multiplier <= 0:
+        return timeout
+    samples = sorted(cache.get(get_latency_samples_key(target_url), []))
+    if len(samples) < LATENCY_MIN_SAMPLES:
+        return timeout
+    p99 = samples[math.ceil(len(samples) * 0.99) - 1]
+    return min(timeout, max(settings.WEBHOOK_ADAPTIVE_TIMEOUT_MIN, p99 * multiplier))
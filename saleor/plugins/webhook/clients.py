@@ -0,0 +1,140 @@
+import threading
+import time
+from collections import OrderedDict
+from http.cookiejar import DefaultCookiePolicy
+from typing import Any, Callable, Hashable, List, Optional, Tuple
+
+import boto3
+import requests
+from django.conf import settings
+from google.cloud import pubsub_v1
+from requests.adapters import HTTPAdapter
+
+
+class ClientsPool:
+    """Process-local pool of clients reused between webhook deliveries.
+
+    Clients are stored per key, e.g. target host. When the pool is full, the least
+    recently used client is closed and dropped. Clients not used for longer than
+    `idle_timeout` seconds are closed and created again on the next use.
+    """
+
+    def __init__(self, max_size: int, idle_timeout: float):
+        self.max_size = max_size
+        self.idle_timeout = idle_timeout
+        self._clients: "OrderedDict[Hashable, Tuple[Any, float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._clients)
+
+    def get(self, key: Hashable, factory: Callable[[], Any]) -> Any:
+        with self._lock:
+            closed_clients = self._evict_idle(time.monotonic())
+            client = None
+            if key in self._clients:
+                client, _ = self._clients.pop(key)
+                self._clients[key] = (client, time.monotonic())
+        if client is None:
+            # Clients are created without holding the lock, so creating a slow
+            # client doesn't block getting others.
+            client = factory()
+            with self._lock:
+                if key in self._clients:
+                    # Another thread created the client in the meantime.
+                    closed_clients.append(client)
+                    client, _ = self._clients.pop(key)
+                self._clients[key] = (client, time.monotonic())
+                while len(self._clients) > self.max_size:
+                    _, (evicted_client, _) = self._clients.popitem(last=False)
+                    closed_clients.append(evicted_client)
+        for closed_client in closed_clients:
+            _close_client(closed_client)
+        return client
+
+    def clear(self):
+        with self._lock:
+            clients = [client for client, _ in self._clients.values()]
+            self._clients.clear()
+        for client in clients:
+            _close_client(client)
+
+    def _evict_idle(self, now: float) -> List[Any]:
+        # Clients are ordered from the least recently used one.
+        evicted_clients = []
+        while self._clients:
+            key, (client, last_used) = next(iter(self._clients.items()))
+            if now - last_used <= self.idle_timeout:
+                break
+            del self._clients[key]
+            evicted_clients.append(client)
+        return evicted_clients
+
+
+def _close_client(client):
+    close = getattr(client, "close", None)
+    if callable(close):
+        try:
+            close()
+        except Exception:
+            pass
+
+
+http_sessions = ClientsPool(
+    max_size=settings.WEBHOOK_CLIENTS_POOL_SIZE,
+    idle_timeout=settings.WEBHOOK_CLIENTS_IDLE_TIMEOUT,
+)
+sqs_clients = ClientsPool(
+    max_size=settings.WEBHOOK_CLIENTS_POOL_SIZE,
+    idle_timeout=settings.WEBHOOK_CLIENTS_IDLE_TIMEOUT,
+)
+pubsub_clients = ClientsPool(
+    max_size=settings.WEBHOOK_CLIENTS_POOL_SIZE,
+    idle_timeout=settings.WEBHOOK_CLIENTS_IDLE_TIMEOUT,
+)
+
+
+def _create_http_session() -> requests.Session:
+    session = requests.Session()
+    # Sessions are shared by deliveries of different webhooks to the same host, so
+    # cookies set by responses must not be sent with other requests.
+    session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+    adapter = HTTPAdapter(
+        pool_connections=1, pool_maxsize=settings.WEBHOOK_HTTP_POOL_MAXSIZE
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def get_http_session(scheme: str, netloc: str) -> requests.Session:
+    """Return the session keeping alive connections to the given host."""
+    return http_sessions.get((scheme.lower(), netloc.lower()), _create_http_session)
+
+
+def get_sqs_client(
+    region: str, access_key_id: Optional[str], secret_access_key: Optional[str]
+):
+    """Return the SQS client for the given region and credentials."""
+
+    def create_client():
+        return boto3.client(
+            "sqs",
+            region_name=region,
+            aws_access_key_id=access_key_id,
+            aws_secret_access_key=secret_access_key,
+        )
+
+    return sqs_clients.get((region, access_key_id, secret_access_key), create_client)
+
+
+def get_pubsub_client(topic_name: str) -> pubsub_v1.PublisherClient:
+    """Return the Pub/Sub publisher used for the given topic."""
+    return pubsub_clients.get(topic_name, lambda: pubsub_v1.PublisherClient())
+
+
+def clear_webhook_clients():
+    """Close all clients pooled by the current process."""
+    http_sessions.clear()
+    sqs_clients.clear()
+    pubsub_clients.clear()
@@ -1,26 +1,46 @@
 import json
 import logging
+import threading
+import time
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures import TimeoutError as FutureTimeoutError
+from contextlib import contextmanager
 from dataclasses import dataclass
+from datetime import timedelta
 from enum import Enum
 from json import JSONDecodeError
-from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple, TypeVar
+from typing import (
+    TYPE_CHECKING,
+    Any,
+    Callable,
+    DefaultDict,
+    Dict,
+    FrozenSet,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    TypeVar,
+)
 from urllib.parse import unquote, urlparse, urlunparse
 
-import boto3
-import requests
+import opentracing
 from botocore.exceptions import ClientError
 from celery import group
 from celery.exceptions import MaxRetriesExceededError, Retry
 from celery.utils.log import get_task_logger
 from django.conf import settings
+from django.db import transaction
 from django.urls import reverse
+from django.utils import timezone
 from google.cloud import pubsub_v1
-from requests.exceptions import RequestException
+from requests.exceptions import RequestException, Timeout
 
 from ...app.headers import AppHeaders, DeprecatedAppHeaders
 from ...celeryconf import app
 from ...core import EventDeliveryStatus
-from ...core.models import EventDelivery, EventPayload
+from ...core.models import EventDelivery, EventDeliveryAttempt, EventPayload
 from ...core.tracing import webhooks_opentracing_trace
 from ...core.utils import build_absolute_uri
 from ...core.utils.events import call_event
@@ -43,14 +63,24 @@ from ...webhook.observability import WebhookData
 from ...webhook.payloads import generate_transaction_action_request_payload
 from ...webhook.utils import get_webhooks_for_event
 from . import signature_for_payload
+from .circuit_breaker import (
+    CIRCUIT_BREAKER_EVENTS,
+    CircuitBreaker,
+    get_webhook_timeout,
+    record_webhook_latency,
+)
+from .clients import get_http_session, get_pubsub_client, get_sqs_client
 from .utils import (
+    ATTEMPT_RESPONSE_FIELDS,
     attempt_update,
     catch_duration_time,
     clear_successful_delivery,
     create_attempt,
     create_event_delivery_list_for_webhooks,
+    delete_unused_event_payloads,
     delivery_update,
     get_delivery_for_webhook,
+    set_attempt_response,
 )
 
 if TYPE_CHECKING:
@@ -97,9 +127,13 @@ def create_deliveries_for_subscriptions(
         )
         return []
 
-    event_payloads = []
-    event_deliveries = []
+    payloads = []
+    payload_webhooks = []
+    # Apps with the same permissions see the same data, so payloads generated for
+    # them share the dataloaders cache.
+    dataloaders_per_permissions: Dict[FrozenSet[str], dict] = defaultdict(dict)
     for webhook in webhooks:
+        app_permissions = frozenset(webhook.app.get_permissions())
         data = generate_payload_from_subscription(
             event_type=event_type,
             subscribable_object=subscribable_object,
@@ -108,6 +142,7 @@ def create_deliveries_for_subscriptions(
                 requestor, event_type in WebhookEventSyncType.ALL, event_type=event_type
             ),
             app=webhook.app,
+            dataloaders=dataloaders_per_permissions[app_permissions],
         )
         if not data:
             logger.info(
@@ -115,18 +150,21 @@ def create_deliveries_for_subscriptions(
             )
             continue
 
-        event_payload = EventPayload(payload=json.dumps({**data}))
-        event_payloads.append(event_payload)
-        event_deliveries.append(
-            EventDelivery(
-                status=EventDeliveryStatus.PENDING,
-                event_type=event_type,
-                payload=event_payload,
-                webhook=webhook,
-            )
-        )
+        payloads.append(json.dumps({**data}))
+        payload_webhooks.append(webhook)
 
-    EventPayload.objects.bulk_create(event_payloads)
+    if not payloads:
+        return []
+    event_payloads = EventPayload.objects.get_or_create_payloads(payloads)
+    event_deliveries = [
+        EventDelivery(
+            status=EventDeliveryStatus.PENDING,
+            event_type=event_type,
+            payload=event_payload,
+            webhook=webhook,
+        )
+        for event_payload, webhook in zip(event_payloads, payload_webhooks)
+    ]
     return EventDelivery.objects.bulk_create(event_deliveries)
 
 
@@ -170,7 +208,7 @@ def create_delivery_for_subscription_sync_event(
         raise PaymentError(
             f"No payload was generated with subscription for event: {event_type}"
         )
-    event_payload = EventPayload.objects.create(payload=json.dumps({**data}))
+    event_payload = EventPayload.objects.get_or_create_payload(json.dumps({**data}))
     event_delivery = EventDelivery.objects.create(
         status=EventDeliveryStatus.PENDING,
         event_type=event_type,
@@ -195,7 +233,7 @@ def trigger_webhooks_async(
     deliveries = []
 
     if regular_webhooks:
-        payload = EventPayload.objects.create(payload=data)
+        payload = EventPayload.objects.get_or_create_payload(data)
         deliveries.extend(
             create_event_delivery_list_for_webhooks(
                 webhooks=regular_webhooks,
@@ -213,8 +251,7 @@ def trigger_webhooks_async(
             )
         )
 
-    for delivery in deliveries:
-        send_webhook_request_async.delay(delivery.id)
+    send_webhook_requests(deliveries)
 
 
 def group_webhooks_by_subscription(webhooks):
@@ -246,7 +283,7 @@ def trigger_webhook_sync(
         if not delivery:
             return None
     else:
-        event_payload = EventPayload.objects.create(payload=payload)
+        event_payload = EventPayload.objects.get_or_create_payload(payload)
         delivery = EventDelivery.objects.create(
             status=EventDeliveryStatus.PENDING,
             event_type=event_type,
@@ -279,42 +316,68 @@ def trigger_all_webhooks_sync(
     the next one is send.
     If no webhook responds with expected response,
     this function returns None.
+
+    With `WEBHOOK_SYNC_MAX_WORKERS` greater than 1, requests to all webhooks are
+    sent concurrently and the expected response of the first webhook is returned.
     """
     webhooks = get_webhooks_for_event(event_type)
+    max_workers = settings.WEBHOOK_SYNC_MAX_WORKERS
     request_context = None
     event_payload = None
-    for webhook in webhooks:
-        if webhook.subscription_query:
-            if request_context is None:
-                request_context = initialize_request(
-                    requestor,
-                    event_type in WebhookEventSyncType.ALL,
-                    allow_replica,
+    deliveries: List[Tuple[str, EventDelivery]] = []
+    with opentracing.global_tracer().start_active_span(
+        "webhooks.sync.wait"
+    ) as scope:
+        span = scope.span
+        span.set_tag(opentracing.tags.COMPONENT, "webhooks")
+        span.set_tag("webhooks.event_type", event_type)
+        span.set_tag(
+            "webhooks.execution_mode",
+            "concurrent" if max_workers > 1 else "sequential",
+        )
+        for webhook in webhooks:
+            if webhook.subscription_query:
+                if request_context is None:
+                    request_context = initialize_request(
+                        requestor,
+                        event_type in WebhookEventSyncType.ALL,
+                        allow_replica,
+                        event_type=event_type,
+                    )
+
+                delivery = create_delivery_for_subscription_sync_event(
+                    event_type=event_type,
+                    subscribable_object=subscribable_object,
+                    webhook=webhook,
+                    request=request_context,
+                    requestor=requestor,
+                )
+                if not delivery:
+                    return None
+            else:
+                if event_payload is None:
+                    event_payload = EventPayload.objects.get_or_create_payload(
+                        generate_payload()
+                    )
+                delivery = EventDelivery.objects.create(
+                    status=EventDeliveryStatus.PENDING,
                     event_type=event_type,
+                    payload=event_payload,
+                    webhook=webhook,
                 )
 
-            delivery = create_delivery_for_subscription_sync_event(
-                event_type=event_type,
-                subscribable_object=subscribable_object,
-                webhook=webhook,
-                request=request_context,
-                requestor=requestor,
+            deliveries.append((webhook.app.name, delivery))
+            span.set_tag("webhooks.count", len(deliveries))
+            if max_workers > 1:
+                continue
+            response_data = send_webhook_request_sync(webhook.app.name, delivery)
+            if parsed_response := parse_response(response_data):
+                return parsed_response
+
+        if max_workers > 1 and deliveries:
+            return send_webhook_requests_sync_concurrently(
+                deliveries, parse_response, max_workers
             )
-            if not delivery:
-                return None
-        else:
-            if event_payload is None:
-                event_payload = EventPayload.objects.create(payload=generate_payload())
-            delivery = EventDelivery.objects.create(
-                status=EventDeliveryStatus.PENDING,
-                event_type=event_type,
-                payload=event_payload,
-                webhook=webhook,
-            )
-
-        response_data = send_webhook_request_sync(webhook.app.name, delivery)
-        if parsed_response := parse_response(response_data):
-            return parsed_response
     return None
 
 
@@ -354,8 +417,10 @@ def send_webhook_using_http(
     if custom_headers:
         headers.update(custom_headers)
 
+    parts = urlparse(target_url)
     try:
-        response = requests.post(
+        session = get_http_session(parts.scheme, parts.netloc)
+        response = session.post(
             target_url, data=message, headers=headers, timeout=timeout
         )
     except RequestException as e:
@@ -372,6 +437,7 @@ def send_webhook_using_http(
                 content=str(e),
                 status=EventDeliveryStatus.FAILED,
                 request_headers=headers,
+                duration=timeout if isinstance(e, Timeout) else 0.0,
             )
         return result
 
@@ -395,13 +461,10 @@ def send_webhook_using_aws_sqs(
     hostname_parts = parts.hostname.split(".")
     if len(hostname_parts) == 4 and hostname_parts[0] == "sqs":
         region = hostname_parts[1]
-    client = boto3.client(
-        "sqs",
-        region_name=region,
-        aws_access_key_id=parts.username,
-        aws_secret_access_key=(
-            unquote(parts.password) if parts.password else parts.password
-        ),
+    client = get_sqs_client(
+        region,
+        parts.username,
+        unquote(parts.password) if parts.password else parts.password,
     )
     queue_url = urlunparse(
         (
@@ -450,8 +513,8 @@ def send_webhook_using_google_cloud_pubsub(
     target_url, message, domain, signature, event_type, **kwargs
 ):
     parts = urlparse(target_url)
-    client = pubsub_v1.PublisherClient()
     topic_name = parts.path[1:]  # drop the leading slash
+    client = get_pubsub_client(topic_name)
     with catch_duration_time() as duration:
         try:
             future = client.publish(
@@ -557,7 +620,7 @@ def send_webhook_request_async(self, event_delivery_id):
             raise ValueError(
                 "Event delivery id: %r has no payload." % event_delivery_id
             )
-        data = delivery.payload.payload
+        data = delivery.payload.get_payload()
         with webhooks_opentracing_trace(
             delivery.event_type, domain, app_name=webhook.app.name
         ):
@@ -591,15 +654,185 @@ def send_webhook_request_async(self, event_delivery_id):
     clear_successful_delivery(delivery)
 
 
-def _send_webhook_request_sync(
-    app_name, delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
-) -> Tuple[WebhookResponse, Optional[Dict[Any, Any]]]:
-    event_payload = delivery.payload
-    data = event_payload.payload
+@app.task(
+    queue=settings.WEBHOOK_CELERY_QUEUE_NAME,
+    bind=True,
+)
+def send_webhook_requests_async(self, event_delivery_ids):
+    """Send many async webhook deliveries in a single task.
+
+    Attempts and statuses of the deliveries are written in bulk. Failed deliveries
+    are retried by separate `send_webhook_request_async` tasks.
+    """
+    deliveries = list(
+        EventDelivery.objects.select_related("payload", "webhook__app")
+        .filter(id__in=event_delivery_ids)
+        .order_by("pk")
+    )
+    inactive_deliveries = [
+        delivery for delivery in deliveries if not delivery.webhook.is_active
+    ]
+    for delivery in inactive_deliveries:
+        delivery.status = EventDeliveryStatus.FAILED
+        logger.info("Event delivery id: %r webhook is disabled.", delivery.id)
+    deliveries = [delivery for delivery in deliveries if delivery.webhook.is_active]
+
+    domain = Site.objects.get_current().domain
+    attempts = EventDeliveryAttempt.objects.bulk_create(
+        [
+            EventDeliveryAttempt(
+                delivery=delivery,
+                task_id=self.request.id,
+                status=EventDeliveryStatus.PENDING,
+            )
+            for delivery in deliveries
+        ]
+    )
+    retry_countdown = send_webhook_request_async.retry_backoff
+    failed_delivery_ids = []
+    for delivery, attempt in zip(deliveries, attempts):
+        webhook = delivery.webhook
+        if not delivery.payload:
+            response = WebhookResponse(
+                content="Event delivery id: %r has no payload." % delivery.id,
+                status=EventDeliveryStatus.FAILED,
+            )
+            delivery.status = EventDeliveryStatus.FAILED
+        else:
+            try:
+                with webhooks_opentracing_trace(
+                    delivery.event_type, domain, app_name=webhook.app.name
+                ):
+                    response = send_webhook_using_scheme_method(
+                        webhook.target_url,
+                        domain,
+                        webhook.secret_key,
+                        delivery.event_type,
+                        delivery.payload.get_payload(),
+                        webhook.custom_headers,
+                    )
+            except ValueError as e:
+                # Deliveries which can't be sent, e.g. to an unknown scheme, aren't
+                # retried, the same as in `send_webhook_request_async`.
+                response = WebhookResponse(
+                    content=str(e), status=EventDeliveryStatus.FAILED
+                )
+                delivery.status = EventDeliveryStatus.FAILED
+            except Exception as e:
+                # Errors of a single delivery don't stop sending the others.
+                logger.exception("Failed to send event delivery id: %r.", delivery.id)
+                response = WebhookResponse(
+                    content=str(e), status=EventDeliveryStatus.FAILED
+                )
+                failed_delivery_ids.append(delivery.id)
+            else:
+                if response.status == EventDeliveryStatus.FAILED:
+                    failed_delivery_ids.append(delivery.id)
+                else:
+                    delivery.status = response.status
+        set_attempt_response(attempt, response)
+
+    EventDeliveryAttempt.objects.bulk_update(attempts, ATTEMPT_RESPONSE_FIELDS)
+    EventDelivery.objects.bulk_update(
+        inactive_deliveries + deliveries, ["status"], batch_size=1000
+    )
+
+    next_retry = timezone.now() + timedelta(seconds=retry_countdown)
+    for attempt in attempts:
+        is_retried = attempt.delivery_id in failed_delivery_ids
+        observability.report_event_delivery_attempt(
+            attempt, next_retry if is_retried else None
+        )
+    # The attempt made here counts as the first one, so failed deliveries are retried
+    # as many times as the ones sent by `send_webhook_request_async`.
+    for delivery_id in failed_delivery_ids:
+        send_webhook_request_async.apply_async(
+            (delivery_id,), countdown=retry_countdown, retries=1
+        )
+
+    successful_deliveries = [
+        delivery
+        for delivery in deliveries
+        if delivery.status == EventDeliveryStatus.SUCCESS
+    ]
+    if successful_deliveries:
+        payload_ids = {delivery.payload_id for delivery in successful_deliveries}
+        EventDelivery.objects.filter(
+            id__in=[delivery.id for delivery in successful_deliveries]
+        ).delete()
+        delete_unused_event_payloads(
+            payload_ids,
+            max(delivery.created_at for delivery in successful_deliveries),
+        )
+
+
+class PendingWebhookDeliveries(threading.local):
+    def __init__(self):
+        # Delivery ids per target host.
+        self.delivery_ids: DefaultDict[str, List[int]] = defaultdict(list)
+        self.batch_depth = 0
+
+
+pending_webhook_deliveries = PendingWebhookDeliveries()
+
+
+def send_webhook_requests(deliveries: Iterable[EventDelivery]):
+    """Schedule sending of async webhook deliveries.
+
+    With `WEBHOOK_ASYNC_BATCH_SIZE` set, deliveries are collected until the
+    transaction is committed, or until the outermost `webhook_deliveries_batch`
+    block exits, and sent in batches.
+    """
+    if not settings.WEBHOOK_ASYNC_BATCH_SIZE:
+        for delivery in deliveries:
+            send_webhook_request_async.delay(delivery.id)
+        return
+
+    for delivery in deliveries:
+        target = urlparse(delivery.webhook.target_url).netloc
+        pending_webhook_deliveries.delivery_ids[target].append(delivery.id)
+    if not pending_webhook_deliveries.batch_depth:
+        # Every call registers the callback, as callbacks of a rolled back
+        # transaction are dropped. The first callback sends all pending deliveries.
+        transaction.on_commit(flush_webhook_requests)
+
+
+def flush_webhook_requests():
+    """Enqueue pending webhook deliveries, in chunks per target host."""
+    pending_ids = pending_webhook_deliveries.delivery_ids
+    if not pending_ids:
+        return
+    batch_size = settings.WEBHOOK_ASYNC_BATCH_SIZE
+    tasks = []
+    for delivery_ids in pending_ids.values():
+        for index in range(0, len(delivery_ids), batch_size):
+            chunk = delivery_ids[index : index + batch_size]
+            tasks.append(send_webhook_requests_async.s(chunk))
+    pending_ids.clear()
+    group(tasks).apply_async()
+
+
+@contextmanager
+def webhook_deliveries_batch():
+    """Collect async webhook deliveries scheduled in the block and send them together.
+
+    Deliveries are sent once the block exits, or once the transaction is committed
+    if the block is run in a transaction.
+    """
+    pending_webhook_deliveries.batch_depth += 1
+    try:
+        yield
+    finally:
+        pending_webhook_deliveries.batch_depth -= 1
+        if not pending_webhook_deliveries.batch_depth:
+            transaction.on_commit(flush_webhook_requests)
+
+
+def _prepare_webhook_request_sync(delivery) -> Tuple[str, bytes, str]:
     webhook = delivery.webhook
     parts = urlparse(webhook.target_url)
     domain = Site.objects.get_current().domain
-    message = data.encode("utf-8")
+    message = delivery.payload.get_payload().encode("utf-8")
     signature = signature_for_payload(message, webhook.secret_key)
 
     if parts.scheme.lower() not in [WebhookSchemes.HTTP, WebhookSchemes.HTTPS]:
@@ -611,8 +844,41 @@ def _send_webhook_request_sync(
         webhook.target_url,
         delivery.event_type,
     )
-    if attempt is None:
-        attempt = create_attempt(delivery=delivery, task_id=None)
+    return domain, message, signature
+
+
+def _get_webhook_response_sync(
+    app_name, delivery, domain, message, signature, timeout, attempt_id
+) -> Tuple[WebhookResponse, Optional[Dict[Any, Any]]]:
+    """Send the request of a sync webhook and parse the response.
+
+    It doesn't use the database, so it can be called from other threads.
+    """
+    webhook = delivery.webhook
+    circuit_breaker = None
+    if CircuitBreaker.is_enabled(delivery.event_type):
+        circuit_breaker = CircuitBreaker(webhook.target_url)
+        if not circuit_breaker.allow_request():
+            logger.info(
+                "[Webhook] Circuit breaker of %r is open, skipping request for event "
+                "%r. ID of failed DeliveryAttempt: %r . ",
+                webhook.target_url,
+                delivery.event_type,
+                attempt_id,
+            )
+            return (
+                WebhookResponse(
+                    content="Circuit breaker is open, the request was not sent.",
+                    status=EventDeliveryStatus.FAILED,
+                ),
+                None,
+            )
+    adaptive_timeout = delivery.event_type in CIRCUIT_BREAKER_EVENTS
+    # The probe of an open circuit is sent with the full timeout, so a target which
+    # became slower than the adapted timeout can close the circuit.
+    if adaptive_timeout and not (circuit_breaker and circuit_breaker.probe_token):
+        timeout = get_webhook_timeout(webhook.target_url, timeout)
+
     response = WebhookResponse(content="")
     response_data = None
 
@@ -637,7 +903,7 @@ def _send_webhook_request_sync(
             "ID of failed DeliveryAttempt: %r . ",
             webhook.target_url,
             e,
-            attempt.id,
+            attempt_id,
         )
         response.status = EventDeliveryStatus.FAILED
     else:
@@ -647,20 +913,43 @@ def _send_webhook_request_sync(
                 "ID of failed DeliveryAttempt: %r . ",
                 webhook.target_url,
                 response.content,
-                attempt.id,
+                attempt_id,
             )
         if response.status == EventDeliveryStatus.SUCCESS:
             logger.debug(
                 "[Webhook] Success response from %r."
                 "Successful DeliveryAttempt id: %r",
                 webhook.target_url,
-                attempt.id,
+                attempt_id,
             )
 
+    if circuit_breaker:
+        circuit_breaker.record_response(response)
+    # Requests which timed out have the timeout as their duration.
+    if adaptive_timeout and (
+        response.response_status_code is not None or response.duration
+    ):
+        record_webhook_latency(webhook.target_url, response.duration)
+    return response, response_data
+
+
+def _save_webhook_response_sync(delivery, attempt, response: WebhookResponse):
     attempt_update(attempt, response)
     delivery_update(delivery, response.status)
     observability.report_event_delivery_attempt(attempt)
     clear_successful_delivery(delivery)
+
+
+def _send_webhook_request_sync(
+    app_name, delivery, timeout=settings.WEBHOOK_SYNC_TIMEOUT, attempt=None
+) -> Tuple[WebhookResponse, Optional[Dict[Any, Any]]]:
+    domain, message, signature = _prepare_webhook_request_sync(delivery)
+    if attempt is None:
+        attempt = create_attempt(delivery=delivery, task_id=None)
+    response, response_data = _get_webhook_response_sync(
+        app_name, delivery, domain, message, signature, timeout, attempt.id
+    )
+    _save_webhook_response_sync(delivery, attempt, response)
     return response, response_data
 
 
@@ -671,6 +960,93 @@ def send_webhook_request_sync(
     return response_data if response.status == EventDeliveryStatus.SUCCESS else None
 
 
+_sync_webhooks_executors: Dict[int, ThreadPoolExecutor] = {}
+_sync_webhooks_executors_lock = threading.Lock()
+
+
+def get_sync_webhooks_executor(max_workers: int) -> ThreadPoolExecutor:
+    """Return the process-wide thread pool used to send sync webhooks."""
+    with _sync_webhooks_executors_lock:
+        if max_workers not in _sync_webhooks_executors:
+            _sync_webhooks_executors[max_workers] = ThreadPoolExecutor(
+                max_workers=max_workers, thread_name_prefix="sync-webhooks"
+            )
+        return _sync_webhooks_executors[max_workers]
+
+
+def send_webhook_requests_sync_concurrently(
+    deliveries: List[Tuple[str, EventDelivery]],
+    parse_response: Callable[[Any], Optional[R]],
+    max_workers: int,
+    timeout=settings.WEBHOOK_SYNC_TIMEOUT,
+) -> Optional[R]:
+    """Send requests of sync webhooks at once and return the first expected response.
+
+    Deliveries are given in the order of priority. The response of a webhook is
+    used only when none of the preceding webhooks returned the expected response,
+    so the result doesn't depend on which webhook responds first. Once it's known,
+    pending requests are cancelled and their attempts are marked as failed.
+
+    Responses are awaited for `timeout` seconds in total, so requests waiting for
+    a thread of the shared pool don't delay the caller for longer. Requests without
+    a response by then are marked as failed.
+
+    Only HTTP requests are sent by the threads, the database is used by the
+    calling thread.
+    """
+    executor = get_sync_webhooks_executor(max_workers)
+    pending_requests = []
+    for app_name, delivery in deliveries:
+        try:
+            domain, message, signature = _prepare_webhook_request_sync(delivery)
+        except ValueError as e:
+            # The delivery is already marked as failed, other webhooks are still
+            # used.
+            logger.info("[Webhook] Event delivery id: %r failed: %s", delivery.pk, e)
+            continue
+        attempt = create_attempt(delivery=delivery, task_id=None)
+        future = executor.submit(
+            _get_webhook_response_sync,
+            app_name,
+            delivery,
+            domain,
+            message,
+            signature,
+            timeout,
+            attempt.id,
+        )
+        pending_requests.append((delivery, attempt, future))
+
+    deadline = time.monotonic() + timeout
+    parsed_response = None
+    for delivery, attempt, future in pending_requests:
+        if parsed_response and (future.cancel() or not future.done()):
+            response = WebhookResponse(
+                content="Request cancelled, a response of another webhook was used.",
+                status=EventDeliveryStatus.FAILED,
+            )
+            _save_webhook_response_sync(delivery, attempt, response)
+            continue
+        try:
+            response, response_data = future.result(
+                timeout=max(0, deadline - time.monotonic())
+            )
+        except FutureTimeoutError:
+            # Requests which haven't started yet are cancelled, running ones are
+            # left to finish without waiting for them.
+            future.cancel()
+            response = WebhookResponse(
+                content="No response received within the timeout.",
+                status=EventDeliveryStatus.FAILED,
+            )
+            _save_webhook_response_sync(delivery, attempt, response)
+            continue
+        _save_webhook_response_sync(delivery, attempt, response)
+        if not parsed_response and response.status == EventDeliveryStatus.SUCCESS:
+            parsed_response = parse_response(response_data)
+    return parsed_response or None
+
+
 def send_observability_events(webhooks: List[WebhookData], events: List[Any]):
     event_type = WebhookEventAsyncType.OBSERVABILITY
     for webhook in webhooks:
@@ -801,7 +1177,7 @@ def trigger_transaction_request(
         payload = generate_transaction_action_request_payload(
             transaction_data, requestor
         )
-        event_payload = EventPayload.objects.create(payload=payload)
+        event_payload = EventPayload.objects.get_or_create_payload(payload)
         delivery = EventDelivery.objects.create(
             status=EventDeliveryStatus.PENDING,
             event_type=event_type,
@@ -4,14 +4,18 @@ from unittest.mock import patch
 import graphene
 import pytest
 from freezegun import freeze_time
+from graphql.validation import validate
 
+from .....app.models import App
 from .....channel.models import Channel
 from .....giftcard.models import GiftCard
+from .....graphql.core.document_cache import document_cache
 from .....graphql.webhook.subscription_query import SubscriptionQuery
 from .....menu.models import Menu, MenuItem
 from .....product.models import Category
 from .....shipping.models import ShippingMethod, ShippingZone
 from .....webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
+from .....webhook.models import Webhook
 from ...tasks import create_deliveries_for_subscriptions, logger
 from . import subscription_queries
 from .payloads import (
@@ -2541,3 +2545,78 @@ def test_thumbnail_created_user(thumbnail_user, subscription_thumbnail_created_w
     assert deliveries[0].payload.payload == expected_payload
     assert len(deliveries) == len(webhooks)
     assert deliveries[0].webhook == webhooks[0]
+
+
+@patch("saleor.graphql.core.document_cache.validate", wraps=validate)
+def test_create_deliveries_for_subscriptions_validates_query_once(
+    mocked_validate,
+    gift_card,
+    subscription_gift_card_created_webhook,
+    settings,
+):
+    # given
+    settings.GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 10
+    document_cache.clear()
+    webhooks = [subscription_gift_card_created_webhook]
+    event_type = WebhookEventAsyncType.GIFT_CARD_CREATED
+
+    # when
+    first_deliveries = create_deliveries_for_subscriptions(
+        event_type, gift_card, webhooks
+    )
+    second_deliveries = create_deliveries_for_subscriptions(
+        event_type, gift_card, webhooks
+    )
+
+    # then
+    assert len(first_deliveries) == len(second_deliveries) == 1
+    mocked_validate.assert_called_once()
+    document_cache.clear()
+
+
+def test_create_deliveries_for_subscriptions_invalid_query(
+    gift_card, subscription_gift_card_created_webhook
+):
+    # given
+    webhook = subscription_gift_card_created_webhook
+    webhook.subscription_query = (
+        "subscription { event { ... on GiftCardCreated { giftCard } } }"
+    )
+    webhook.save(update_fields=["subscription_query"])
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(
+        WebhookEventAsyncType.GIFT_CARD_CREATED, gift_card, [webhook]
+    )
+
+    # then
+    assert deliveries == []
+
+
+def test_create_deliveries_for_subscriptions_apps_with_different_permissions(
+    gift_card, subscription_gift_card_created_webhook
+):
+    # given
+    app_without_permissions = App.objects.create(name="App", is_active=True)
+    webhook_without_permissions = Webhook.objects.create(
+        name="Subscription",
+        app=app_without_permissions,
+        target_url="http://www.example.com/any",
+        subscription_query=subscription_gift_card_created_webhook.subscription_query,
+    )
+    webhooks = [subscription_gift_card_created_webhook, webhook_without_permissions]
+
+    # when
+    deliveries = create_deliveries_for_subscriptions(
+        WebhookEventAsyncType.GIFT_CARD_CREATED, gift_card, webhooks
+    )
+
+    # then
+    payload = json.loads(deliveries[0].payload.payload)
+    payload_without_permissions = json.loads(deliveries[1].payload.payload)
+    assert payload["giftCard"]["id"] == graphene.Node.to_global_id(
+        "GiftCard", gift_card.pk
+    )
+    assert not payload_without_permissions["giftCard"]
+    error = payload_without_permissions["errors"][0]
+    assert error["extensions"]["exception"]["code"] == "PermissionDenied"
@@ -0,0 +1,263 @@
+from unittest import mock
+
+import pytest
+from django.core.cache import cache
+
+from ....core import EventDeliveryStatus
+from ....webhook.event_types import WebhookEventSyncType
+from ..circuit_breaker import (
+    CircuitBreaker,
+    get_webhook_timeout,
+    record_webhook_latency,
+)
+from ..tasks import WebhookResponse, _get_webhook_response_sync
+
+TARGET_URL = "https://www.example.com/taxes"
+
+
+@pytest.fixture(autouse=True)
+def circuit_breaker_settings(settings):
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE = 0.5
+    settings.WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS = 4
+    settings.WEBHOOK_CIRCUIT_BREAKER_WINDOW = 60
+    settings.WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = 30
+    cache.clear()
+    yield settings
+    cache.clear()
+
+
+def success_response():
+    return WebhookResponse(content="{}", response_status_code=200)
+
+
+def failed_response():
+    return WebhookResponse(
+        content="", response_status_code=503, status=EventDeliveryStatus.FAILED
+    )
+
+
+def test_circuit_breaker_opens_on_failure_rate():
+    # given
+    circuit_breaker = CircuitBreaker(TARGET_URL)
+    circuit_breaker.record_response(success_response())
+    circuit_breaker.record_response(failed_response())
+    circuit_breaker.record_response(success_response())
+    assert CircuitBreaker(TARGET_URL).allow_request()
+
+    # when
+    circuit_breaker.record_response(failed_response())
+
+    # then
+    assert not CircuitBreaker(TARGET_URL).allow_request()
+    assert CircuitBreaker("https://www.example.com/other").allow_request()
+
+
+def test_circuit_breaker_ignores_client_errors():
+    # given
+    circuit_breaker = CircuitBreaker(TARGET_URL)
+
+    # when
+    for _ in range(4):
+        circuit_breaker.record_response(
+            WebhookResponse(
+                content="",
+                response_status_code=400,
+                status=EventDeliveryStatus.FAILED,
+            )
+        )
+
+    # then
+    assert circuit_breaker.allow_request()
+
+
+@mock.patch("saleor.plugins.webhook.circuit_breaker.time.time")
+def test_circuit_breaker_half_open_probe(mocked_time):
+    # given
+    mocked_time.return_value = 1000
+    circuit_breaker = CircuitBreaker(TARGET_URL)
+    for _ in range(4):
+        circuit_breaker.record_response(failed_response())
+    assert not circuit_breaker.allow_request()
+
+    # when
+    mocked_time.return_value = 1031
+    probe = CircuitBreaker(TARGET_URL)
+    probe_allowed = probe.allow_request()
+
+    # then
+    assert probe_allowed
+    assert not CircuitBreaker(TARGET_URL).allow_request()
+
+    # when
+    probe.record_response(success_response())
+
+    # then
+    assert CircuitBreaker(TARGET_URL).allow_request()
+
+
+@mock.patch("saleor.plugins.webhook.circuit_breaker.time.time")
+def test_circuit_breaker_failed_probe_reopens_circuit(mocked_time):
+    # given
+    mocked_time.return_value = 1000
+    circuit_breaker = CircuitBreaker(TARGET_URL)
+    for _ in range(4):
+        circuit_breaker.record_response(failed_response())
+    mocked_time.return_value = 1031
+    probe = CircuitBreaker(TARGET_URL)
+    assert probe.allow_request()
+
+    # when
+    probe.record_response(failed_response())
+
+    # then
+    assert not CircuitBreaker(TARGET_URL).allow_request()
+    mocked_time.return_value = 1062
+    assert CircuitBreaker(TARGET_URL).allow_request()
+
+
+@mock.patch("saleor.plugins.webhook.circuit_breaker.time.time")
+def test_circuit_breaker_ignores_responses_of_requests_other_than_probe(
+    mocked_time,
+):
+    # given
+    mocked_time.return_value = 1000
+    in_flight_request = CircuitBreaker(TARGET_URL)
+    assert in_flight_request.allow_request()
+    circuit_breaker = CircuitBreaker(TARGET_URL)
+    for _ in range(4):
+        circuit_breaker.record_response(failed_response())
+
+    # when
+    in_flight_request.record_response(success_response())
+
+    # then
+    assert not CircuitBreaker(TARGET_URL).allow_request()
+
+    # when
+    mocked_time.return_value = 1031
+    probe = CircuitBreaker(TARGET_URL)
+    assert probe.allow_request()
+    in_flight_request.record_response(success_response())
+
+    # then
+    assert not CircuitBreaker(TARGET_URL).allow_request()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_get_webhook_response_sync_fails_fast_when_circuit_is_open(
+    mock_send_webhook, tax_checkout_webhook
+):
+    # given
+    circuit_breaker = CircuitBreaker(tax_checkout_webhook.target_url)
+    for _ in range(4):
+        circuit_breaker.record_response(failed_response())
+    delivery = mock.Mock(
+        webhook=tax_checkout_webhook,
+        event_type=WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES,
+    )
+
+    # when
+    response, response_data = _get_webhook_response_sync(
+        "app", delivery, "mirumee.com", b"{}", "signature", 20, None
+    )
+
+    # then
+    assert response.status == EventDeliveryStatus.FAILED
+    assert response_data is None
+    mock_send_webhook.assert_not_called()
+
+
+def test_get_webhook_timeout(settings):
+    # given
+    settings.WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER = 2
+    settings.WEBHOOK_ADAPTIVE_TIMEOUT_MIN = 1
+    for duration in [0.1] * 98 + [0.9, 1.5]:
+        record_webhook_latency(TARGET_URL, duration)
+
+    # when
+    timeout = get_webhook_timeout(TARGET_URL, 20)
+
+    # then
+    assert timeout == 1.8
+    assert get_webhook_timeout("https://www.example.com/other", 20) == 20
+
+
+def test_get_webhook_timeout_not_above_given_timeout(settings):
+    # given
+    settings.WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER = 2
+    for _ in range(20):
+        record_webhook_latency(TARGET_URL, 15)
+
+    # then
+    assert get_webhook_timeout(TARGET_URL, 20) == 20
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_get_webhook_timeout_grows_back_when_target_slows_down(
+    mock_send_webhook, tax_checkout_webhook, settings
+):
+    # given
+    settings.WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE = 0
+    settings.WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER = 2
+    settings.WEBHOOK_ADAPTIVE_TIMEOUT_MIN = 1
+    target_url = tax_checkout_webhook.target_url
+    for _ in range(100):
+        record_webhook_latency(target_url, 0.1)
+    assert get_webhook_timeout(target_url, 20) == 1
+    latency = 5
+
+    def send_webhook(*args, timeout, **kwargs):
+        if timeout < latency:
+            return WebhookResponse(
+                content="timeout", status=EventDeliveryStatus.FAILED, duration=timeout
+            )
+        return WebhookResponse(content="{}", response_status_code=200, duration=latency)
+
+    mock_send_webhook.side_effect = send_webhook
+    delivery = mock.Mock(
+        webhook=tax_checkout_webhook,
+        event_type=WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES,
+    )
+
+    # when
+    responses = [
+        _get_webhook_response_sync(
+            "app", delivery, "mirumee.com", b"{}", "signature", 20, None
+        )[0]
+        for _ in range(10)
+    ]
+
+    # then
+    assert responses[0].status == EventDeliveryStatus.FAILED
+    assert responses[-1].status == EventDeliveryStatus.SUCCESS
+    assert get_webhook_timeout(target_url, 20) >= latency
+
+
+@mock.patch("saleor.plugins.webhook.circuit_breaker.time.time")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_get_webhook_response_sync_sends_probe_with_full_timeout(
+    mock_send_webhook, mocked_time, tax_checkout_webhook, settings
+):
+    # given
+    settings.WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER = 2
+    target_url = tax_checkout_webhook.target_url
+    for _ in range(100):
+        record_webhook_latency(target_url, 0.1)
+    mocked_time.return_value = 1000
+    circuit_breaker = CircuitBreaker(target_url)
+    for _ in range(4):
+        circuit_breaker.record_response(failed_response())
+    mocked_time.return_value = 1031
+    mock_send_webhook.return_value = success_response()
+    delivery = mock.Mock(
+        webhook=tax_checkout_webhook,
+        event_type=WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES,
+    )
+
+    # when
+    _get_webhook_response_sync(
+        "app", delivery, "mirumee.com", b"{}", "signature", 20, None
+    )
+
+    # then
+    assert mock_send_webhook.call_args.kwargs["timeout"] == 20
@@ -0,0 +1,107 @@
+from http.client import HTTPMessage
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+
+import requests
+from requests.cookies import extract_cookies_to_jar
+
+from ..clients import ClientsPool, get_http_session, get_sqs_client
+
+
+def test_clients_pool_reuses_client():
+    # given
+    pool = ClientsPool(max_size=2, idle_timeout=60)
+    factory = MagicMock(side_effect=lambda: object())
+
+    # when
+    client = pool.get("host", factory)
+    same_client = pool.get("host", factory)
+
+    # then
+    assert client is same_client
+    factory.assert_called_once_with()
+
+
+def test_clients_pool_evicts_least_recently_used_client():
+    # given
+    pool = ClientsPool(max_size=2, idle_timeout=60)
+    first_client = pool.get("first", MagicMock)
+    second_client = pool.get("second", MagicMock)
+    pool.get("first", MagicMock)
+
+    # when
+    pool.get("third", MagicMock)
+
+    # then
+    assert list(pool._clients) == ["first", "third"]
+    second_client.close.assert_called_once_with()
+    assert not first_client.close.called
+
+
+def test_clients_pool_creates_client_without_lock():
+    # given
+    pool = ClientsPool(max_size=2, idle_timeout=60)
+
+    def factory():
+        assert not pool._lock.locked()
+        return MagicMock()
+
+    # when
+    client = pool.get("host", factory)
+
+    # then
+    assert pool.get("host", factory) is client
+
+
+@patch("saleor.plugins.webhook.clients.time.monotonic")
+def test_clients_pool_closes_idle_clients(mocked_monotonic):
+    # given
+    pool = ClientsPool(max_size=2, idle_timeout=60)
+    mocked_monotonic.return_value = 100
+    idle_client = pool.get("host", MagicMock)
+
+    # when
+    mocked_monotonic.return_value = 161
+    client = pool.get("host", MagicMock)
+
+    # then
+    assert client is not idle_client
+    idle_client.close.assert_called_once_with()
+
+
+def test_get_http_session_per_host():
+    # when
+    session = get_http_session("https", "example.com")
+
+    # then
+    assert get_http_session("HTTPS", "example.com") is session
+    assert get_http_session("https", "other.example.com") is not session
+
+
+def test_http_session_doesnt_store_cookies():
+    # given
+    session = get_http_session("https", "cookies.example.com")
+    headers = HTTPMessage()
+    headers["Set-Cookie"] = "session=1; Path=/"
+    response = SimpleNamespace(_original_response=SimpleNamespace(msg=headers))
+    request = requests.Request("GET", "https://cookies.example.com/").prepare()
+
+    # when
+    extract_cookies_to_jar(session.cookies, request, response)
+
+    # then
+    assert not session.cookies
+
+
+@patch("saleor.plugins.webhook.clients.boto3.client")
+def test_get_sqs_client_per_region_and_credentials(mocked_client_constructor):
+    # given
+    mocked_client_constructor.side_effect = lambda *args, **kwargs: MagicMock()
+
+    # when
+    client = get_sqs_client("us-east-1", "key", "secret")
+
+    # then
+    assert get_sqs_client("us-east-1", "key", "secret") is client
+    assert get_sqs_client("eu-west-1", "key", "secret") is not client
+    assert mocked_client_constructor.call_count == 2
@@ -1,7 +1,11 @@
+from datetime import timedelta
+
 import pytest
+from django.utils import timezone
 
 from ....core import EventDeliveryStatus
 from ....core.models import EventDelivery, EventPayload
+from ....core.utils.compression import get_payload_hash
 from ....payment import TransactionKind
 from ..utils import (
     APP_ID_PREFIX,
@@ -238,6 +242,9 @@ def test_clear_successful_delivery(event_delivery):
     event_delivery.status = EventDeliveryStatus.SUCCESS
     event_delivery.save()
     event_payload = event_delivery.payload
+    EventPayload.objects.filter(pk=event_payload.pk).update(
+        created_at=timezone.now() - timedelta(days=1)
+    )
     # when
     clear_successful_delivery(event_delivery)
     # then
@@ -245,6 +252,18 @@ def test_clear_successful_delivery(event_delivery):
     assert not EventPayload.objects.filter(pk=event_payload.pk).exists()
 
 
+def test_clear_successful_delivery_keeps_recent_payload(event_delivery):
+    # given
+    event_delivery.status = EventDeliveryStatus.SUCCESS
+    event_delivery.save()
+    event_payload = event_delivery.payload
+    # when
+    clear_successful_delivery(event_delivery)
+    # then
+    assert not EventDelivery.objects.filter(pk=event_delivery.pk).exists()
+    assert EventPayload.objects.filter(pk=event_payload.pk).exists()
+
+
 def test_clear_successful_delivery_when_payload_in_multiple_deliveries(event_delivery):
     # given
     assert EventDelivery.objects.filter(pk=event_delivery.pk).exists()
@@ -259,6 +278,25 @@ def test_clear_successful_delivery_when_payload_in_multiple_deliveries(event_del
     assert EventPayload.objects.filter(pk=event_payload.pk).exists()
 
 
+def test_clear_successful_delivery_when_payload_reused(event_delivery):
+    # given
+    event_delivery.status = EventDeliveryStatus.SUCCESS
+    event_delivery.save()
+    event_payload = event_delivery.payload
+    EventPayload.objects.filter(pk=event_payload.pk).update(
+        hash=get_payload_hash(event_payload.payload),
+        created_at=timezone.now() - timedelta(days=1),
+    )
+    # The payload is reused by a delivery that is not created yet.
+    reused_payload = EventPayload.objects.get_or_create_payload(event_payload.payload)
+    assert reused_payload.pk == event_payload.pk
+    # when
+    clear_successful_delivery(event_delivery)
+    # then
+    assert not EventDelivery.objects.filter(pk=event_delivery.pk).exists()
+    assert EventPayload.objects.filter(pk=event_payload.pk).exists()
+
+
 def test_clear_successful_delivery_on_failed_delivery(event_delivery):
     # given
     event_delivery.status = EventDeliveryStatus.FAILED
@@ -162,7 +162,7 @@ def test_trigger_transaction_request_with_webhook_subscription(
 
 
 @freeze_time("2022-06-11 12:50")
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_with_only_psp_reference(
     mocked_post_request,
     transaction_item_generator,
@@ -224,7 +224,7 @@ def test_handle_transaction_request_task_with_only_psp_reference(
 @pytest.mark.parametrize("status_code", [500, 501, 510])
 @freeze_time("2022-06-11 12:50")
 @mock.patch("saleor.plugins.webhook.tasks.handle_webhook_retry")
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_with_server_error(
     mocked_post_request,
     mocked_webhook_retry,
@@ -280,7 +280,7 @@ def test_handle_transaction_request_task_with_server_error(
 
 
 @freeze_time("2022-06-11 12:50")
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_with_missing_psp_reference(
     mocked_post_request,
     transaction_item_created_by_app,
@@ -354,7 +354,7 @@ def test_handle_transaction_request_task_with_missing_psp_reference(
 
 
 @freeze_time("2022-06-11 12:50")
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_with_missing_required_event_field(
     mocked_post_request,
     transaction_item_created_by_app,
@@ -433,7 +433,7 @@ def test_handle_transaction_request_task_with_missing_required_event_field(
 
 
 @freeze_time("2022-06-11 12:50")
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_with_result_event(
     mocked_post_request,
     transaction_item_generator,
@@ -527,7 +527,7 @@ def test_handle_transaction_request_task_with_result_event(
 
 
 @freeze_time("2022-06-11T17:50:00+00:00")
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_with_only_required_fields_for_result_event(
     mocked_post_request,
     transaction_item_generator,
@@ -619,7 +619,7 @@ def test_handle_transaction_request_task_with_only_required_fields_for_result_ev
     "saleor.payment.utils.recalculate_transaction_amounts",
     wraps=recalculate_transaction_amounts,
 )
-@mock.patch("saleor.plugins.webhook.tasks.requests.post")
+@mock.patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_handle_transaction_request_task_calls_recalculation_of_amounts(
     mocked_post_request,
     mocked_recalculation,
@@ -1,3 +1,5 @@
+import json
+import threading
 from unittest import mock
 
 import pytest
@@ -6,7 +8,11 @@ from ....core import EventDeliveryStatus
 from ....core.models import EventDelivery, EventPayload
 from ....webhook.event_types import WebhookEventSyncType
 from ....webhook.models import Webhook, WebhookEvent
-from ..tasks import trigger_all_webhooks_sync
+from ..tasks import (
+    WebhookResponse,
+    send_webhook_requests_sync_concurrently,
+    trigger_all_webhooks_sync,
+)
 from ..utils import parse_tax_data
 
 
@@ -139,3 +145,152 @@ def test_trigger_tax_webhook_sync_invalid_webhooks(
     # then
     assert mock_request.call_count == len(tax_checkout_webhooks)
     assert tax_data is None
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_trigger_tax_webhooks_sync_concurrently(
+    mock_send_webhook,
+    tax_checkout_webhooks,
+    tax_data_response,
+    settings,
+):
+    # given
+    settings.WEBHOOK_SYNC_MAX_WORKERS = 3
+    responses = {
+        tax_checkout_webhooks[0].target_url: WebhookResponse(
+            content="", status=EventDeliveryStatus.FAILED
+        ),
+        tax_checkout_webhooks[1].target_url: WebhookResponse(
+            content=json.dumps({**tax_data_response, "total_net_amount": 1})
+        ),
+        tax_checkout_webhooks[2].target_url: WebhookResponse(
+            content=json.dumps({**tax_data_response, "total_net_amount": 2})
+        ),
+    }
+    mock_send_webhook.side_effect = lambda target_url, *args, **kwargs: responses[
+        target_url
+    ]
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert tax_data.total_net_amount == 1
+    assert mock_send_webhook.call_count == len(tax_checkout_webhooks)
+    failed_delivery = EventDelivery.objects.get(webhook=tax_checkout_webhooks[0])
+    assert failed_delivery.status == EventDeliveryStatus.FAILED
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_trigger_tax_webhooks_sync_concurrently_uses_webhooks_priority(
+    mock_send_webhook,
+    tax_checkout_webhooks,
+    tax_data_response,
+    settings,
+):
+    # given
+    settings.WEBHOOK_SYNC_MAX_WORKERS = 3
+    first_webhook, _, last_webhook = tax_checkout_webhooks
+    last_webhook_responded = threading.Event()
+
+    def send_webhook(target_url, *args, **kwargs):
+        if target_url == first_webhook.target_url:
+            # The first webhook responds after the last one.
+            last_webhook_responded.wait(timeout=5)
+            amount = 1
+        else:
+            last_webhook_responded.set()
+            amount = 2
+        return WebhookResponse(
+            content=json.dumps({**tax_data_response, "total_net_amount": amount})
+        )
+
+    mock_send_webhook.side_effect = send_webhook
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert last_webhook_responded.is_set()
+    assert tax_data.total_net_amount == 1
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_trigger_tax_webhooks_sync_concurrently_skips_invalid_scheme(
+    mock_send_webhook,
+    tax_checkout_webhooks,
+    tax_data_response,
+    settings,
+):
+    # given
+    settings.WEBHOOK_SYNC_MAX_WORKERS = 3
+    invalid_webhook = tax_checkout_webhooks[0]
+    invalid_webhook.target_url = "ftp://www.example.com/tax-checkout"
+    invalid_webhook.save(update_fields=["target_url"])
+    mock_send_webhook.return_value = WebhookResponse(
+        content=json.dumps(tax_data_response)
+    )
+    event_type = WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES
+    data = '{"key": "value"}'
+
+    # when
+    tax_data = trigger_all_webhooks_sync(event_type, lambda: data, parse_tax_data)
+
+    # then
+    assert tax_data == parse_tax_data(tax_data_response)
+    assert mock_send_webhook.call_count == 2
+    invalid_delivery = EventDelivery.objects.get(webhook=invalid_webhook)
+    assert invalid_delivery.status == EventDeliveryStatus.FAILED
+    assert not invalid_delivery.attempts.exists()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_send_webhook_requests_sync_concurrently_bounds_waiting_time(
+    mock_send_webhook,
+    tax_checkout_webhooks,
+    tax_data_response,
+):
+    # given
+    slow_webhook = tax_checkout_webhooks[0]
+    slow_webhook_released = threading.Event()
+
+    def send_webhook(target_url, *args, **kwargs):
+        if target_url == slow_webhook.target_url:
+            slow_webhook_released.wait(timeout=5)
+        return WebhookResponse(content=json.dumps(tax_data_response))
+
+    mock_send_webhook.side_effect = send_webhook
+    payload = EventPayload.objects.get_or_create_payload('{"key": "value"}')
+    deliveries = [
+        (
+            webhook.app.name,
+            EventDelivery.objects.create(
+                status=EventDeliveryStatus.PENDING,
+                event_type=WebhookEventSyncType.CHECKOUT_CALCULATE_TAXES,
+                payload=payload,
+                webhook=webhook,
+            ),
+        )
+        for webhook in tax_checkout_webhooks
+    ]
+
+    # when
+    try:
+        tax_data = send_webhook_requests_sync_concurrently(
+            deliveries, parse_tax_data, max_workers=3, timeout=0.2
+        )
+    finally:
+        slow_webhook_released.set()
+
+    # then
+    assert tax_data == parse_tax_data(tax_data_response)
+    slow_delivery = EventDelivery.objects.get(webhook=slow_webhook)
+    assert slow_delivery.status == EventDeliveryStatus.FAILED
+    assert (
+        slow_delivery.attempts.get().response
+        == "No response received within the timeout."
+    )
@@ -1388,7 +1388,7 @@ def test_create_event_payload_reference_with_error(
     mocked_client_constructor = MagicMock(spec=boto3.client, return_value=mocked_client)
 
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.boto3.client",
+        "saleor.plugins.webhook.clients.boto3.client",
         mocked_client_constructor,
     )
 
@@ -1846,7 +1846,10 @@ def test_send_webhook_request_async_when_delivery_attempt_failed(
     mocked_observability.assert_called_once_with(attempt, None)
 
 
-@mock.patch("saleor.plugins.webhook.tasks.requests.post", side_effect=RequestException)
+@mock.patch(
+    "saleor.plugins.webhook.clients.requests.Session.post",
+    side_effect=RequestException,
+)
 @mock.patch("saleor.plugins.webhook.tasks.observability.report_event_delivery_attempt")
 def test_send_webhook_request_async_with_request_exception(
     mocked_observability, mocked_post, event_delivery, webhook_response_failed
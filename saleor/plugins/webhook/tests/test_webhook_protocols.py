@@ -32,7 +32,7 @@ def test_trigger_webhooks_with_aws_sqs(
     mocked_client_constructor = MagicMock(spec=boto3.client, return_value=mocked_client)
 
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.boto3.client",
+        "saleor.plugins.webhook.clients.boto3.client",
         mocked_client_constructor,
     )
 
@@ -98,7 +98,7 @@ def test_trigger_webhooks_with_aws_sqs_and_secret_key(
     mocked_client_constructor = MagicMock(spec=boto3.client, return_value=mocked_client)
 
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.boto3.client",
+        "saleor.plugins.webhook.clients.boto3.client",
         mocked_client_constructor,
     )
 
@@ -154,7 +154,7 @@ def test_trigger_webhooks_with_google_pub_sub(
     mocked_publisher = MagicMock(spec=PublisherClient)
     mocked_publisher.publish.return_value.result.return_value = "message_id"
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.pubsub_v1.PublisherClient",
+        "saleor.plugins.webhook.clients.pubsub_v1.PublisherClient",
         lambda: mocked_publisher,
     )
     webhook.app.permissions.add(permission_manage_orders)
@@ -187,7 +187,7 @@ def test_trigger_webhooks_with_google_pub_sub_and_secret_key(
     mocked_publisher = MagicMock(spec=PublisherClient)
     mocked_publisher.publish.return_value.result.return_value = "message_id"
     monkeypatch.setattr(
-        "saleor.plugins.webhook.tasks.pubsub_v1.PublisherClient",
+        "saleor.plugins.webhook.clients.pubsub_v1.PublisherClient",
         lambda: mocked_publisher,
     )
     webhook.app.permissions.add(permission_manage_orders)
@@ -213,7 +213,7 @@ def test_trigger_webhooks_with_google_pub_sub_and_secret_key(
     )
 
 
-@patch("saleor.plugins.webhook.tasks.requests.post")
+@patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_trigger_webhooks_with_http(
     mock_request,
     webhook,
@@ -262,7 +262,7 @@ def test_trigger_webhooks_with_http(
     )
 
 
-@patch("saleor.plugins.webhook.tasks.requests.post")
+@patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_trigger_webhooks_with_http_and_secret_key(
     mock_request, webhook, order_with_lines, permission_manage_orders
 ):
@@ -306,7 +306,7 @@ def test_trigger_webhooks_with_http_and_secret_key(
     )
 
 
-@patch("saleor.plugins.webhook.tasks.requests.post")
+@patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_trigger_webhooks_with_http_and_secret_key_as_empty_string(
     mock_request, webhook, order_with_lines, permission_manage_orders
 ):
@@ -354,7 +354,7 @@ def test_trigger_webhooks_with_http_and_secret_key_as_empty_string(
     )
 
 
-@patch("saleor.plugins.webhook.tasks.requests.post")
+@patch("saleor.plugins.webhook.clients.requests.Session.post")
 def test_trigger_webhooks_with_http_and_custom_headers(
     mock_request, webhook, order_with_lines, permission_manage_orders
 ):
@@ -1,9 +1,21 @@
+from unittest import mock
+
 import pytest
 
 from ....app.models import App
+from ....core import EventDeliveryStatus
+from ....core.models import EventDelivery, EventPayload
+from ....tests.utils import flush_post_commit_hooks
 from ....webhook.event_types import WebhookEventAsyncType
 from ....webhook.models import Webhook, WebhookEvent
 from ....webhook.utils import get_webhooks_for_event
+from ..tasks import (
+    WebhookResponse,
+    send_webhook_request_async,
+    send_webhook_requests_async,
+    trigger_webhooks_async,
+    webhook_deliveries_batch,
+)
 
 
 @pytest.fixture
@@ -33,3 +45,191 @@ def test_get_webhooks_for_event_webhook_ordering(webhooks_factory):
         assert prev_webhook.app_id <= next_webhook.app_id
         if prev_webhook.app_id == next_webhook.app_id:
             assert prev_webhook.pk < next_webhook.pk
+
+
+@mock.patch("saleor.plugins.webhook.tasks.group")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request_async.delay")
+def test_trigger_webhooks_async_sends_deliveries_in_batches(
+    mocked_send_webhook_request, mocked_group, app, settings
+):
+    # given
+    settings.WEBHOOK_ASYNC_BATCH_SIZE = 2
+    webhooks = Webhook.objects.bulk_create(
+        [
+            Webhook(name="a", app=app, target_url="http://a.example.com/1"),
+            Webhook(name="b", app=app, target_url="http://a.example.com/2"),
+            Webhook(name="c", app=app, target_url="http://a.example.com/3"),
+            Webhook(name="d", app=app, target_url="http://b.example.com/"),
+        ]
+    )
+
+    # when
+    trigger_webhooks_async(
+        '{"key": "value"}', WebhookEventAsyncType.PRODUCT_UPDATED, webhooks
+    )
+    flush_post_commit_hooks()
+
+    # then
+    mocked_send_webhook_request.assert_not_called()
+    deliveries = EventDelivery.objects.order_by("pk")
+    tasks = mocked_group.call_args.args[0]
+    assert [task.args for task in tasks] == [
+        ([deliveries[0].pk, deliveries[1].pk],),
+        ([deliveries[2].pk],),
+        ([deliveries[3].pk],),
+    ]
+    mocked_group.return_value.apply_async.assert_called_once_with()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.group")
+def test_webhook_deliveries_batch_sends_deliveries_on_exit(
+    mocked_group, app, settings
+):
+    # given
+    settings.WEBHOOK_ASYNC_BATCH_SIZE = 10
+    webhook = Webhook.objects.create(
+        name="a", app=app, target_url="http://a.example.com/"
+    )
+    event_type = WebhookEventAsyncType.PRODUCT_UPDATED
+
+    # when
+    with webhook_deliveries_batch():
+        trigger_webhooks_async('{"id": 1}', event_type, [webhook])
+        trigger_webhooks_async('{"id": 2}', event_type, [webhook])
+        flush_post_commit_hooks()
+        mocked_group.assert_not_called()
+    flush_post_commit_hooks()
+
+    # then
+    deliveries = EventDelivery.objects.order_by("pk")
+    tasks = mocked_group.call_args.args[0]
+    assert [task.args for task in tasks] == [
+        ([deliveries[0].pk, deliveries[1].pk],)
+    ]
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request_async.apply_async")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+def test_send_webhook_requests_async(
+    mocked_send_webhook_using_scheme_method,
+    mocked_send_webhook_request_retry,
+    app,
+    event_payload,
+):
+    # given
+    webhooks = Webhook.objects.bulk_create(
+        [
+            Webhook(name="a", app=app, target_url="http://a.example.com/1"),
+            Webhook(name="b", app=app, target_url="http://a.example.com/2"),
+            Webhook(
+                name="c", app=app, target_url="http://a.example.com/3", is_active=False
+            ),
+        ]
+    )
+    successful_delivery, failed_delivery, inactive_delivery = [
+        EventDelivery.objects.create(
+            event_type=WebhookEventAsyncType.PRODUCT_UPDATED,
+            payload=event_payload,
+            webhook=webhook,
+        )
+        for webhook in webhooks
+    ]
+    mocked_send_webhook_using_scheme_method.side_effect = [
+        WebhookResponse(content="", status=EventDeliveryStatus.SUCCESS),
+        WebhookResponse(content="error", status=EventDeliveryStatus.FAILED),
+    ]
+
+    # when
+    send_webhook_requests_async(
+        [successful_delivery.pk, failed_delivery.pk, inactive_delivery.pk]
+    )
+
+    # then
+    assert not EventDelivery.objects.filter(pk=successful_delivery.pk).exists()
+    failed_delivery.refresh_from_db()
+    assert failed_delivery.status == EventDeliveryStatus.PENDING
+    failed_attempt = failed_delivery.attempts.get()
+    assert failed_attempt.status == EventDeliveryStatus.FAILED
+    assert failed_attempt.response == "error"
+    inactive_delivery.refresh_from_db()
+    assert inactive_delivery.status == EventDeliveryStatus.FAILED
+    assert not inactive_delivery.attempts.exists()
+    mocked_send_webhook_request_retry.assert_called_once_with(
+        (failed_delivery.pk,),
+        countdown=send_webhook_request_async.retry_backoff,
+        retries=1,
+    )
+    assert EventPayload.objects.filter(pk=event_payload.pk).exists()
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_scheme_method")
+def test_send_webhook_requests_async_retries_failed_delivery_like_single_task(
+    mocked_send_webhook_using_scheme_method, event_delivery
+):
+    # given
+    mocked_send_webhook_using_scheme_method.return_value = WebhookResponse(
+        content="error", status=EventDeliveryStatus.FAILED
+    )
+    max_retries = send_webhook_request_async.retry_kwargs["max_retries"]
+
+    # when
+    send_webhook_requests_async([event_delivery.pk])
+
+    # then
+    event_delivery.refresh_from_db()
+    assert event_delivery.status == EventDeliveryStatus.FAILED
+    assert event_delivery.attempts.count() == max_retries + 1
+    assert mocked_send_webhook_using_scheme_method.call_count == max_retries + 1
+
+
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_request_async.apply_async")
+@mock.patch("saleor.plugins.webhook.tasks.send_webhook_using_http")
+def test_send_webhook_requests_async_continues_after_delivery_errors(
+    mocked_send_webhook_using_http,
+    mocked_send_webhook_request_retry,
+    app,
+    event_payload,
+):
+    # given
+    webhooks = Webhook.objects.bulk_create(
+        [
+            Webhook(name="a", app=app, target_url="ftp://a.example.com/1"),
+            Webhook(name="b", app=app, target_url="http://a.example.com/2"),
+            Webhook(name="c", app=app, target_url="http://a.example.com/3"),
+        ]
+    )
+    bad_scheme_delivery, error_delivery, successful_delivery = [
+        EventDelivery.objects.create(
+            event_type=WebhookEventAsyncType.PRODUCT_UPDATED,
+            payload=event_payload,
+            webhook=webhook,
+        )
+        for webhook in webhooks
+    ]
+    mocked_send_webhook_using_http.side_effect = [
+        RuntimeError("Connection error"),
+        WebhookResponse(content="", status=EventDeliveryStatus.SUCCESS),
+    ]
+
+    # when
+    send_webhook_requests_async(
+        [bad_scheme_delivery.pk, error_delivery.pk, successful_delivery.pk]
+    )
+
+    # then
+    assert not EventDelivery.objects.filter(pk=successful_delivery.pk).exists()
+    bad_scheme_delivery.refresh_from_db()
+    assert bad_scheme_delivery.status == EventDeliveryStatus.FAILED
+    bad_scheme_attempt = bad_scheme_delivery.attempts.get()
+    assert bad_scheme_attempt.status == EventDeliveryStatus.FAILED
+    assert bad_scheme_attempt.response == "Unknown webhook scheme: 'ftp'"
+    error_delivery.refresh_from_db()
+    assert error_delivery.status == EventDeliveryStatus.PENDING
+    error_attempt = error_delivery.attempts.get()
+    assert error_attempt.status == EventDeliveryStatus.FAILED
+    assert error_attempt.response == "Connection error"
+    mocked_send_webhook_request_retry.assert_called_once_with(
+        (error_delivery.pk,),
+        countdown=send_webhook_request_async.retry_backoff,
+        retries=1,
+    )
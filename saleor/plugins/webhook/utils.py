@@ -234,7 +234,17 @@ def create_attempt(
     return attempt
 
 
-def attempt_update(
+ATTEMPT_RESPONSE_FIELDS = [
+    "duration",
+    "response",
+    "response_headers",
+    "response_status_code",
+    "request_headers",
+    "status",
+]
+
+
+def set_attempt_response(
     attempt: "EventDeliveryAttempt",
     webhook_response: "WebhookResponse",
 ):
@@ -244,16 +254,14 @@ def attempt_update(
     attempt.response_status_code = webhook_response.response_status_code
     attempt.request_headers = json.dumps(webhook_response.request_headers)
     attempt.status = webhook_response.status
-    attempt.save(
-        update_fields=[
-            "duration",
-            "response",
-            "response_headers",
-            "response_status_code",
-            "request_headers",
-            "status",
-        ]
-    )
+
+
+def attempt_update(
+    attempt: "EventDeliveryAttempt",
+    webhook_response: "WebhookResponse",
+):
+    set_attempt_response(attempt, webhook_response)
+    attempt.save(update_fields=ATTEMPT_RESPONSE_FIELDS)
 
 
 def delivery_update(delivery: "EventDelivery", status: str):
@@ -261,12 +269,23 @@ def delivery_update(delivery: "EventDelivery", status: str):
     delivery.save(update_fields=["status"])
 
 
+def delete_unused_event_payloads(payload_ids, created_before):
+    """Delete payloads without deliveries.
+
+    Payloads are shared by deliveries with the same content. Payloads that could be
+    reused by transactions still creating their deliveries are kept, see
+    `EventPayloadQueryset.unused`; they are deleted by `delete_event_payloads_task`.
+    """
+    payloads = EventPayload.objects.filter(pk__in=payload_ids).unused(created_before)
+    payloads._raw_delete(payloads.db)  # type: ignore[attr-defined] # raw access # noqa: E501
+
+
 def clear_successful_delivery(delivery: "EventDelivery"):
     if delivery.status == EventDeliveryStatus.SUCCESS:
         payload_id = delivery.payload_id
         delivery.delete()
         if payload_id:
-            EventPayload.objects.filter(pk=payload_id, deliveries__isnull=True).delete()
+            delete_unused_event_payloads([payload_id], delivery.created_at)
 
 
 DEFAULT_TAX_CODE = "UNMAPPED"
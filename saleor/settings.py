@@ -620,6 +620,12 @@ EVENT_PAYLOAD_DELETE_PERIOD = timedelta(
     seconds=parse(os.environ.get("EVENT_PAYLOAD_DELETE_PERIOD", "14 days"))
 )
 
+# Compression level of stored event payloads. Payloads are compressed with zstd, which
+# requires the zstandard package to be installed. Set to 0 to store plain payloads.
+EVENT_PAYLOAD_COMPRESSION_LEVEL = int(
+    os.environ.get("EVENT_PAYLOAD_COMPRESSION_LEVEL", 0)
+)
+
 # Observability settings
 OBSERVABILITY_BROKER_URL = os.environ.get("OBSERVABILITY_BROKER_URL")
 OBSERVABILITY_ACTIVE = bool(OBSERVABILITY_BROKER_URL)
@@ -694,6 +700,68 @@ GRAPHQL_QUERY_MAX_COMPLEXITY = int(
     os.environ.get("GRAPHQL_QUERY_MAX_COMPLEXITY", 50000)
 )
 
+# How `totalCount` of connections is computed:
+# - "exact" counts all matching rows,
+# - "capped" counts rows up to GRAPHQL_TOTAL_COUNT_LIMIT,
+# - "estimated" uses the database query planner estimate for results larger than
+#   GRAPHQL_TOTAL_COUNT_LIMIT, and counts smaller results exactly.
+GRAPHQL_TOTAL_COUNT_MODE = os.environ.get("GRAPHQL_TOTAL_COUNT_MODE", "exact")
+GRAPHQL_TOTAL_COUNT_LIMIT = int(os.environ.get("GRAPHQL_TOTAL_COUNT_LIMIT", 10000))
+
+# Max number of parsed and validated GraphQL documents kept in the in-process cache.
+# Set GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE=0 in env to disable
+GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = int(
+    os.environ.get("GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE", 1000)
+)
+
+# Automatic persisted queries, stored in the default cache.
+# With GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY enabled only queries registered
+# in the database with the `register_persisted_queries` command can be executed.
+GRAPHQL_PERSISTED_QUERIES_ENABLED = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ENABLED", False
+)
+GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY = get_bool_from_env(
+    "GRAPHQL_PERSISTED_QUERIES_ALLOWLIST_ONLY", False
+)
+GRAPHQL_PERSISTED_QUERIES_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_PERSISTED_QUERIES_TIMEOUT", "1 day")
+)
+
+# Max number of threads used to execute read-only queries of a batched request
+# concurrently. Each thread uses its own database connection.
+# Set GRAPHQL_BATCH_MAX_WORKERS to 0 or 1 to execute batched operations one by one
+GRAPHQL_BATCH_MAX_WORKERS = int(os.environ.get("GRAPHQL_BATCH_MAX_WORKERS", 0))
+
+# Serve the GraphQL API with an async view that executes requests in a thread pool,
+# so a single ASGI worker can handle many requests concurrently.
+# Only recommended when running Saleor with an ASGI server.
+GRAPHQL_ASYNC_VIEW = get_bool_from_env("GRAPHQL_ASYNC_VIEW", False)
+
+# Time for which responses of anonymous catalogue queries (products, categories,
+# collections, menus and shop) are stored in the cache and shared between clients.
+# Cached responses are invalidated when the related objects change.
+# Set GRAPHQL_RESPONSE_CACHE_TIMEOUT to 0 to disable the response cache
+GRAPHQL_RESPONSE_CACHE_TIMEOUT = parse(
+    os.environ.get("GRAPHQL_RESPONSE_CACHE_TIMEOUT", "0 seconds")
+)
+
+# Import path of the class serializing GraphQL responses to JSON.
+# Use "saleor.graphql.core.serialization.OrjsonSerializer" for faster serialization,
+# it requires the orjson package to be installed.
+GRAPHQL_JSON_SERIALIZER = os.environ.get(
+    "GRAPHQL_JSON_SERIALIZER", "saleor.graphql.core.serialization.JSONSerializer"
+)
+
+# Send GraphQL responses in chunks while they're being serialized, instead of
+# serializing the whole response in memory first.
+GRAPHQL_STREAMING_RESPONSE = get_bool_from_env("GRAPHQL_STREAMING_RESPONSE", False)
+
+# Return resolver and dataloader timings along with SQL query counts in the
+# `profiling` extension of every GraphQL response. Staff users can profile single
+# requests by sending the `Saleor-Profile` header, even when it's disabled.
+# Not recommended in production, as profiling slows down the API.
+GRAPHQL_PROFILING_ENABLED = get_bool_from_env("GRAPHQL_PROFILING_ENABLED", False)
+
 # Max number entities that can be requested in single query by Apollo Federation
 # Federation protocol implements no securities on its own part - malicious actor
 # may build a query that requests for potentially few thousands of entities.
@@ -719,6 +787,9 @@ BUILTIN_PLUGINS = [
     "saleor.plugins.openid_connect.plugin.OpenIDConnectPlugin",
 ]
 
+if GRAPHQL_RESPONSE_CACHE_TIMEOUT:
+    BUILTIN_PLUGINS.append("saleor.plugins.response_cache.plugin.ResponseCachePlugin")
+
 # Plugin discovery
 EXTERNAL_PLUGINS = []
 installed_plugins = pkg_resources.iter_entry_points("saleor.plugins")
@@ -736,6 +807,43 @@ PLUGINS = BUILTIN_PLUGINS + EXTERNAL_PLUGINS
 WEBHOOK_TIMEOUT = 10
 WEBHOOK_SYNC_TIMEOUT = 20
 
+# Max number of threads used to send requests to all sync webhooks of an event (eg.
+# shipping methods of all shipping apps) at once. The response of the webhook with the
+# highest priority is used. Set to 0 or 1 to send the requests one by one.
+WEBHOOK_SYNC_MAX_WORKERS = int(os.environ.get("WEBHOOK_SYNC_MAX_WORKERS", 0))
+
+# Circuit breaker of sync webhooks with a fallback (taxes and shipping methods). When
+# the rate of failed requests to a target within the window (in seconds) reaches
+# WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE, requests to the target fail without being
+# sent until the cooldown (in seconds) passes. Set the rate to 0 to disable it.
+WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE = float(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_FAILURE_RATE", 0)
+)
+WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS = int(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_MIN_REQUESTS", 10)
+)
+WEBHOOK_CIRCUIT_BREAKER_WINDOW = int(os.environ.get("WEBHOOK_CIRCUIT_BREAKER_WINDOW", 60))
+WEBHOOK_CIRCUIT_BREAKER_COOLDOWN = int(
+    os.environ.get("WEBHOOK_CIRCUIT_BREAKER_COOLDOWN", 30)
+)
+
+# Timeouts of the same sync webhooks are adapted to the 99th percentile of latency
+# of the target multiplied by WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER, bounded by
+# WEBHOOK_ADAPTIVE_TIMEOUT_MIN and WEBHOOK_SYNC_TIMEOUT. Set the multiplier to 0 to
+# always use WEBHOOK_SYNC_TIMEOUT.
+WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER = float(
+    os.environ.get("WEBHOOK_ADAPTIVE_TIMEOUT_MULTIPLIER", 0)
+)
+WEBHOOK_ADAPTIVE_TIMEOUT_MIN = float(os.environ.get("WEBHOOK_ADAPTIVE_TIMEOUT_MIN", 1))
+
+# HTTP sessions and SQS / Pub/Sub clients are reused by webhook deliveries to keep
+# connections to the same targets alive. The values limit the number of clients kept
+# by a single process, the time (in seconds) after which an unused client is closed
+# and the number of connections kept per HTTP target host.
+WEBHOOK_CLIENTS_POOL_SIZE = int(os.environ.get("WEBHOOK_CLIENTS_POOL_SIZE", 100))
+WEBHOOK_CLIENTS_IDLE_TIMEOUT = int(os.environ.get("WEBHOOK_CLIENTS_IDLE_TIMEOUT", 300))
+WEBHOOK_HTTP_POOL_MAXSIZE = int(os.environ.get("WEBHOOK_HTTP_POOL_MAXSIZE", 10))
+
 # Since we split checkout complete logic into two separate transactions, in order to
 # mimic stock lock, we apply short reservation for the stocks. The value represents
 # time of the reservation in seconds.
@@ -788,6 +896,11 @@ CHECKOUT_PRICES_TTL = timedelta(
     seconds=parse(os.environ.get("CHECKOUT_PRICES_TTL", "1 hour"))
 )
 
+# Keep checkout prices recalculated when the checkout is read in the cache for
+# CHECKOUT_PRICES_TTL instead of saving them in the database. Prices are saved when
+# the checkout is paid for or completed.
+CHECKOUT_PRICES_CACHE = get_bool_from_env("CHECKOUT_PRICES_CACHE", False)
+
 # The maximum SearchVector expression count allowed per index SQL statement
 # If the count is exceeded, the expression list will be truncated
 INDEX_MAXIMUM_EXPR_COUNT = 4000
@@ -819,6 +932,11 @@ UPDATE_SEARCH_VECTOR_INDEX_QUEUE_NAME = os.environ.get(
 # Queue name for "async webhook" events
 WEBHOOK_CELERY_QUEUE_NAME = os.environ.get("WEBHOOK_CELERY_QUEUE_NAME", None)
 
+# Max number of async webhook deliveries sent by a single Celery task. Deliveries are
+# grouped by the target host and enqueued in chunks of this size once the transaction
+# or the GraphQL request finishes. Set to 0 to send each delivery in a separate task.
+WEBHOOK_ASYNC_BATCH_SIZE = int(os.environ.get("WEBHOOK_ASYNC_BATCH_SIZE", 0))
+
 # Lock time for request password reset mutation per user (seconds)
 RESET_PASSWORD_LOCK_TIME = parse(
     os.environ.get("RESET_PASSWORD_LOCK_TIME", "15 minutes")
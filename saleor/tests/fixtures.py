@@ -61,6 +61,7 @@ from ..discount.models import (
     VoucherCustomer,
     VoucherTranslation,
 )
+from ..discount.sale_index import clear_sale_index
 from ..giftcard import GiftCardEvents
 from ..giftcard.models import GiftCard, GiftCardEvent, GiftCardTag
 from ..menu.models import Menu, MenuItem, MenuItemTranslation
@@ -92,7 +93,9 @@ from ..payment.transaction_item_calculations import recalculate_transaction_amou
 from ..payment.utils import create_manual_adjustment_events
 from ..permission.enums import get_permissions
 from ..permission.models import Permission
+from ..plugins.config_cache import clear_plugins_config_cache
 from ..plugins.manager import get_plugins_manager
+from ..plugins.webhook.clients import clear_webhook_clients
 from ..plugins.webhook.tasks import WebhookResponse
 from ..plugins.webhook.tests.subscription_webhooks import subscription_queries
 from ..plugins.webhook.utils import to_payment_app_id
@@ -140,6 +143,7 @@ from ..warehouse.models import (
 from ..webhook.event_types import WebhookEventAsyncType, WebhookEventSyncType
 from ..webhook.models import Webhook, WebhookEvent
 from ..webhook.observability import WebhookData
+from ..webhook.registry import clear_webhooks_registry
 from .utils import dummy_editorjs
 
 
@@ -236,6 +240,38 @@ def setup_dummy_gateways(settings):
     return settings
 
 
+@pytest.fixture(autouse=True)
+def clear_plugins_config():
+    # Configurations loaded by a test may come from a rolled back transaction.
+    clear_plugins_config_cache()
+    yield
+    clear_plugins_config_cache()
+
+
+@pytest.fixture(autouse=True)
+def clear_webhooks_registry_cache():
+    # The registry loaded by a test may come from a rolled back transaction.
+    clear_webhooks_registry()
+    yield
+    clear_webhooks_registry()
+
+
+@pytest.fixture(autouse=True)
+def clear_sale_index_cache():
+    # The index loaded by a test may come from a rolled back transaction.
+    clear_sale_index()
+    yield
+    clear_sale_index()
+
+
+@pytest.fixture(autouse=True)
+def clear_webhook_clients_pools():
+    # Clients pooled by a test may be mocks.
+    clear_webhook_clients()
+    yield
+    clear_webhook_clients()
+
+
 @pytest.fixture
 def sample_gateway(settings):
     settings.PLUGINS += [
@@ -85,3 +85,7 @@ FdkAmFzQhgLtnEtnb+eBI7DNOJEuPLD52Jwnq2pGnJ/LxlqjjWJ5FsQQVSoDHGfM
 -----END RSA PRIVATE KEY-----"""
 
 DATABASE_CONNECTION_REPLICA_NAME = DATABASE_CONNECTION_DEFAULT_NAME  # noqa: F405
+
+# Documents cached in one test could outlive mocks applied by another one,
+# tests that cover the cache enable it explicitly.
+GRAPHQL_QUERY_DOCUMENT_CACHE_SIZE = 0
@@ -0,0 +1,25 @@
+from django.apps import AppConfig
+from django.db.models.signals import m2m_changed, post_delete, post_save
+
+
+class WebhookAppConfig(AppConfig):
+    name = "saleor.webhook"
+
+    def ready(self):
+        from ..app.models import App
+        from .models import Webhook, WebhookEvent
+        from .registry import handle_app_permissions_change, handle_webhooks_change
+
+        # The webhooks registry is reloaded when these models change.
+        for model in [App, Webhook, WebhookEvent]:
+            for signal_name, signal in [("save", post_save), ("delete", post_delete)]:
+                signal.connect(
+                    handle_webhooks_change,
+                    sender=model,
+                    dispatch_uid=f"webhooks_registry_{model.__name__}_{signal_name}",
+                )
+        m2m_changed.connect(
+            handle_app_permissions_change,
+            sender=App.permissions.through,
+            dispatch_uid="webhooks_registry_App_permissions",
+        )
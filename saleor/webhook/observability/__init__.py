@@ -5,12 +5,14 @@ from .tracing import opentracing_trace
 from .utils import (
     WebhookData,
     get_buffer_name,
+    get_current_api_call,
     get_webhooks,
     pop_events_with_remaining_size,
     report_api_call,
     report_event_delivery_attempt,
     report_gql_operation,
     report_view,
+    share_api_call,
     task_next_retry_date,
 )
 
@@ -21,11 +23,13 @@ __all__ = [
     "dump_payload",
     "WebhookData",
     "get_buffer_name",
+    "get_current_api_call",
     "get_webhooks",
     "report_api_call",
     "report_gql_operation",
     "report_event_delivery_attempt",
     "task_next_retry_date",
     "report_view",
+    "share_api_call",
     "opentracing_trace",
 ]
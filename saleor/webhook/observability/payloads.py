@@ -6,6 +6,7 @@ from typing import TYPE_CHECKING, Any, Dict, List, Optional, Tuple
 import graphene
 from django.core.serializers.json import DjangoJSONEncoder
 from django.http import HttpRequest, HttpResponse
+from django.http.response import HttpResponseBase
 from django.utils import timezone
 from graphene.utils.str_converters import to_camel_case as str_to_camel_case
 from graphql import get_operation_ast
@@ -144,6 +145,14 @@ def serialize_gql_operation_results(
     return payloads
 
 
+def get_response_content_length(response: HttpResponseBase) -> int:
+    if content_length := response.get("Content-Length"):
+        return int(content_length)
+    if response.streaming:
+        return 0
+    return len(response.content)
+
+
 @traced_payload_generator
 def generate_api_call_payload(
     request: HttpRequest,
@@ -164,7 +173,7 @@ def generate_api_call_payload(
         response=ApiCallResponse(
             headers=serialize_headers(dict(response.headers)),
             status_code=response.status_code,
-            content_length=len(response.content),
+            content_length=get_response_content_length(response),
         ),
         app=None,
         gql_operations=[],
@@ -224,7 +233,9 @@ def generate_event_delivery_attempt_payload(
             event_type=attempt.delivery.event_type,
             event_sync=attempt.delivery.event_type in WebhookEventSyncType.ALL,
             payload=EventDeliveryPayload(
-                content_length=len(attempt.delivery.payload.payload.encode("utf-8")),
+                content_length=len(
+                    attempt.delivery.payload.get_payload().encode("utf-8")
+                ),
                 body=TRUNC_PLACEHOLDER,
             ),
         ),
@@ -256,7 +267,7 @@ def generate_event_delivery_attempt_payload(
     payload["response"]["body"] = JsonTruncText.truncate(response_body, remaining // 2)
     remaining -= payload["response"]["body"].byte_size
 
-    event_delivery_payload = json.loads(attempt.delivery.payload.payload)
+    event_delivery_payload = json.loads(attempt.delivery.payload.get_payload())
     event_delivery_payload = anonymize_event_payload(
         subscription_query,
         attempt.delivery.event_type,
@@ -5,7 +5,7 @@ from uuid import UUID
 
 import graphene
 import pytest
-from django.http import JsonResponse
+from django.http import JsonResponse, StreamingHttpResponse
 from django.utils import timezone
 
 from ....core import EventDeliveryStatus
@@ -310,6 +310,18 @@ def test_generate_api_call_payload_request_not_from_app(rf):
     assert payload["app"] is None
 
 
+def test_generate_api_call_payload_for_streaming_response(rf):
+    request = rf.post(
+        "/graphql", data={"request": "data"}, content_type="application/json"
+    )
+    request.app = None
+    response = StreamingHttpResponse(iter([b'{"response": "data"}']))
+    payload = generate_api_call_payload(request, response, [], 1024)
+
+    assert payload["response"]["content_length"] == 0
+    assert list(response.streaming_content) == [b'{"response": "data"}']
+
+
 def test_generate_api_call_payload_skip_operations_when_size_limit_too_low(
     app, rf, gql_operation_factory
 ):
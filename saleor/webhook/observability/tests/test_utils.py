@@ -1,4 +1,5 @@
 import json
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timezone
 from unittest.mock import patch
 
@@ -12,6 +13,7 @@ from ..payload_schema import JsonTruncText
 from ..payloads import CustomJsonEncoder
 from ..utils import (
     ApiCall,
+    get_current_api_call,
     get_webhooks,
     get_webhooks_clear_mem_cache,
     pop_events_with_remaining_size,
@@ -19,6 +21,7 @@ from ..utils import (
     report_api_call,
     report_event_delivery_attempt,
     report_gql_operation,
+    share_api_call,
     task_next_retry_date,
 )
 from .conftest import BATCH_SIZE
@@ -166,6 +169,20 @@ def test_report_gql_operation_scope(test_request):
         assert api_call.gql_operations == [operation_a, operation_b]
 
 
+def test_share_api_call_with_another_thread(test_request):
+    with report_api_call(test_request) as api_call:
+
+        def report_operation():
+            with share_api_call(api_call):
+                with report_gql_operation() as operation:
+                    return operation
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            operation = executor.submit(report_operation).result()
+        assert api_call.gql_operations == [operation]
+    assert get_current_api_call() is None
+
+
 @patch("saleor.webhook.observability.utils.put_event")
 def test_api_call_report(
     mock_put_event,
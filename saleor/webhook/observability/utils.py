@@ -163,6 +163,23 @@ def report_api_call(request: "HttpRequest") -> Generator[ApiCall, None, None]:
         del _context.api_call
 
 
+def get_current_api_call() -> Optional[ApiCall]:
+    return getattr(_context, "api_call", None)
+
+
+@contextmanager
+def share_api_call(api_call: Optional[ApiCall]) -> Generator[None, None, None]:
+    """Report GraphQL operations executed in another thread to the given API call."""
+    if api_call is None or hasattr(_context, "api_call"):
+        yield
+        return
+    _context.api_call = api_call
+    try:
+        yield
+    finally:
+        del _context.api_call
+
+
 @contextmanager
 def report_gql_operation() -> Generator[GraphQLOperationResponse, None, None]:
     root = False
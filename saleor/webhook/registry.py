@@ -0,0 +1,148 @@
+import uuid
+from dataclasses import dataclass, field
+from typing import Dict, FrozenSet, List, Optional, Tuple
+
+import opentracing
+from django.core.cache import cache
+from django.db import transaction
+
+from .event_types import WebhookEventAsyncType, WebhookEventSyncType
+from .models import Webhook
+
+WEBHOOKS_REGISTRY_VERSION_CACHE_KEY = "webhooks-registry-version"
+
+
+@dataclass(frozen=True)
+class RegisteredWebhook:
+    id: int
+    app_id: int
+    app_identifier: Optional[str]
+    event_types: FrozenSet[str]
+    app_permissions: FrozenSet[str]
+
+    def is_subscribed_to(self, event_type: str) -> bool:
+        if event_type in self.event_types:
+            return True
+        return (
+            WebhookEventAsyncType.ANY in self.event_types
+            and event_type in WebhookEventAsyncType.ALL
+        )
+
+    def has_permission_for(self, event_type: str) -> bool:
+        required_permission = WebhookEventAsyncType.PERMISSIONS.get(
+            event_type, WebhookEventSyncType.PERMISSIONS.get(event_type)
+        )
+        if not required_permission:
+            return True
+        return required_permission.value in self.app_permissions
+
+
+@dataclass
+class WebhooksRegistry:
+    """Active webhooks of active apps, with the events and permissions of apps.
+
+    Instances are shared between requests of the process.
+    """
+
+    version: str
+    webhooks: Tuple[RegisteredWebhook, ...]
+    _webhooks_per_event: Dict[str, List[RegisteredWebhook]] = field(
+        default_factory=dict
+    )
+
+    def get_webhooks(self, event_type: str) -> List[RegisteredWebhook]:
+        webhooks = self._webhooks_per_event.get(event_type)
+        if webhooks is None:
+            webhooks = [
+                webhook
+                for webhook in self.webhooks
+                if webhook.is_subscribed_to(event_type)
+                and webhook.has_permission_for(event_type)
+            ]
+            self._webhooks_per_event[event_type] = webhooks
+        return webhooks
+
+
+_registry: Optional[WebhooksRegistry] = None
+
+
+def get_webhooks_registry_version() -> str:
+    version = cache.get(WEBHOOKS_REGISTRY_VERSION_CACHE_KEY)
+    if version is None:
+        cache.add(WEBHOOKS_REGISTRY_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+        version = cache.get(WEBHOOKS_REGISTRY_VERSION_CACHE_KEY)
+    return version
+
+
+def invalidate_webhooks_registry():
+    """Make all processes reload the webhooks registry.
+
+    The version is changed right away, so the current transaction sees its own
+    changes, and once again after commit, so other processes don't keep the data
+    they loaded before the transaction was committed.
+    """
+
+    def bump_version():
+        clear_webhooks_registry()
+        cache.set(WEBHOOKS_REGISTRY_VERSION_CACHE_KEY, uuid.uuid4().hex, timeout=None)
+
+    bump_version()
+    transaction.on_commit(bump_version)
+
+
+def clear_webhooks_registry():
+    """Drop the registry loaded by the current process."""
+    global _registry
+    _registry = None
+
+
+def load_webhooks_registry(version: str) -> WebhooksRegistry:
+    with opentracing.global_tracer().start_active_span("load_webhooks_registry"):
+        webhooks = (
+            Webhook.objects.filter(is_active=True, app__is_active=True)
+            .select_related("app")
+            .prefetch_related("events", "app__permissions__content_type")
+        )
+        registered_webhooks = []
+        for webhook in webhooks:
+            app_permissions = frozenset(
+                f"{permission.content_type.app_label}.{permission.codename}"
+                for permission in webhook.app.permissions.all()
+            )
+            registered_webhooks.append(
+                RegisteredWebhook(
+                    id=webhook.id,
+                    app_id=webhook.app_id,
+                    app_identifier=webhook.app.identifier,
+                    event_types=frozenset(
+                        event.event_type for event in webhook.events.all()
+                    ),
+                    app_permissions=app_permissions,
+                )
+            )
+        return WebhooksRegistry(version=version, webhooks=tuple(registered_webhooks))
+
+
+def get_webhooks_registry() -> WebhooksRegistry:
+    """Return the registry of active webhooks.
+
+    The registry is reused by the process until the version stored in the cache
+    changes, which happens when any `Webhook`, `WebhookEvent` or `App` is saved or
+    deleted, or when permissions of an app change.
+    """
+    global _registry
+    version = get_webhooks_registry_version()
+    registry = _registry
+    if registry is None or registry.version != version:
+        registry = load_webhooks_registry(version)
+        _registry = registry
+    return registry
+
+
+def handle_webhooks_change(sender, **kwargs):
+    invalidate_webhooks_registry()
+
+
+def handle_app_permissions_change(sender, action, **kwargs):
+    if action in ("post_add", "post_remove", "post_clear"):
+        invalidate_webhooks_registry()
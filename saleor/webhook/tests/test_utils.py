@@ -116,6 +116,81 @@ def test_get_webhook_for_event_not_returning_any_webhook_for_sync_event_types(
     assert set(webhooks) == {sync_webhook}
 
 
+def test_get_webhooks_for_event_without_webhooks_makes_no_queries(
+    async_app_factory, async_type, django_assert_num_queries
+):
+    # given
+    async_app_factory()
+    get_webhooks_for_event(async_type)
+
+    # when
+    with django_assert_num_queries(0):
+        webhooks = list(get_webhooks_for_event(WebhookEventAsyncType.PRODUCT_UPDATED))
+
+    # then
+    assert webhooks == []
+
+
+def test_get_webhooks_for_event_filtered_by_apps(async_app_factory, async_type):
+    # given
+    app, async_webhook = async_app_factory()
+    other_app, _ = async_app_factory()
+    other_app.identifier = "other-app"
+    other_app.save(update_fields=["identifier"])
+
+    # when
+    webhooks_by_id = get_webhooks_for_event(async_type, apps_ids=[app.id])
+    webhooks_by_identifier = get_webhooks_for_event(
+        async_type, apps_identifier=["missing-app"]
+    )
+
+    # then
+    assert set(webhooks_by_id) == {async_webhook}
+    assert not webhooks_by_identifier
+
+
+def test_get_webhooks_for_event_after_webhook_event_added(
+    async_app_factory, async_type
+):
+    # given
+    _, async_webhook = async_app_factory()
+    event_type = WebhookEventAsyncType.ORDER_UPDATED
+    assert not get_webhooks_for_event(event_type)
+
+    # when
+    async_webhook.events.create(event_type=event_type)
+
+    # then
+    assert set(get_webhooks_for_event(event_type)) == {async_webhook}
+
+
+def test_get_webhooks_for_event_after_app_deactivated(async_app_factory, async_type):
+    # given
+    app, async_webhook = async_app_factory()
+    assert set(get_webhooks_for_event(async_type)) == {async_webhook}
+
+    # when
+    app.is_active = False
+    app.save(update_fields=["is_active"])
+
+    # then
+    assert not get_webhooks_for_event(async_type)
+
+
+def test_get_webhooks_for_event_after_app_permissions_changed(
+    async_app_factory, async_type
+):
+    # given
+    app, async_webhook = async_app_factory()
+    assert set(get_webhooks_for_event(async_type)) == {async_webhook}
+
+    # when
+    app.permissions.clear()
+
+    # then
+    assert not get_webhooks_for_event(async_type)
+
+
 @pytest.mark.parametrize(
     "error,event_type",
     [
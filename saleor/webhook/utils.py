@@ -1,11 +1,7 @@
 from typing import TYPE_CHECKING, Optional
 
-from django.db.models import Q
-from django.db.models.expressions import Exists, OuterRef
-
-from ..app.models import App
-from .event_types import WebhookEventAsyncType, WebhookEventSyncType
-from .models import Webhook, WebhookEvent
+from .models import Webhook
+from .registry import get_webhooks_registry
 
 if TYPE_CHECKING:
     from django.db.models import QuerySet
@@ -17,34 +13,29 @@ def get_webhooks_for_event(
     apps_ids: Optional["list[int]"] = None,
     apps_identifier: Optional[list[str]] = None,
 ) -> "QuerySet[Webhook]":
-    """Get active webhooks from the database for an event."""
-    permissions = {}
-    required_permission = WebhookEventAsyncType.PERMISSIONS.get(
-        event_type, WebhookEventSyncType.PERMISSIONS.get(event_type)
-    )
-    if required_permission:
-        app_label, codename = required_permission.value.split(".")
-        permissions["permissions__content_type__app_label"] = app_label
-        permissions["permissions__codename"] = codename
+    """Get active webhooks from the database for an event.
 
-    if webhooks is None:
-        webhooks = Webhook.objects.all()
-    app_kwargs: dict = {"is_active": True, **permissions}
+    Webhooks subscribed to the event are looked up in the webhooks registry, so
+    no query is made when there are none.
+    """
+    registered_webhooks = get_webhooks_registry().get_webhooks(event_type)
     if apps_ids:
-        app_kwargs["id__in"] = apps_ids
+        registered_webhooks = [
+            webhook for webhook in registered_webhooks if webhook.app_id in apps_ids
+        ]
     if apps_identifier:
-        app_kwargs["identifier__in"] = apps_identifier
+        registered_webhooks = [
+            webhook
+            for webhook in registered_webhooks
+            if webhook.app_identifier in apps_identifier
+        ]
 
-    apps = App.objects.filter(**app_kwargs)
-    event_types = [event_type]
-    if event_type in WebhookEventAsyncType.ALL:
-        event_types.append(WebhookEventAsyncType.ANY)
-    webhook_events = WebhookEvent.objects.filter(event_type__in=event_types)
+    if webhooks is None:
+        webhooks = Webhook.objects.all()
+    if not registered_webhooks:
+        return webhooks.none()
     return (
-        webhooks.filter(
-            Q(is_active=True, app__in=apps)
-            & Q(Exists(webhook_events.filter(webhook_id=OuterRef("id"))))
-        )
+        webhooks.filter(id__in=[webhook.id for webhook in registered_webhooks])
         .select_related("app")
         .prefetch_related("app__permissions__content_type")
     )